@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark writing a session's exercise logs: one ORM object per set (the
+previous path of _create_workout_session) against the one-pass validation and
+single executemany INSERT it uses now.
+
+Usage: python bench_session_create.py [repeats]
+"""
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from sqlalchemy import insert
+from website import create_app, db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.views import _parse_exercise_log_rows
+
+SET_COUNTS = (10, 100, 1000)
+
+
+def orm_path(session_id, exercises_data):
+    """The per-row path: coerce each field with try/except and add an ORM object per set."""
+    for exercise_data in exercises_data:
+        exercise_name = exercise_data.get("exercise_name", "").strip() if exercise_data.get("exercise_name") else ""
+        set_number = exercise_data.get("set_number")
+        reps = exercise_data.get("reps")
+        weight = exercise_data.get("weight")
+        if set_number is not None:
+            try:
+                set_number = int(set_number) if str(set_number).strip() else None
+            except (ValueError, TypeError):
+                set_number = None
+        if reps is not None:
+            try:
+                reps = int(reps) if str(reps).strip() else None
+            except (ValueError, TypeError):
+                reps = None
+        if weight is not None:
+            try:
+                weight = float(weight) if str(weight).strip() else None
+            except (ValueError, TypeError):
+                weight = None
+        db.session.add(ExerciseLog(
+            session_id=session_id,
+            exercise_name=exercise_name,
+            set_number=set_number,
+            reps=reps,
+            weight=weight,
+            details=exercise_data.get("details"),
+            include_details=exercise_data.get("include_details", False),
+        ))
+    db.session.flush()
+
+
+def bulk_path(session_id, exercises_data):
+    """The current path: validate in one pass, then a single executemany INSERT."""
+    rows, _ = _parse_exercise_log_rows(exercises_data)
+    for row in rows:
+        row["session_id"] = session_id
+    db.session.execute(insert(ExerciseLog), rows)
+
+
+def time_path(path, user_id, workout_id, exercises_data, repeats):
+    best = None
+    for _ in range(repeats):
+        session = WorkoutSession(user_id=user_id, workout_id=workout_id)
+        db.session.add(session)
+        db.session.flush()
+        started = time.perf_counter()
+        path(session.id, exercises_data)
+        db.session.commit()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = create_app()
+    with app.app_context():
+        user = User(email="bench@example.com", password="bench")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Bench", description="")
+        db.session.add(workout)
+        db.session.commit()
+
+        print(f"{'sets':>6} {'orm ms':>10} {'bulk ms':>10} {'speedup':>8}")
+        for count in SET_COUNTS:
+            exercises_data = [{"exercise_name": f"Exercise {n % 8}", "set_number": str(n % 5 + 1),
+                               "reps": "8", "weight": f"{60 + n % 40}.5", "details": ""}
+                              for n in range(count)]
+            orm = time_path(orm_path, user.id, workout.id, exercises_data, repeats)
+            bulk = time_path(bulk_path, user.id, workout.id, exercises_data, repeats)
+            print(f"{count:>6} {orm * 1000:>10.2f} {bulk * 1000:>10.2f} {orm / bulk:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
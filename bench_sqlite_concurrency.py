@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Concurrent read/write stress test for file-backed SQLite, comparing the default
+rollback-journal settings with the production pragma profile applied by
+create_app. Separate processes stand in for gunicorn workers: writers log
+sessions while readers repeatedly load full histories.
+
+Usage: python bench_sqlite_concurrency.py [seconds]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import multiprocessing
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.exc import OperationalError
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.sqlite_pragmas import enable_sqlite_pragmas
+
+WRITERS = 2
+READERS = 4
+SEED_SESSIONS = 2000
+
+
+def make_engine(path, profile):
+    engine = create_engine(f"sqlite:///{path}")
+    if profile:
+        enable_sqlite_pragmas(engine)
+    return engine
+
+
+def seed(path, profile):
+    engine = make_engine(path, profile)
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "bench@example.com", "password": "x"}])
+        conn.execute(insert(Workout), [{"user_id": 1, "name": "Push Day", "description": ""}])
+        conn.execute(insert(WorkoutSession), [{"user_id": 1, "workout_id": 1} for _ in range(SEED_SESSIONS)])
+        conn.execute(insert(ExerciseLog), [
+            {"session_id": s, "exercise_name": "BENCH PRESS", "set_number": n, "reps": 5, "weight": 100}
+            for s in range(1, SEED_SESSIONS + 1) for n in range(1, 6)
+        ])
+    engine.dispose()
+
+
+def writer(path, profile, deadline, results):
+    engine = make_engine(path, profile)
+    latencies, errors = [], 0
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.begin() as conn:
+                session_id = conn.execute(
+                    insert(WorkoutSession).values(user_id=1, workout_id=1)
+                ).inserted_primary_key[0]
+                conn.execute(insert(ExerciseLog), [
+                    {"session_id": session_id, "exercise_name": "BENCH PRESS",
+                     "set_number": n, "reps": 5, "weight": 100} for n in range(1, 6)
+                ])
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+    results.put(("write", latencies, errors))
+
+
+def reader(path, profile, deadline, results):
+    engine = make_engine(path, profile)
+    latencies, errors = [], 0
+    query = (select(WorkoutSession.id, func.count(ExerciseLog.id))
+             .join(ExerciseLog, ExerciseLog.session_id == WorkoutSession.id)
+             .group_by(WorkoutSession.id))
+    while time.time() < deadline:
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(query).all()
+            latencies.append(time.perf_counter() - started)
+        except OperationalError:
+            errors += 1
+    results.put(("read", latencies, errors))
+
+
+def run(profile, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        seed(path, profile)
+        results = multiprocessing.Queue()
+        deadline = time.time() + seconds
+        workers = ([multiprocessing.Process(target=writer, args=(path, profile, deadline, results))
+                    for _ in range(WRITERS)] +
+                   [multiprocessing.Process(target=reader, args=(path, profile, deadline, results))
+                    for _ in range(READERS)])
+        for worker in workers:
+            worker.start()
+        collected = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+    summary = {}
+    for kind in ("write", "read"):
+        latencies = sorted(l for k, ls, _ in collected if k == kind for l in ls)
+        errors = sum(e for k, _, e in collected if k == kind)
+        p99 = latencies[int(len(latencies) * 0.99)] if latencies else float("nan")
+        summary[kind] = (len(latencies), errors, p99, latencies[-1] if latencies else float("nan"))
+    return summary
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"{'profile':>10} {'op':>6} {'ops/s':>8} {'errors':>7} {'p99 ms':>9} {'max ms':>9}")
+    for profile in (False, True):
+        for kind, (count, errors, p99, worst) in run(profile, seconds).items():
+            print(f"{'wal' if profile else 'default':>10} {kind:>6} {count / seconds:>8.1f} "
+                  f"{errors:>7} {p99 * 1000:>9.1f} {worst * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark the latency of saving a completed exercise on the workout page with
+the top set logged before responding (TOP_SETS_WRITE_BEHIND=off, the previous
+behaviour) against logging it behind the response by the writer thread. Uses
+a file-backed SQLite database per mode so every commit pays for its fsync.
+Saves are spaced by a pause, as between sets, during which the writer drains.
+
+Usage: python bench_top_set_save.py [saves] [pause_ms]
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from website import create_app, db
+from website.models import User, Workout, Exercise, ExerciseLog
+
+EXERCISES = 8
+
+
+def make_app(mode, directory):
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, f'{mode}.db')}"
+    os.environ["TOP_SETS_WRITE_BEHIND"] = mode
+    app = create_app()
+    with app.app_context():
+        user = User(email="bench@example.com", password="bench")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Bench", description="")
+        db.session.add(workout)
+        db.session.commit()
+        db.session.add_all([Exercise(name=f"EXERCISE {n}", include_details=False, workout_id=workout.id,
+                                     details="") for n in range(EXERCISES)])
+        db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess["_user_id"] = "1"
+    return app, client
+
+
+def run(mode, saves, pause, directory):
+    app, client = make_app(mode, directory)
+    latencies = []
+    started = time.perf_counter()
+    for n in range(saves):
+        request_started = time.perf_counter()
+        resp = client.post("/workout", json={
+            "action": "save_complete_exercise", "workout_id": 1, "exercise_id": n % EXERCISES + 1,
+            "exercise_data": {"weight": str(60 + n % 40), "reps": "5", "details": ""},
+        })
+        latencies.append(time.perf_counter() - request_started)
+        assert resp.status_code == 200
+        time.sleep(pause)
+    app.extensions["top_set_writer"].join()
+    total = time.perf_counter() - started
+    with app.app_context():
+        logged = ExerciseLog.query.count()
+    return statistics.median(latencies), max(latencies), total, logged
+
+
+def main():
+    saves = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pause = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{'mode':>6} {'median ms':>10} {'max ms':>8} {'total s':>8} {'logs':>5}")
+        for mode in ("off", "thread"):
+            median, worst, total, logged = run(mode, saves, pause, directory)
+            print(f"{mode:>6} {median * 1000:>10.2f} {worst * 1000:>8.2f} {total:>8.2f} {logged:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark creating and duplicating workouts with 5, 50 and 500 exercises:
+a commit per exercise and an ORM clone (the previous paths of new_workout and
+duplicate_workout) against one transaction with a bulk INSERT and a
+server-side INSERT ... SELECT copy. Uses a file-backed SQLite database so
+every commit pays for its fsync.
+
+Usage: python bench_workout_create.py [repeats]
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+_tmpdir = tempfile.TemporaryDirectory()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmpdir.name, 'bench.db')}")
+
+from website import create_app, db
+from website.models import User, Workout, Exercise
+from website.views import _create_workout_with_exercises, _copy_workout
+
+EXERCISE_COUNTS = (5, 50, 500)
+
+
+def create_per_commit(user_id, exercises):
+    """The previous new_workout: commit the workout, then commit each exercise."""
+    workout = Workout(user_id=user_id, name="Bench", description="", category_id=1)
+    db.session.add(workout)
+    db.session.commit()
+    for exercise in exercises:
+        db.session.add(Exercise(name=exercise["name"], include_details=exercise["include_details"],
+                                workout_id=workout.id, details=""))
+        db.session.commit()
+    return workout
+
+
+def create_bulk(user_id, exercises):
+    """The current path: one transaction with a bulk exercise insert."""
+    workout = _create_workout_with_exercises(user_id, "Bench", "", 1, exercises)
+    db.session.commit()
+    return workout
+
+
+def duplicate_orm(workout, user_id):
+    """The previous duplicate_workout: commit the copy, load and clone each exercise."""
+    copy = Workout(name=f"{workout.name} (Copy)", description=workout.description, user_id=user_id)
+    db.session.add(copy)
+    db.session.commit()
+    for original in Exercise.query.filter_by(workout_id=workout.id).all():
+        db.session.add(Exercise(name=original.name, include_details=original.include_details,
+                                workout_id=copy.id, weight=original.weight, details=original.details))
+    db.session.commit()
+
+
+def duplicate_insert_select(workout, user_id):
+    """The current path: INSERT ... SELECT in one transaction."""
+    _copy_workout(workout, user_id)
+    db.session.commit()
+
+
+def best_of(repeats, run):
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = create_app()
+    with app.app_context():
+        user = User(email="bench@example.com", password="bench")
+        db.session.add(user)
+        db.session.commit()
+
+        print(f"{'exercises':>9} {'create/commit ms':>16} {'create/bulk ms':>15} {'speedup':>8}"
+              f" {'dup/orm ms':>11} {'dup/sql ms':>11} {'speedup':>8}")
+        for count in EXERCISE_COUNTS:
+            exercises = [{"name": f"EXERCISE {n}", "include_details": n % 2} for n in range(count)]
+            per_commit = best_of(repeats, lambda: create_per_commit(user.id, exercises))
+            bulk = best_of(repeats, lambda: create_bulk(user.id, exercises))
+
+            template = create_bulk(user.id, exercises)
+            db.session.query(Exercise).filter_by(workout_id=template.id).update(
+                {Exercise.weight: 60.5, Exercise.sets: 3, Exercise.reps: "8-12"})
+            db.session.commit()
+            orm = best_of(repeats, lambda: duplicate_orm(template, user.id))
+            sql = best_of(repeats, lambda: duplicate_insert_select(template, user.id))
+            print(f"{count:>9} {per_commit * 1000:>16.2f} {bulk * 1000:>15.2f} {per_commit / bulk:>7.1f}x"
+                  f" {orm * 1000:>11.2f} {sql * 1000:>11.2f} {orm / sql:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""add user data version for progress result caching
+
+Revision ID: 1b9f4d6e2a87
+Revises: e7d3a5b82c61
+Create Date: 2026-10-18 15:02:13.518204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b9f4d6e2a87'
+down_revision = 'e7d3a5b82c61'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('user')}
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        if 'data_version' not in columns:
+            batch_op.add_column(sa.Column('data_version', sa.Integer(), nullable=False, server_default='0'))
+        if 'data_modified_at' not in columns:
+            batch_op.add_column(sa.Column('data_modified_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('user', schema=None) as batch_op:
+        batch_op.drop_column('data_modified_at')
+        batch_op.drop_column('data_version')
@@ -0,0 +1,39 @@
+"""add composite indexes for session and exercise log access paths
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-18 09:12:44.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# Tables are also created by db.create_all() on startup, which already builds
+# these indexes on fresh databases, so every create is guarded.
+def upgrade():
+    op.create_index('ix_workout_session_user_timestamp', 'workout_session',
+                    ['user_id', 'timestamp'], unique=False, if_not_exists=True)
+    op.create_index('ix_workout_session_user_workout_timestamp', 'workout_session',
+                    ['user_id', 'workout_id', 'timestamp'], unique=False, if_not_exists=True)
+    op.create_index('ix_exercise_log_session_exercise_name', 'exercise_log',
+                    ['session_id', 'exercise_name'], unique=False, if_not_exists=True)
+    op.create_index('ix_exercise_workout_id', 'exercise',
+                    ['workout_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_workout_user_id', 'workout',
+                    ['user_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_workout_user_id', table_name='workout', if_exists=True)
+    op.drop_index('ix_exercise_workout_id', table_name='exercise', if_exists=True)
+    op.drop_index('ix_exercise_log_session_exercise_name', table_name='exercise_log', if_exists=True)
+    op.drop_index('ix_workout_session_user_workout_timestamp', table_name='workout_session', if_exists=True)
+    op.drop_index('ix_workout_session_user_timestamp', table_name='workout_session', if_exists=True)
@@ -0,0 +1,41 @@
+"""add idempotency keys
+
+Revision ID: 4a7f2c9e1d36
+Revises: 9c3e7a2b5f18
+Create Date: 2026-10-18 18:03:41.257319
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4a7f2c9e1d36'
+down_revision = '9c3e7a2b5f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('idempotency_key'):
+        op.create_table(
+            'idempotency_key',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('key', sa.String(length=100), nullable=False),
+            sa.Column('endpoint', sa.String(length=100), nullable=False),
+            sa.Column('status_code', sa.Integer(), nullable=True),
+            sa.Column('response_body', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'key', name='uq_idempotency_key_user_key'),
+        )
+    op.create_index('ix_idempotency_key_created_at', 'idempotency_key', ['created_at'],
+                    unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_idempotency_key_created_at', table_name='idempotency_key')
+    op.drop_table('idempotency_key')
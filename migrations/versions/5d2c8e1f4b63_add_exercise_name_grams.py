@@ -0,0 +1,58 @@
+"""add trigram search index over exercise catalog names
+
+Revision ID: 5d2c8e1f4b63
+Revises: 1b9f4d6e2a87
+Create Date: 2026-10-18 16:24:41.093527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c8e1f4b63'
+down_revision = '1b9f4d6e2a87'
+branch_labels = None
+depends_on = None
+
+
+def _trigrams(name_key):
+    # Must match website.catalog.name_trigrams
+    grams = set()
+    for word in name_key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def upgrade():
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('exercise_name_gram'):
+        op.create_table(
+            'exercise_name_gram',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('exercise_id', sa.Integer(), nullable=False),
+            sa.Column('gram', sa.String(length=3), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['exercise_id'], ['exercise_catalog.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('exercise_id', 'gram', name='uq_exercise_name_gram_exercise_gram'),
+        )
+    op.create_index('ix_exercise_name_gram_user_gram', 'exercise_name_gram', ['user_id', 'gram'],
+                    unique=False, if_not_exists=True)
+
+    # Backfill the grams of existing catalog entries
+    grams = sa.table('exercise_name_gram', sa.column('user_id'), sa.column('exercise_id'), sa.column('gram'))
+    indexed = {row[0] for row in bind.execute(sa.text("SELECT DISTINCT exercise_id FROM exercise_name_gram"))}
+    rows = [{"user_id": entry.user_id, "exercise_id": entry.id, "gram": gram}
+            for entry in bind.execute(sa.text("SELECT id, user_id, name_key FROM exercise_catalog"))
+            if entry.id not in indexed
+            for gram in sorted(_trigrams(entry.name_key))]
+    if rows:
+        op.bulk_insert(grams, rows)
+
+
+def downgrade():
+    op.drop_index('ix_exercise_name_gram_user_gram', table_name='exercise_name_gram')
+    op.drop_table('exercise_name_gram')
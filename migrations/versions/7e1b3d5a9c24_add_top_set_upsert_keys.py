@@ -0,0 +1,48 @@
+"""add unique keys for top-set upserts
+
+Revision ID: 7e1b3d5a9c24
+Revises: 4a7f2c9e1d36
+Create Date: 2026-10-18 18:41:09.612845
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e1b3d5a9c24'
+down_revision = '4a7f2c9e1d36'
+branch_labels = None
+depends_on = None
+
+TOP_SET_SESSION_PREDICATE = "top_set_day IS NOT NULL"
+TOP_SET_LOG_PREDICATE = "top_set IS NOT NULL"
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    # Existing sessions keep top_set_day NULL, so earlier top-set saves are left as logged
+    if 'top_set_day' not in {column['name'] for column in inspector.get_columns('workout_session')}:
+        with op.batch_alter_table('workout_session', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('top_set_day', sa.Date(), nullable=True))
+    if 'top_set' not in {column['name'] for column in inspector.get_columns('exercise_log')}:
+        with op.batch_alter_table('exercise_log', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('top_set', sa.Boolean(), nullable=True))
+
+    op.create_index('uq_workout_session_top_set_day', 'workout_session',
+                    ['user_id', 'workout_id', 'top_set_day'], unique=True, if_not_exists=True,
+                    sqlite_where=sa.text(TOP_SET_SESSION_PREDICATE),
+                    postgresql_where=sa.text(TOP_SET_SESSION_PREDICATE))
+    op.create_index('uq_exercise_log_top_set', 'exercise_log', ['session_id', 'exercise_id'],
+                    unique=True, if_not_exists=True,
+                    sqlite_where=sa.text(TOP_SET_LOG_PREDICATE),
+                    postgresql_where=sa.text(TOP_SET_LOG_PREDICATE))
+
+
+def downgrade():
+    op.drop_index('uq_exercise_log_top_set', table_name='exercise_log')
+    op.drop_index('uq_workout_session_top_set_day', table_name='workout_session')
+    with op.batch_alter_table('exercise_log', schema=None) as batch_op:
+        batch_op.drop_column('top_set')
+    with op.batch_alter_table('workout_session', schema=None) as batch_op:
+        batch_op.drop_column('top_set_day')
@@ -0,0 +1,74 @@
+"""add per-user exercise catalog referenced by exercise logs
+
+Revision ID: 8a4e6c1f2d35
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 10:02:17.540931
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6c1f2d35'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def _normalize(name):
+    # Must match website.catalog.normalize_exercise_name
+    return " ".join((name or "").split()).casefold()
+
+
+def upgrade():
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    if not inspector.has_table('exercise_catalog'):
+        op.create_table(
+            'exercise_catalog',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name_key', sa.String(length=45), nullable=False),
+            sa.Column('display_name', sa.String(length=45), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'name_key', name='uq_exercise_catalog_user_name_key'),
+        )
+
+    if 'exercise_id' not in {c['name'] for c in inspector.get_columns('exercise_log')}:
+        with op.batch_alter_table('exercise_log') as batch_op:
+            batch_op.add_column(sa.Column('exercise_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key('fk_exercise_log_exercise_id', 'exercise_catalog',
+                                        ['exercise_id'], ['id'])
+    op.create_index('ix_exercise_log_exercise_id', 'exercise_log', ['exercise_id'],
+                    unique=False, if_not_exists=True)
+
+    # Backfill: one catalog entry per (user, normalized name), then point logs at it
+    catalog = sa.table('exercise_catalog', sa.column('id'), sa.column('user_id'),
+                       sa.column('name_key'), sa.column('display_name'))
+    rows = bind.execute(sa.text(
+        "SELECT DISTINCT s.user_id, l.exercise_name FROM exercise_log l "
+        "JOIN workout_session s ON s.id = l.session_id WHERE l.exercise_id IS NULL"
+    )).fetchall()
+    existing = {(r.user_id, r.name_key): r.id for r in bind.execute(
+        sa.select(catalog.c.id, catalog.c.user_id, catalog.c.name_key))}
+    for user_id, exercise_name in rows:
+        key = (user_id, _normalize(exercise_name))
+        if key not in existing:
+            existing[key] = bind.execute(catalog.insert().values(
+                user_id=user_id, name_key=key[1], display_name=exercise_name.strip()
+            ).returning(catalog.c.id)).scalar()
+        bind.execute(sa.text(
+            "UPDATE exercise_log SET exercise_id = :exercise_id "
+            "WHERE exercise_id IS NULL AND exercise_name = :exercise_name AND session_id IN "
+            "(SELECT id FROM workout_session WHERE user_id = :user_id)"
+        ), {"exercise_id": existing[key], "exercise_name": exercise_name, "user_id": user_id})
+
+
+def downgrade():
+    op.drop_index('ix_exercise_log_exercise_id', table_name='exercise_log', if_exists=True)
+    with op.batch_alter_table('exercise_log') as batch_op:
+        batch_op.drop_column('exercise_id')
+    op.drop_table('exercise_catalog')
@@ -0,0 +1,57 @@
+"""add background job queue and summary snapshots
+
+Revision ID: 9c3e7a2b5f18
+Revises: 5d2c8e1f4b63
+Create Date: 2026-10-18 17:12:06.384920
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c3e7a2b5f18'
+down_revision = '5d2c8e1f4b63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('background_job'):
+        op.create_table(
+            'background_job',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('status', sa.String(length=10), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('run_after', sa.DateTime(), nullable=False),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+    op.create_index('ix_background_job_status_run_after', 'background_job', ['status', 'run_after'],
+                    unique=False, if_not_exists=True)
+
+    if not inspector.has_table('summary_snapshot'):
+        op.create_table(
+            'summary_snapshot',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('params', sa.String(length=100), nullable=False),
+            sa.Column('data_version', sa.Integer(), nullable=False),
+            sa.Column('computed_on', sa.Date(), nullable=False),
+            sa.Column('payload', sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'name', 'params', name='uq_summary_snapshot_user_name_params'),
+        )
+
+
+def downgrade():
+    op.drop_table('summary_snapshot')
+    op.drop_index('ix_background_job_status_run_after', table_name='background_job')
+    op.drop_table('background_job')
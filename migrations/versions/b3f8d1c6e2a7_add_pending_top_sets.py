@@ -0,0 +1,42 @@
+"""add pending top sets
+
+Revision ID: b3f8d1c6e2a7
+Revises: 7e1b3d5a9c24
+Create Date: 2026-10-18 19:37:52.804116
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f8d1c6e2a7'
+down_revision = '7e1b3d5a9c24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('pending_top_set'):
+        op.create_table(
+            'pending_top_set',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('workout_id', sa.Integer(), nullable=False),
+            sa.Column('exercise_name', sa.String(length=45), nullable=False),
+            sa.Column('weight', sa.Float(precision=5), nullable=True),
+            sa.Column('reps', sa.Integer(), nullable=True),
+            sa.Column('details', sa.String(length=50), nullable=True),
+            sa.Column('include_details', sa.Boolean(), nullable=True),
+            sa.Column('saved_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['workout_id'], ['workout.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'workout_id', 'exercise_name',
+                                name='uq_pending_top_set_user_workout_exercise'),
+        )
+
+
+def downgrade():
+    op.drop_table('pending_top_set')
@@ -0,0 +1,48 @@
+"""add per-user daily exercise rollup table
+
+Revision ID: c52b7e0a9f14
+Revises: 8a4e6c1f2d35
+Create Date: 2026-10-18 11:26:03.118452
+
+Populate it afterwards with `flask rollups backfill`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52b7e0a9f14'
+down_revision = '8a4e6c1f2d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('exercise_daily_rollup'):
+        return
+    op.create_table(
+        'exercise_daily_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('workout_id', sa.Integer(), nullable=False),
+        sa.Column('exercise_id', sa.Integer(), nullable=False),
+        sa.Column('set_count', sa.Integer(), nullable=False),
+        sa.Column('working_set_count', sa.Integer(), nullable=False),
+        sa.Column('session_count', sa.Integer(), nullable=False),
+        sa.Column('total_reps', sa.Integer(), nullable=False),
+        sa.Column('volume', sa.Float(), nullable=False),
+        sa.Column('max_weight', sa.Float(), nullable=True),
+        sa.Column('weight_sum', sa.Float(), nullable=False),
+        sa.Column('weight_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['workout_id'], ['workout.id']),
+        sa.ForeignKeyConstraint(['exercise_id'], ['exercise_catalog.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'day', 'workout_id', 'exercise_id', name='uq_exercise_daily_rollup_key'),
+    )
+
+
+def downgrade():
+    op.drop_table('exercise_daily_rollup')
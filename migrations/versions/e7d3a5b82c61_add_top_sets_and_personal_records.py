@@ -0,0 +1,65 @@
+"""add session top set pointers and personal records
+
+Revision ID: e7d3a5b82c61
+Revises: c52b7e0a9f14
+Create Date: 2026-10-18 13:41:50.276019
+
+Populate them afterwards with `flask records backfill`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7d3a5b82c61'
+down_revision = 'c52b7e0a9f14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('session_top_set'):
+        op.create_table(
+            'session_top_set',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('session_id', sa.Integer(), nullable=False),
+            sa.Column('exercise_id', sa.Integer(), nullable=False),
+            sa.Column('log_id', sa.Integer(), nullable=False),
+            sa.Column('weight', sa.Float(), nullable=True),
+            sa.Column('reps', sa.Integer(), nullable=True),
+            sa.Column('set_count', sa.Integer(), nullable=False),
+            sa.Column('weight_sum', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['session_id'], ['workout_session.id']),
+            sa.ForeignKeyConstraint(['exercise_id'], ['exercise_catalog.id']),
+            sa.ForeignKeyConstraint(['log_id'], ['exercise_log.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('session_id', 'exercise_id', name='uq_session_top_set_session_exercise'),
+        )
+        op.create_index('ix_session_top_set_exercise_id', 'session_top_set', ['exercise_id'], unique=False)
+
+    if not inspector.has_table('personal_record'):
+        op.create_table(
+            'personal_record',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('exercise_id', sa.Integer(), nullable=False),
+            sa.Column('session_id', sa.Integer(), nullable=False),
+            sa.Column('log_id', sa.Integer(), nullable=False),
+            sa.Column('weight', sa.Float(), nullable=True),
+            sa.Column('reps', sa.Integer(), nullable=True),
+            sa.Column('achieved_at', sa.DateTime(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['exercise_id'], ['exercise_catalog.id']),
+            sa.ForeignKeyConstraint(['session_id'], ['workout_session.id']),
+            sa.ForeignKeyConstraint(['log_id'], ['exercise_log.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'exercise_id', name='uq_personal_record_user_exercise'),
+        )
+
+
+def downgrade():
+    op.drop_table('personal_record')
+    op.drop_index('ix_session_top_set_exercise_id', table_name='session_top_set')
+    op.drop_table('session_top_set')
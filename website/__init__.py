@@ -2,9 +2,11 @@ from flask import Flask, redirect, url_for
 from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from sqlalchemy.engine import make_url
+from .routing import RoutingSession, READ_BIND
 import os
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()  # This object is used for Flask-Migrate integration
 
 # PUBLIC_INTERFACE
@@ -33,6 +35,9 @@ def create_app():
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", default="006363ce276b892f9f89d16571fd0113")
     app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", default="sqlite:///db.sqlite3")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Optional read engine (a replica, or a read-only SQLite URI) for views marked @read_only
+    if os.environ.get("READ_DATABASE_URL"):
+        app.config["SQLALCHEMY_BINDS"] = {READ_BIND: os.environ["READ_DATABASE_URL"]}
     app.config["PROPAGATE_EXCEPTIONS"] = True
 
     db.init_app(app)
@@ -44,13 +49,53 @@ def create_app():
     app.register_blueprint(auth, url_prefix="/")
     app.register_blueprint(views, url_prefix="/")
 
+    from .rollups import rollups_cli
+    from .records import records_cli
+    from .catalog import catalog_cli
+    from .jobs import jobs_cli
+
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(records_cli)
+    app.cli.add_command(catalog_cli)
+    app.cli.add_command(jobs_cli)
+
+    from .cache import LRUCache, PROGRESS_CACHE_MAX_ENTRIES
+
+    # In-process LRU for /api/progress/* results; replace to share across workers
+    app.extensions["progress_cache"] = LRUCache(
+        int(os.environ.get("PROGRESS_CACHE_MAX_ENTRIES", PROGRESS_CACHE_MAX_ENTRIES)))
+
+    from .sqlite_pragmas import enable_sqlite_pragmas
+
     # Ensures default categories are seeded on app creation (address factory/CLI pattern issues)
     with app.app_context():
+        # WAL and busy_timeout for SQLite, before the first connection is opened
+        for engine in db.engines.values():
+            enable_sqlite_pragmas(engine)
         # Create all tables first
-        db.create_all()
+        db.create_all(bind_key=None)
         # Then seed categories
         seed_categories_if_empty()
 
+    # Background jobs normally run in their own process (`flask jobs worker`);
+    # JOBS_WORKER=thread runs them in this process instead
+    if os.environ.get("JOBS_WORKER") == "thread":
+        from .jobs import start_worker_thread
+        start_worker_thread(app)
+
+    from .top_sets import TOP_SET_WRITE_MODES, TopSetWriter
+
+    # Top sets saved on the workout page are logged behind the response
+    # (TOP_SETS_WRITE_BEHIND=thread, worker or off). An in-memory SQLite database
+    # has a single connection shared by all threads, so there they are logged inline.
+    mode = os.environ.get("TOP_SETS_WRITE_BEHIND", "thread")
+    if mode not in TOP_SET_WRITE_MODES:
+        raise ValueError(f"TOP_SETS_WRITE_BEHIND must be one of {', '.join(TOP_SET_WRITE_MODES)}")
+    if mode == "thread" and make_url(app.config["SQLALCHEMY_DATABASE_URI"]).database in (None, "", ":memory:"):
+        mode = "off"
+    app.config["TOP_SETS_WRITE_BEHIND"] = mode
+    app.extensions["top_set_writer"] = TopSetWriter(app)
+
     login_manager = LoginManager()
     login_manager.login_view = "auth.signin"
     login_manager.login_message = ""
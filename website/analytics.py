@@ -0,0 +1,98 @@
+from .buckets import bucket_start
+import math
+
+
+# PUBLIC_INTERFACE
+def percentiles(values, qs=(25, 50, 75, 90)):
+    """
+    Percentiles of the non-missing values, linearly interpolated between the
+    two nearest ranks.
+
+    Args:
+        values (iterable): Values, None for missing
+        qs (iterable): Percentiles to compute, 0-100
+
+    Returns:
+        dict: "p<q>" -> value rounded to 2 places, or None when there are no values
+    """
+    qs = list(qs)
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return {f"p{q}": None for q in qs}
+    result = {}
+    for q in qs:
+        position = (len(values) - 1) * q / 100
+        low, high = math.floor(position), math.ceil(position)
+        value = values[low] + (values[high] - values[low]) * (position - low)
+        result[f"p{q}"] = round(float(value), 2)
+    return result
+
+
+# PUBLIC_INTERFACE
+def bucket_max(points, bucket):
+    """
+    Merge daily points into weekly or monthly ones, keeping the heaviest weight.
+
+    Args:
+        points (list): Dicts with "day" (date), "weight", "timestamp" (datetime) and
+            "session_count", in day order
+        bucket (str): "day", "week" or "month"
+
+    Returns:
+        list: One point per bucket, "day" set to the bucket's first day
+    """
+    if bucket == "day":
+        return list(points)
+    merged = []
+    for point in points:
+        start = bucket_start(point["day"], bucket)
+        if merged and merged[-1]["day"] == start:
+            current = merged[-1]
+            current["weight"] = max(current["weight"], point["weight"])
+            current["session_count"] += point["session_count"]
+        else:
+            merged.append(dict(point, day=start))
+    return merged
+
+
+# PUBLIC_INTERFACE
+def lttb(points, threshold, x_key="day", y_key="weight"):
+    """
+    Downsample a series with Largest-Triangle-Three-Buckets, which keeps the
+    visual shape (peaks and troughs) of a line chart. The first and last points
+    are always kept.
+
+    Args:
+        points (list): Dicts in x order
+        threshold (int): Maximum number of points to return, at least 3
+        x_key (str): Key of the x value (date or number)
+        y_key (str): Key of the y value
+
+    Returns:
+        list: At most threshold of the input points, in order
+    """
+    if threshold >= len(points) or threshold < 3:
+        return list(points)
+
+    def x(point):
+        value = point[x_key]
+        return value.toordinal() if hasattr(value, "toordinal") else value
+
+    sampled = [points[0]]
+    bucket_size = (len(points) - 2) / (threshold - 2)
+    previous = points[0]
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        # Average of the next bucket is the third triangle vertex
+        next_bucket = points[end:min(int((i + 2) * bucket_size) + 1, len(points) - 1)] or [points[-1]]
+        avg_x = sum(x(p) for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[y_key] for p in next_bucket) / len(next_bucket)
+
+        prev_x, prev_y = x(previous), previous[y_key]
+        best = max(points[start:end], key=lambda p: abs(
+            (prev_x - avg_x) * (p[y_key] - prev_y) - (prev_x - x(p)) * (avg_y - prev_y)))
+        sampled.append(best)
+        previous = best
+    sampled.append(points[-1])
+    return sampled
@@ -0,0 +1,201 @@
+from . import db
+from .models import WorkoutSession, ExerciseLog
+from sqlalchemy import Date, and_, case, cast, func, literal
+from datetime import date, datetime, time, timedelta, timezone
+
+# Calendar units the progress calendar can group by; weeks are ISO weeks starting on Monday
+CALENDAR_BUCKETS = ("day", "week", "month", "year")
+
+# Local days the progress calendar accepts, well inside what datetime can shift by a UTC offset
+CALENDAR_EARLIEST = date(1970, 1, 1)
+CALENDAR_LATEST = date(2100, 12, 31)
+
+# Stride when looking for the next UTC offset change. The shortest stretch of
+# one offset in the time zone database is just under a week (Brazil's DST of
+# October 2000, Gaza's Ramadan breaks), so no offset is stepped over.
+OFFSET_CHANGE_STRIDE = timedelta(days=3)
+
+
+def bucket_start(day, bucket):
+    """
+    First day of the calendar bucket containing a date.
+
+    Args:
+        day (date): Any date
+        bucket (str): One of CALENDAR_BUCKETS
+
+    Returns:
+        date: Start of the bucket
+    """
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    if bucket == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_bucket_start(start, bucket):
+    """
+    First day of the bucket following the one starting at start.
+
+    Args:
+        start (date): Start of a bucket
+        bucket (str): One of CALENDAR_BUCKETS
+
+    Returns:
+        date: Start of the next bucket
+    """
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    if bucket == "year":
+        return start.replace(year=start.year + 1)
+    return start + timedelta(days=1)
+
+
+def local_midnight_utc(day, tz):
+    """
+    The naive UTC datetime at which a local date begins, matching how session
+    timestamps are stored.
+    """
+    return datetime.combine(day, time.min, tzinfo=tz).astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def utc_offset_segments(tz, start, end):
+    """
+    Split a UTC range into segments with a constant offset from UTC in tz,
+    walking from one offset change to the next. Each change is found by checking
+    the offset every OFFSET_CHANGE_STRIDE and bisecting the stride in which it
+    changes down to the second.
+
+    Args:
+        tz (ZoneInfo): Time zone
+        start (datetime): Naive UTC start of the range
+        end (datetime): Naive UTC end of the range
+
+    Returns:
+        list: (segment_end, offset_seconds) pairs in order; the last segment is open-ended
+    """
+    def offset(moment):
+        return int(moment.replace(tzinfo=timezone.utc).astimezone(tz).utcoffset().total_seconds())
+
+    segments = []
+    current, current_offset = start, offset(start)
+    while current < end:
+        step = min(current + OFFSET_CHANGE_STRIDE, end)
+        if offset(step) != current_offset:
+            low, high = current, step
+            # In whole seconds, so high ends on the first second with the new offset
+            while high - low > timedelta(seconds=1):
+                middle = low + timedelta(seconds=(high - low) // timedelta(seconds=2))
+                if offset(middle) == current_offset:
+                    low = middle
+                else:
+                    high = middle
+            segments.append((high, current_offset))
+            current, current_offset = high, offset(high)
+        else:
+            current = step
+    segments.append((None, current_offset))
+    return segments
+
+
+def _local_timestamp(column, tz, start, end, dialect):
+    """SQL expression converting a naive UTC timestamp column to local time in tz."""
+    if dialect == "postgresql":
+        return func.timezone(tz.key, func.timezone("UTC", column))
+
+    # SQLite has no time zone database: shift by the offset of the DST segment
+    modifiers = [(segment_end, literal(f"{seconds:+d} seconds"))
+                 for segment_end, seconds in utc_offset_segments(tz, start, end)]
+    if len(modifiers) == 1:
+        shift = modifiers[0][1]
+    else:
+        shift = case(*[(column < segment_end, modifier) for segment_end, modifier in modifiers[:-1]],
+                     else_=modifiers[-1][1])
+    return func.datetime(column, shift)
+
+
+def _bucket_expression(local, bucket, dialect):
+    """SQL expression yielding the first day of the bucket of a local timestamp."""
+    if dialect == "postgresql":
+        return cast(func.date_trunc(bucket, local), Date)
+    if bucket == "week":
+        # strftime('%w') is 0 for Sunday; step back to Monday
+        weekday = (cast(func.strftime("%w", local), db.Integer) + 6) % 7
+        return func.date(local, func.printf("-%d days", weekday))
+    if bucket == "month":
+        return func.strftime("%Y-%m-01", local)
+    if bucket == "year":
+        return func.strftime("%Y-01-01", local)
+    return func.date(local)
+
+
+# PUBLIC_INTERFACE
+def calendar_totals(user_id, bucket, tz, since, until):
+    """
+    Volume, set, session and max weight totals of a user per calendar bucket in
+    their time zone, computed by one aggregate over the (user_id, timestamp)
+    index. Buckets without sessions are included with zero totals.
+
+    Args:
+        user_id (int): ID of the user
+        bucket (str): One of CALENDAR_BUCKETS
+        tz (ZoneInfo): Time zone the buckets follow
+        since (date): First local day, moved back to the start of its bucket
+        until (date): Last local day, inclusive
+
+    Returns:
+        list: One dict per bucket, oldest first
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect not in ("sqlite", "postgresql"):
+        raise NotImplementedError(f"Calendar buckets are not supported on {dialect}")
+
+    first = bucket_start(since, bucket)
+    start, end = local_midnight_utc(first, tz), local_midnight_utc(until + timedelta(days=1), tz)
+    key = _bucket_expression(_local_timestamp(WorkoutSession.timestamp, tz, start, end, dialect), bucket, dialect)
+
+    # Mirrors the working set rule of the daily rollups
+    is_working_set = and_(
+        ExerciseLog.weight.isnot(None), ExerciseLog.weight != 0,
+        ExerciseLog.reps.isnot(None), ExerciseLog.reps != 0,
+    )
+    rows = (db.session.query(
+                key.label("bucket"),
+                func.count(func.distinct(WorkoutSession.id)).label("sessions"),
+                func.count(ExerciseLog.id).label("sets"),
+                func.coalesce(func.sum(case((is_working_set, 1), else_=0)), 0).label("working_sets"),
+                func.coalesce(func.sum(case((is_working_set, ExerciseLog.weight * ExerciseLog.reps), else_=0)),
+                              0).label("volume"),
+                func.max(ExerciseLog.weight).label("max_weight"))
+            .select_from(WorkoutSession)
+            .outerjoin(ExerciseLog, ExerciseLog.session_id == WorkoutSession.id)
+            .filter(WorkoutSession.user_id == user_id)
+            .filter(WorkoutSession.timestamp >= start)
+            .filter(WorkoutSession.timestamp < end)
+            # By label: Postgres would not match the bound time zone of a repeated expression
+            .group_by("bucket")
+            .all())
+    totals = {(row.bucket if isinstance(row.bucket, date) else date.fromisoformat(row.bucket)): row
+              for row in rows}
+
+    buckets = []
+    current = first
+    while current <= until:
+        following = next_bucket_start(current, bucket)
+        row = totals.get(current)
+        buckets.append({
+            "start": current.isoformat(),
+            "end": (following - timedelta(days=1)).isoformat(),
+            "sessions": row.sessions if row else 0,
+            "sets": row.sets if row else 0,
+            "working_sets": row.working_sets if row else 0,
+            "volume": round(row.volume or 0, 2) if row else 0,
+            "max_weight": row.max_weight if row and row.max_weight else None,
+        })
+        current = following
+    return buckets
@@ -0,0 +1,197 @@
+from . import db
+from .models import User
+from flask import current_app, request, make_response
+from flask_login import current_user
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+import hashlib
+import threading
+
+# Default bound on cached responses per process
+PROGRESS_CACHE_MAX_ENTRIES = 1024
+
+# Headers rebuilt for every response rather than replayed from a cache entry
+_UNCACHED_HEADERS = {"content-type", "content-length", "x-cache"}
+
+
+class LRUCache:
+    """
+    Thread-safe in-process cache that evicts the least recently used entry
+    once max_entries is reached. Any object with the same get/set methods,
+    e.g. a wrapper around a shared store, can replace it as the backend.
+    """
+
+    def __init__(self, max_entries=PROGRESS_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# PUBLIC_INTERFACE
+def bump_data_version(user_id):
+    """
+    Mark a user's training data as changed so cached progress results are not
+    served again. Runs inside the writer's transaction, so the new version
+    becomes visible together with the data it describes.
+
+    Args:
+        user_id (int): ID of the user whose data was written
+    """
+    (db.session.query(User)
+     .filter(User.id == user_id)
+     .update({User.data_version: User.data_version + 1,
+              User.data_modified_at: datetime.utcnow()},
+             synchronize_session=False))
+
+
+# PUBLIC_INTERFACE
+def get_data_version(user_id):
+    """
+    Read the current data version of a user.
+
+    Args:
+        user_id (int): ID of the user
+
+    Returns:
+        int: Version, incremented on every write to the user's training data
+    """
+    return db.session.query(User.data_version).filter(User.id == user_id).scalar() or 0
+
+
+def _validators(kwargs, dated):
+    """
+    Build the strong ETag of the current request from the user's data version
+    and read their last-modified watermark, in one primary key lookup.
+
+    Args:
+        kwargs (dict): URL arguments of the view
+        dated (bool): Whether the response depends on the current date
+
+    Returns:
+        tuple: (etag, data_modified_at); data_modified_at is None before the first write
+    """
+    version, modified_at = (db.session.query(User.data_version, User.data_modified_at)
+                            .filter(User.id == current_user.id)
+                            .one())
+    key = (
+        current_user.id,
+        request.endpoint,
+        tuple(sorted(kwargs.items())),
+        tuple(sorted(request.args.items(multi=True))),
+        version or 0,
+        datetime.utcnow().date().isoformat() if dated else None,
+    )
+    return hashlib.sha1(repr(key).encode()).hexdigest(), modified_at
+
+
+def _not_modified(etag, modified_at, dated):
+    """
+    Check the request's conditional headers against the current validators.
+    If-Modified-Since is only honoured when If-None-Match is absent and the
+    response does not depend on the current date.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if dated or modified_at is None or request.if_modified_since is None:
+        return False
+    return modified_at.replace(microsecond=0) <= request.if_modified_since.replace(tzinfo=None)
+
+
+def _with_validators(response, etag, modified_at):
+    response.set_etag(etag)
+    if modified_at is not None:
+        response.last_modified = modified_at
+    # Per-user data: browsers may keep it but must revalidate, shared caches must not
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+# PUBLIC_INTERFACE
+def conditional_on_data(view=None, dated=False):
+    """
+    Answer conditional GET requests from the user's data version. Sends strong
+    ETag and Last-Modified headers with successful responses and returns
+    304 Not Modified before the view runs when the client's copy is current.
+    Apply below @login_required.
+
+    Args:
+        view (callable): Flask view function
+        dated (bool): Set when the response depends on the current date, e.g.
+            windows relative to today, so the ETag changes at midnight UTC
+
+    Returns:
+        callable: Wrapped view
+    """
+    if view is None:
+        return lambda view: conditional_on_data(view, dated=dated)
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag, modified_at = _validators(kwargs, dated)
+        if _not_modified(etag, modified_at, dated):
+            return _with_validators(current_app.response_class(status=304), etag, modified_at)
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200:
+            _with_validators(response, etag, modified_at)
+        return response
+    return wrapper
+
+
+# PUBLIC_INTERFACE
+def cached_progress(view):
+    """
+    Cache successful JSON responses of a read-only view per user. The key is
+    the response's ETag, so it covers the endpoint, its arguments, the user's
+    data version and the current date; entries for an old version are never
+    read again and age out of the LRU. Headers set by the view are stored with
+    the body and sent again on a hit. Conditional requests are answered with
+    304 before the cache is consulted. Apply below @login_required.
+
+    Args:
+        view (callable): Flask view function
+
+    Returns:
+        callable: Wrapped view
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        etag, modified_at = _validators(kwargs, dated=True)
+        if _not_modified(etag, modified_at, dated=True):
+            return _with_validators(current_app.response_class(status=304), etag, modified_at)
+
+        cache = current_app.extensions["progress_cache"]
+        hit = cache.get(etag)
+        if hit is not None:
+            body, status, mimetype, headers = hit
+            response = current_app.response_class(body, status=status, headers=headers, mimetype=mimetype)
+            response.headers["X-Cache"] = "HIT"
+            return _with_validators(response, etag, modified_at)
+
+        response = make_response(view(*args, **kwargs))
+        response.headers["X-Cache"] = "MISS"
+        if response.status_code == 200:
+            headers = [(name, value) for name, value in response.headers
+                       if name.lower() not in _UNCACHED_HEADERS]
+            cache.set(etag, (response.get_data(), response.status_code, response.mimetype, headers))
+            _with_validators(response, etag, modified_at)
+        return response
+    return wrapper
@@ -0,0 +1,268 @@
+from . import db
+from .models import ExerciseCatalog, ExerciseLog, ExerciseNameGram, ExerciseDailyRollup, WorkoutSession
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import IntegrityError
+import click
+
+
+catalog_cli = AppGroup("catalog", help="Maintain the per-user exercise catalog and its search index.")
+
+# Minimum trigram similarity for a fuzzy match, as in pg_trgm
+SEARCH_SIMILARITY_THRESHOLD = 0.3
+SEARCH_DEFAULT_LIMIT = 10
+
+
+# PUBLIC_INTERFACE
+def normalize_exercise_name(name):
+    """
+    Build the catalog key for a free-text exercise name.
+
+    Args:
+        name (str): Exercise name as typed or stored on the workout
+
+    Returns:
+        str: Trimmed, case-folded name with inner whitespace collapsed
+    """
+    return " ".join((name or "").split()).casefold()
+
+
+# PUBLIC_INTERFACE
+def find_exercise_id(user_id, name):
+    """
+    Look up the catalog id for an exercise name without creating an entry.
+
+    Args:
+        user_id (int): ID of the user owning the catalog
+        name (str): Exercise name to look up
+
+    Returns:
+        int|None: Catalog id, or None if the user never logged this exercise
+    """
+    return (db.session.query(ExerciseCatalog.id)
+            .filter_by(user_id=user_id, name_key=normalize_exercise_name(name))
+            .scalar())
+
+
+# PUBLIC_INTERFACE
+def resolve_exercise_ids(user_id, names):
+    """
+    Map exercise names to catalog ids, creating missing catalog entries.
+    Runs inside the caller's transaction; new entries are flushed, not committed.
+
+    Args:
+        user_id (int): ID of the user owning the catalog
+        names (iterable): Exercise names about to be written to ExerciseLog
+
+    Returns:
+        dict: Mapping of each given name to its catalog id
+    """
+    keys = {}
+    for name in names:
+        keys.setdefault(normalize_exercise_name(name), name)
+    if not keys:
+        return {}
+
+    ids = dict(db.session.query(ExerciseCatalog.name_key, ExerciseCatalog.id)
+               .filter(ExerciseCatalog.user_id == user_id)
+               .filter(ExerciseCatalog.name_key.in_(list(keys)))
+               .all())
+
+    for key, name in keys.items():
+        if key in ids:
+            continue
+        entry = ExerciseCatalog(user_id=user_id, name_key=key, display_name=name.strip())
+        try:
+            # Savepoint so a concurrent writer creating the same entry does not
+            # abort the caller's transaction
+            with db.session.begin_nested():
+                db.session.add(entry)
+                db.session.flush()
+                index_exercise_names([entry])
+            ids[key] = entry.id
+        except IntegrityError:
+            ids[key] = (db.session.query(ExerciseCatalog.id)
+                        .filter_by(user_id=user_id, name_key=key)
+                        .scalar())
+
+    return {name: ids[normalize_exercise_name(name)] for name in names}
+
+
+# PUBLIC_INTERFACE
+def resolve_missing_exercise_ids(user_id=None):
+    """
+    Attach catalog ids to logs written without one, e.g. before rebuilding
+    the rollup and personal-record tables from raw logs.
+
+    Args:
+        user_id (int|None): Restrict to one user, or None for all users
+    """
+    query = (db.session.query(WorkoutSession.user_id, ExerciseLog.exercise_name)
+             .join(ExerciseLog, ExerciseLog.session_id == WorkoutSession.id)
+             .filter(ExerciseLog.exercise_id.is_(None))
+             .distinct())
+    if user_id is not None:
+        query = query.filter(WorkoutSession.user_id == user_id)
+
+    names_by_user = {}
+    for owner_id, exercise_name in query.all():
+        names_by_user.setdefault(owner_id, []).append(exercise_name)
+
+    for owner_id, names in names_by_user.items():
+        for exercise_name, exercise_id in resolve_exercise_ids(owner_id, names).items():
+            session_ids = select(WorkoutSession.id).filter(WorkoutSession.user_id == owner_id)
+            (db.session.query(ExerciseLog)
+             .filter(ExerciseLog.exercise_id.is_(None))
+             .filter(ExerciseLog.exercise_name == exercise_name)
+             .filter(ExerciseLog.session_id.in_(session_ids))
+             .update({ExerciseLog.exercise_id: exercise_id}, synchronize_session=False))
+
+
+# PUBLIC_INTERFACE
+def name_trigrams(name_key):
+    """
+    Split a catalog key into trigrams the way pg_trgm does: each word is padded
+    with two spaces in front and one behind, so word starts yield their own grams.
+
+    Args:
+        name_key (str): Normalized exercise name
+
+    Returns:
+        set: Three-character strings
+    """
+    grams = set()
+    for word in name_key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _similarity(query_grams, name_key):
+    grams = name_trigrams(name_key)
+    shared = len(query_grams & grams)
+    return shared / (len(query_grams) + len(grams) - shared) if shared else 0.0
+
+
+# PUBLIC_INTERFACE
+def index_exercise_names(entries):
+    """
+    Write the search trigrams of new catalog entries. Runs inside the caller's
+    transaction, like the entries themselves.
+
+    Args:
+        entries (list): Flushed ExerciseCatalog objects
+    """
+    rows = [{"user_id": entry.user_id, "exercise_id": entry.id, "gram": gram}
+            for entry in entries for gram in sorted(name_trigrams(entry.name_key))]
+    if rows:
+        db.session.execute(insert(ExerciseNameGram), rows)
+
+
+# PUBLIC_INTERFACE
+def rebuild_search_index(user_id=None):
+    """
+    Rebuild the trigram index from the catalog. Used for the initial backfill.
+
+    Args:
+        user_id (int|None): Restrict to one user, or None for all users
+
+    Returns:
+        int: Number of catalog entries indexed
+    """
+    delete = db.session.query(ExerciseNameGram)
+    entries = db.session.query(ExerciseCatalog)
+    if user_id is not None:
+        delete = delete.filter(ExerciseNameGram.user_id == user_id)
+        entries = entries.filter(ExerciseCatalog.user_id == user_id)
+    delete.delete(synchronize_session=False)
+    entries = entries.all()
+    index_exercise_names(entries)
+    db.session.commit()
+    return len(entries)
+
+
+# PUBLIC_INTERFACE
+def search_exercises(user_id, query, limit=SEARCH_DEFAULT_LIMIT, threshold=SEARCH_SIMILARITY_THRESHOLD):
+    """
+    Find a user's exercises by name prefix, then by trigram similarity.
+    Both are indexed lookups: a range on (user_id, name_key) for the prefix and
+    one aggregate over (user_id, gram) for the fuzzy candidates.
+
+    Args:
+        user_id (int): ID of the user owning the catalog
+        query (str): Name or fragment as typed
+        limit (int): Maximum number of results
+        threshold (float): Minimum similarity for a fuzzy match
+
+    Returns:
+        list: Dicts with id, name, match ("prefix" or "fuzzy") and similarity,
+            prefix matches first in name order, then the closest fuzzy matches
+    """
+    key = normalize_exercise_name(query)
+    if not key:
+        return []
+
+    prefix_rows = (db.session.query(ExerciseCatalog.id, ExerciseCatalog.display_name, ExerciseCatalog.name_key)
+                   .filter(ExerciseCatalog.user_id == user_id)
+                   .filter(ExerciseCatalog.name_key >= key)
+                   .filter(ExerciseCatalog.name_key < key + "\U0010ffff")
+                   .order_by(ExerciseCatalog.name_key.asc())
+                   .limit(limit)
+                   .all())
+    query_grams = name_trigrams(key)
+    results = [{"id": row.id, "name": row.display_name, "match": "prefix",
+                "similarity": round(_similarity(query_grams, row.name_key), 3)} for row in prefix_rows]
+    if len(results) >= limit:
+        return results
+
+    seen = {row.id for row in prefix_rows}
+    candidates = (db.session.query(ExerciseCatalog.id, ExerciseCatalog.display_name, ExerciseCatalog.name_key)
+                  .join(ExerciseNameGram, ExerciseNameGram.exercise_id == ExerciseCatalog.id)
+                  .filter(ExerciseNameGram.user_id == user_id)
+                  .filter(ExerciseNameGram.gram.in_(sorted(query_grams)))
+                  .group_by(ExerciseCatalog.id, ExerciseCatalog.display_name, ExerciseCatalog.name_key)
+                  .all())
+    fuzzy = []
+    for row in candidates:
+        similarity = _similarity(query_grams, row.name_key)
+        if row.id not in seen and similarity >= threshold:
+            fuzzy.append({"id": row.id, "name": row.display_name, "match": "fuzzy",
+                          "similarity": round(similarity, 3)})
+    fuzzy.sort(key=lambda result: (-result["similarity"], result["name"]))
+    return results + fuzzy[:limit - len(results)]
+
+
+# PUBLIC_INTERFACE
+def exercise_set_counts(user_id, workout_id=None, exercise_ids=None):
+    """
+    List the exercises a user has logged with their total set counts, read from
+    the daily rollups instead of the logs.
+
+    Args:
+        user_id (int): ID of the user
+        workout_id (int|None): Only count sets logged in this workout
+        exercise_ids (list|None): Only list these catalog entries
+
+    Returns:
+        list: (exercise_id, display_name, set_count) tuples in name order
+    """
+    query = (db.session.query(ExerciseCatalog.id, ExerciseCatalog.display_name,
+                              func.sum(ExerciseDailyRollup.set_count))
+             .join(ExerciseDailyRollup, ExerciseDailyRollup.exercise_id == ExerciseCatalog.id)
+             .filter(ExerciseDailyRollup.user_id == user_id))
+    if workout_id is not None:
+        query = query.filter(ExerciseDailyRollup.workout_id == workout_id)
+    if exercise_ids is not None:
+        query = query.filter(ExerciseCatalog.id.in_(exercise_ids))
+    return [tuple(row) for row in (query
+            .group_by(ExerciseCatalog.id, ExerciseCatalog.display_name)
+            .order_by(ExerciseCatalog.display_name.asc())
+            .all())]
+
+
+@catalog_cli.command("reindex")
+@click.option("--user-id", type=int, default=None, help="Only reindex this user's exercises.")
+def reindex_command(user_id):
+    """Rebuild the exercise name search index from the catalog."""
+    indexed = rebuild_search_index(user_id)
+    click.echo(f"Indexed {indexed} exercises.")
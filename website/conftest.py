@@ -0,0 +1,76 @@
+import pytest
+from website import create_app, db
+from website.models import User, Workout, Exercise
+
+IN_MEMORY_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def make_app(monkeypatch):
+    """
+    Factory for test apps, each on its own database with the tables created and
+    the default categories seeded.
+
+    The returned function takes:
+        database_url (str): SQLAlchemy URL; an in-memory SQLite database by default.
+            Use a file database when another thread needs its own connection.
+        **env: Further environment variables to set before the app is created
+    """
+    def make(database_url=IN_MEMORY_DATABASE_URL, **env):
+        monkeypatch.setenv("DATABASE_URL", database_url)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+        app = create_app()
+        app.config["TESTING"] = True
+        return app
+    return make
+
+
+@pytest.fixture
+def make_client():
+    """Factory for test clients logged in as a user (user 1 by default)."""
+    def make(app, user_id=1):
+        client = app.test_client()
+        with client.session_transaction() as sess:
+            sess["_user_id"] = str(user_id)
+        return client
+    return make
+
+
+@pytest.fixture
+def seed_user():
+    """
+    Function seeding an app's database with user 1, owner of workout 1,
+    "Push Day", which has one exercise, BENCH PRESS.
+    """
+    def seed(app):
+        with app.app_context():
+            user = User(email="user1@example.com", password="testpass")
+            db.session.add(user)
+            db.session.commit()
+            workout = Workout(user_id=user.id, name="Push Day", description="Chest")
+            db.session.add(workout)
+            db.session.commit()
+            db.session.add(Exercise(name="BENCH PRESS", include_details=True, workout_id=workout.id, details=""))
+            db.session.commit()
+    return seed
+
+
+@pytest.fixture
+def app(make_app, seed_user):
+    """
+    App on an in-memory database seeded by seed_user. Modules needing other rows
+    override this fixture, extending it or starting from make_app.
+
+    Yielded outside an app context: requests push their own, so the logged-in
+    user is not shared between them through g.
+    """
+    app = make_app()
+    seed_user(app)
+    yield app
+
+
+@pytest.fixture
+def client(app, make_client):
+    """Test client logged in as user 1."""
+    return make_client(app)
@@ -0,0 +1,404 @@
+from . import db, analytics
+from .models import Workout, WorkoutSession, ExerciseDailyRollup, ExerciseCatalog, SessionTopSet, PersonalRecord
+from .catalog import find_exercise_id, search_exercises
+from .records import serialize_personal_record
+from sqlalchemy import Date, func, type_coerce
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+# Chart datasets the dashboard endpoint can return, in response order
+DASHBOARD_SECTIONS = ("summary", "frequency", "volume", "weight")
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class RollupRow:
+    """One daily rollup row of the window, with its exercise's display name."""
+    day: date
+    workout_id: int
+    exercise_id: int
+    exercise_name: str
+    set_count: int
+    working_set_count: int
+    session_count: int
+    volume: float
+    max_weight: Optional[float]
+    weight_sum: float
+    weight_count: int
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class WorkoutSessionCount:
+    """Number of sessions of one workout on one day (UTC) of the window."""
+    day: date
+    workout_id: int
+    workout_name: Optional[str]
+    sessions: int
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class DashboardData:
+    """Everything the summary and frequency sections are computed from, loaded once per request."""
+    start_day: date
+    rollups: List[RollupRow]
+    workouts: List[WorkoutSessionCount]
+
+    def since(self, start_day):
+        """
+        The rows of a shorter window of the same load.
+
+        Args:
+            start_day (date): First day of the window, not before self.start_day
+
+        Returns:
+            DashboardData: Rows from start_day on
+        """
+        return DashboardData(
+            start_day=start_day,
+            rollups=[row for row in self.rollups if row.day >= start_day],
+            workouts=[row for row in self.workouts if row.day >= start_day],
+        )
+
+
+# PUBLIC_INTERFACE
+def window_start_day(days):
+    """
+    First day of a window of days ending today (UTC). Rollups are kept per day,
+    so windows start at midnight of that day.
+
+    Args:
+        days (int): Length of the window
+
+    Returns:
+        date: First day of the window
+    """
+    return (datetime.utcnow() - timedelta(days=days)).date()
+
+
+# PUBLIC_INTERFACE
+def load_dashboard_data(user_id, start_day):
+    """
+    Load a user's daily rollups and per-workout daily session counts from
+    start_day on. Two queries, independent of how many sections are computed
+    from the result; shorter windows are taken from it with DashboardData.since.
+
+    Args:
+        user_id (int): ID of the user
+        start_day (date): First day of the window
+
+    Returns:
+        DashboardData: Rows shared by all dashboard sections
+    """
+    rollups = (db.session.query(
+            ExerciseDailyRollup.day,
+            ExerciseDailyRollup.workout_id,
+            ExerciseDailyRollup.exercise_id,
+            ExerciseCatalog.display_name,
+            ExerciseDailyRollup.set_count,
+            ExerciseDailyRollup.working_set_count,
+            ExerciseDailyRollup.session_count,
+            ExerciseDailyRollup.volume,
+            ExerciseDailyRollup.max_weight,
+            ExerciseDailyRollup.weight_sum,
+            ExerciseDailyRollup.weight_count)
+        .join(ExerciseCatalog, ExerciseCatalog.id == ExerciseDailyRollup.exercise_id)
+        .filter(ExerciseDailyRollup.user_id == user_id)
+        .filter(ExerciseDailyRollup.day >= start_day)
+        .order_by(ExerciseDailyRollup.day.asc())
+        .all())
+
+    # date() yields text on SQLite; the Date type parses it back on the way out
+    day = type_coerce(func.date(WorkoutSession.timestamp), Date)
+    workouts = (db.session.query(day, WorkoutSession.workout_id, Workout.name, func.count(WorkoutSession.id))
+                .select_from(WorkoutSession)
+                .outerjoin(Workout, Workout.id == WorkoutSession.workout_id)
+                .filter(WorkoutSession.user_id == user_id)
+                .filter(WorkoutSession.timestamp >= datetime.combine(start_day, time.min))
+                .group_by(day, WorkoutSession.workout_id, Workout.name)
+                .all())
+
+    return DashboardData(
+        start_day=start_day,
+        rollups=[RollupRow(*row) for row in rollups],
+        workouts=[WorkoutSessionCount(*row) for row in workouts],
+    )
+
+
+def _exercise_totals(data):
+    """Per-exercise sums over the window, keyed by catalog id, in id order."""
+    totals = {}
+    for row in data.rollups:
+        entry = totals.setdefault(row.exercise_id, {
+            "exercise_name": row.exercise_name, "sets": 0, "sessions": 0, "volume": 0.0,
+            "weight_sum": 0.0, "weight_count": 0, "max_weight": None,
+        })
+        entry["sets"] += row.set_count
+        entry["sessions"] += row.session_count
+        entry["volume"] += row.volume or 0
+        entry["weight_sum"] += row.weight_sum or 0
+        entry["weight_count"] += row.weight_count
+        if row.max_weight is not None and (entry["max_weight"] is None or row.max_weight > entry["max_weight"]):
+            entry["max_weight"] = row.max_weight
+    return dict(sorted(totals.items()))
+
+
+# PUBLIC_INTERFACE
+def summary_section(data, days):
+    """
+    Session, set and volume totals with top exercises and workouts, as served by
+    /api/progress/performance-summary, its stored snapshots and the dashboard.
+
+    Args:
+        data (DashboardData): Shared load for the window
+        days (int): Length of the window, echoed as period_days
+
+    Returns:
+        dict: Performance summary
+    """
+    workout_frequency = defaultdict(int)
+    for workout in data.workouts:
+        if workout.workout_name:
+            workout_frequency[workout.workout_name] += workout.sessions
+    total_sessions = sum(workout.sessions for workout in data.workouts)
+
+    if not total_sessions:
+        return {
+            "period_days": days,
+            "total_sessions": 0,
+            "message": "No workout sessions found in the specified period"
+        }
+
+    totals = _exercise_totals(data).values()
+    exercise_frequency = {entry["exercise_name"]: entry["sets"] for entry in totals}
+    total_exercises = sum(entry["sets"] for entry in totals)
+    total_volume = sum(entry["volume"] for entry in totals)
+
+    top_exercises = sorted(exercise_frequency.items(), key=lambda x: x[1], reverse=True)[:5]
+    top_workouts = sorted(workout_frequency.items(), key=lambda x: x[1], reverse=True)[:5]
+
+    return {
+        "period_days": days,
+        "start_date": data.start_day.isoformat(),
+        "end_date": datetime.utcnow().date().isoformat(),
+        "total_sessions": total_sessions,
+        "total_exercises": total_exercises,
+        "total_volume": round(total_volume, 2),
+        "averages": {
+            "exercises_per_session": round(total_exercises / total_sessions, 1),
+            "volume_per_session": round(total_volume / total_sessions, 2),
+            "sessions_per_week": round(total_sessions / max(1, days / 7), 1)
+        },
+        "top_exercises": [{"name": name, "frequency": freq} for name, freq in top_exercises],
+        "top_workouts": [{"name": name, "frequency": freq} for name, freq in top_workouts],
+        "unique_exercises": len(exercise_frequency),
+        "unique_workouts": len(workout_frequency)
+    }
+
+
+# PUBLIC_INTERFACE
+def frequency_section(data, days):
+    """
+    How often each exercise was performed, as served by /api/progress/exercise-frequency
+    and the dashboard.
+
+    Args:
+        data (DashboardData): Shared load for the window
+        days (int): Length of the window, echoed as period_days
+
+    Returns:
+        dict: Exercise frequency, most frequent first
+    """
+    totals = sorted(_exercise_totals(data).values(), key=lambda entry: entry["sets"], reverse=True)
+    if not totals:
+        return {
+            "period_days": days,
+            "exercises": [],
+            "message": "No exercise data found in the specified period"
+        }
+
+    total_frequency = sum(entry["sets"] for entry in totals)
+    exercises = []
+    for entry in totals:
+        avg_weight = entry["weight_sum"] / entry["weight_count"] if entry["weight_count"] else None
+        exercises.append({
+            "exercise_name": entry["exercise_name"],
+            "frequency": entry["sets"],
+            "sessions": entry["sessions"],
+            "percentage": round((entry["sets"] / total_frequency) * 100, 1) if total_frequency > 0 else 0,
+            "avg_weight": round(avg_weight, 2) if avg_weight else None,
+            "max_weight": round(entry["max_weight"], 2) if entry["max_weight"] else None
+        })
+
+    return {
+        "period_days": days,
+        "start_date": data.start_day.isoformat(),
+        "end_date": datetime.utcnow().date().isoformat(),
+        "exercises": exercises,
+        "total_exercises": len(exercises),
+        "total_frequency": total_frequency
+    }
+
+
+# PUBLIC_INTERFACE
+def volume_section(user_id, workout):
+    """
+    Daily volume of one workout over all time, read from the daily rollups and
+    served by /api/progress/volume-trends and the dashboard's volume section.
+
+    Args:
+        user_id (int): ID of the user
+        workout (Workout): A workout owned by the user
+
+    Returns:
+        dict: Volume trend data points, oldest first
+    """
+    total_sessions = (WorkoutSession.query
+                      .filter_by(user_id=user_id, workout_id=workout.id)
+                      .count())
+    if not total_sessions:
+        return {
+            "workout_id": workout.id,
+            "workout_name": workout.name,
+            "data_points": [],
+            "message": "No workout sessions found"
+        }
+
+    rows = (db.session.query(
+                ExerciseDailyRollup.day,
+                func.sum(ExerciseDailyRollup.volume).label("volume"),
+                func.sum(ExerciseDailyRollup.working_set_count).label("total_sets"))
+            .filter(ExerciseDailyRollup.user_id == user_id)
+            .filter(ExerciseDailyRollup.workout_id == workout.id)
+            .group_by(ExerciseDailyRollup.day)
+            .order_by(ExerciseDailyRollup.day.asc())
+            .all())
+
+    data_points = [{
+        "date": row.day.isoformat(),
+        "volume": round(row.volume or 0, 2),
+        "total_sets": row.total_sets or 0,
+        "formatted_date": row.day.strftime("%b %d, %Y")
+    } for row in rows]
+
+    return {
+        "workout_id": workout.id,
+        "workout_name": workout.name,
+        "data_points": data_points,
+        "total_sessions": total_sessions,
+        "volume_range": {
+            "min": min(point["volume"] for point in data_points) if data_points else 0,
+            "max": max(point["volume"] for point in data_points) if data_points else 0
+        }
+    }
+
+
+# PUBLIC_INTERFACE
+def weight_section(user_id, exercise_name, bucket="day", max_points=None):
+    """
+    Heaviest top set per day of one exercise over all time, served by
+    /api/progress/weight-progression and the dashboard's weight section. The
+    name is resolved through the user's catalog, falling back to the closest
+    name in its search index; the daily maximum of the stored per-session top
+    sets is taken in SQL.
+
+    Args:
+        user_id (int): ID of the user
+        exercise_name (str): Name the client asked for
+        bucket (str): "day", "week" or "month"; each point is the heaviest top set in it
+        max_points (int|None): Downsample to at most this many points
+
+    Returns:
+        dict: Weight progression data points, oldest first
+    """
+    exercise_id = find_exercise_id(user_id, exercise_name)
+    matched_exercise = exercise_name
+    if exercise_id is None:
+        matches = search_exercises(user_id, exercise_name, limit=1)
+        if matches:
+            exercise_id, matched_exercise = matches[0]["id"], matches[0]["name"]
+    daily_rows = []
+    if exercise_id is not None:
+        day = func.date(WorkoutSession.timestamp)
+        daily_rows = (db.session.query(
+                day.label("day"),
+                func.max(SessionTopSet.weight).label("weight"),
+                func.min(WorkoutSession.timestamp).label("first_timestamp"),
+                func.count(func.distinct(SessionTopSet.session_id)).label("session_count"),
+                func.sum(SessionTopSet.set_count).label("set_count"))
+            .join(WorkoutSession, WorkoutSession.id == SessionTopSet.session_id)
+            .filter(SessionTopSet.exercise_id == exercise_id)
+            .filter(WorkoutSession.user_id == user_id)
+            .filter(SessionTopSet.weight > 0)  # Ensure positive weights
+            .group_by(day)
+            .order_by(day.asc())
+            .all())
+
+    if not daily_rows:
+        # List the user's catalog for debugging
+        available_exercises = (db.session.query(ExerciseCatalog.display_name)
+                               .filter(ExerciseCatalog.user_id == user_id)
+                               .order_by(ExerciseCatalog.name_key.asc())
+                               .all())
+        return {
+            "exercise_name": exercise_name,
+            "data_points": [],
+            "message": f"No weight data found for exercise '{exercise_name}'",
+            "available_exercises": [ex[0] for ex in available_exercises],
+            "debug_info": {
+                "searched_name": exercise_name,
+                "user_id": user_id,
+                "total_available": len(available_exercises)
+            }
+        }
+
+    # One point per day with the heaviest top set of that day, then merged into
+    # weeks or months and thinned out for long multi-year series
+    daily_points = [{
+        "day": row.first_timestamp.date(),
+        "weight": float(row.weight),
+        "timestamp": row.first_timestamp,
+        "session_count": row.session_count,
+    } for row in daily_rows]
+    points = analytics.bucket_max(daily_points, bucket)
+    if max_points is not None:
+        points = analytics.lttb(points, max_points)
+
+    # Weight range and progression stats over the full daily series
+    weights = [point["weight"] for point in daily_points]
+    progression = weights[-1] - weights[0] if len(weights) >= 2 else 0
+
+    record = (PersonalRecord.query
+              .options(db.joinedload(PersonalRecord.exercise))
+              .filter_by(user_id=user_id, exercise_id=exercise_id)
+              .first())
+
+    return {
+        "exercise_name": exercise_name,
+        "matched_exercise": matched_exercise,
+        "data_points": [{
+            "date": point["day"].isoformat(),
+            "weight": point["weight"],
+            "formatted_date": point["day"].strftime("%b %d, %Y"),
+            "session_count": point["session_count"],
+            "timestamp": point["timestamp"].isoformat()
+        } for point in points],
+        "total_sessions": len(daily_points),
+        "total_logs": sum(row.set_count for row in daily_rows),
+        "bucket": bucket,
+        "original_points": len(daily_points),
+        "weight_range": {
+            "min": min(weights),
+            "max": max(weights)
+        },
+        "progression_stats": {
+            "total_progression": round(progression, 2),
+            "progression_percentage": round((progression / weights[0] * 100) if weights[0] > 0 else 0, 1),
+            "average_weight": round(sum(weights) / len(weights), 2)
+        },
+        "weight_percentiles": analytics.percentiles(weights),
+        "personal_record": serialize_personal_record(record) if record else None
+    }
@@ -0,0 +1,69 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import timedelta
+
+# Sessions of the same workout logged closer together than this are treated
+# as accidental double submissions
+SESSION_DUPLICATE_WINDOW = timedelta(minutes=5)
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class SessionDuplicates:
+    """
+    Result of duplicate-session detection.
+
+    kept: Sessions left after dropping any session within the window of an
+        already kept session of the same workout, in input order.
+    matches: Session id -> (earlier-listed session, seconds apart) for every session
+        within the window of some session listed before it, matched to the first
+        such session in input order.
+    """
+    kept: list
+    matches: dict
+
+
+# PUBLIC_INTERFACE
+def find_duplicate_sessions(sessions, window=SESSION_DUPLICATE_WINDOW):
+    """
+    Detect near-duplicate sessions in one sort and a linear sweep per workout.
+
+    Args:
+        sessions (list): Objects with id, workout_id and timestamp, newest first
+        window (timedelta): Sessions strictly closer than this are duplicates
+
+    Returns:
+        SessionDuplicates: Kept sessions and duplicate matches
+    """
+    limit = window.total_seconds()
+
+    # One stable sort, newest first; sessions sharing a timestamp keep their input order
+    by_workout = defaultdict(list)
+    for position in sorted(range(len(sessions)), key=lambda i: sessions[i].timestamp, reverse=True):
+        by_workout[sessions[position].workout_id].append(position)
+
+    dropped = set()
+    matches = {}
+    for positions in by_workout.values():
+        # Earlier-listed sessions still inside the window, in listing order
+        recent = deque()
+        last_kept = None
+        for position in positions:
+            session = sessions[position]
+            while recent and (sessions[recent[0]].timestamp - session.timestamp).total_seconds() >= limit:
+                recent.popleft()
+            if recent:
+                other = sessions[recent[0]]
+                matches[session.id] = (other, abs((session.timestamp - other.timestamp).total_seconds()))
+            recent.append(position)
+
+            # Timestamps only decrease along the sweep, so the last kept session is the nearest one
+            if last_kept is not None and abs((session.timestamp - last_kept.timestamp).total_seconds()) < limit:
+                dropped.add(position)
+            else:
+                last_kept = session
+
+    return SessionDuplicates(
+        kept=[session for position, session in enumerate(sessions) if position not in dropped],
+        matches=matches,
+    )
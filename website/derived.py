@@ -0,0 +1,24 @@
+from . import db
+from .rollups import refresh_rollups
+from .records import refresh_top_sets
+from .cache import bump_data_version
+from .jobs import RECOMPUTE_SUMMARIES, enqueue_job
+
+
+# PUBLIC_INTERFACE
+def sync_derived_tables(user_id, sessions):
+    """
+    Bring the tables derived from exercise logs (daily rollups, session top sets,
+    personal records) up to date after a write, invalidate cached progress
+    results and queue the recompute of stored summaries. Must run inside the
+    writer's transaction so the derived rows commit together with the logs.
+
+    Args:
+        user_id (int): ID of the user who wrote the logs
+        sessions (list): WorkoutSession objects whose logs changed
+    """
+    db.session.flush()
+    refresh_rollups(user_id, [(s.timestamp.date(), s.workout_id) for s in sessions])
+    refresh_top_sets(user_id, [s.id for s in sessions])
+    bump_data_version(user_id)
+    enqueue_job(RECOMPUTE_SUMMARIES, user_id)
@@ -0,0 +1,156 @@
+from . import db
+from .models import IdempotencyKey
+from flask import request
+from sqlalchemy import insert
+from datetime import datetime, timedelta
+import json
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+# Form field carrying the key for plain HTML form posts, which cannot set headers
+IDEMPOTENCY_KEY_FIELD = "idempotency_key"
+IDEMPOTENCY_KEY_MAX_LENGTH = 100
+# Keys older than this are purged and no longer deduplicate retries
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+# PUBLIC_INTERFACE
+def read_idempotency_key(allow_form=False):
+    """
+    Read the Idempotency-Key of the current request.
+
+    Args:
+        allow_form (bool): Also accept the key as the idempotency_key form field
+
+    Returns:
+        tuple: (key: str|None, error: str|None)
+    """
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None and allow_form:
+        key = request.form.get(IDEMPOTENCY_KEY_FIELD)
+    if key is None:
+        return None, None
+    key = key.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return None, f"{IDEMPOTENCY_KEY_HEADER} must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+    return key, None
+
+
+# PUBLIC_INTERFACE
+def find_idempotent_response(user_id, key):
+    """
+    Look up the stored response of an earlier request with the same key, by
+    the unique (user_id, key) index.
+
+    Args:
+        user_id (int): ID of the user
+        key (str): Idempotency key
+
+    Returns:
+        tuple|None: (body: dict, status_code: int), or None if the key is unused.
+            A key used on another endpoint yields a 422 error body.
+    """
+    stored = (db.session.query(IdempotencyKey.endpoint, IdempotencyKey.status_code,
+                               IdempotencyKey.response_body)
+              .filter_by(user_id=user_id, key=key)
+              .first())
+    if stored is None:
+        return None
+    if stored.endpoint != request.endpoint:
+        return {"error": f"{IDEMPOTENCY_KEY_HEADER} was already used for a different request"}, 422
+    return json.loads(stored.response_body), stored.status_code
+
+
+# PUBLIC_INTERFACE
+def find_idempotent_responses(user_id, keys):
+    """
+    Look up the stored responses of many keys in one query.
+
+    Args:
+        user_id (int): ID of the user
+        keys (iterable): Idempotency keys
+
+    Returns:
+        dict: Key -> (endpoint: str, body: dict, status_code: int) for the keys in use
+    """
+    keys = list(set(keys))
+    if not keys:
+        return {}
+    rows = (db.session.query(IdempotencyKey.key, IdempotencyKey.endpoint, IdempotencyKey.status_code,
+                             IdempotencyKey.response_body)
+            .filter(IdempotencyKey.user_id == user_id)
+            .filter(IdempotencyKey.key.in_(keys))
+            .all())
+    return {row.key: (row.endpoint, json.loads(row.response_body), row.status_code) for row in rows}
+
+
+# PUBLIC_INTERFACE
+def claim_idempotency_key(user_id, key):
+    """
+    Insert the key before the write it guards. A concurrent request with the
+    same key fails here on the unique index (on PostgreSQL after waiting for
+    the first one to finish) before it has written anything.
+
+    Args:
+        user_id (int): ID of the user
+        key (str): Idempotency key
+
+    Returns:
+        IdempotencyKey: Claimed key, to pass to store_idempotent_response
+
+    Raises:
+        IntegrityError: If the key is already taken
+    """
+    claim = IdempotencyKey(user_id=user_id, key=key, endpoint=request.endpoint)
+    db.session.add(claim)
+    db.session.flush()
+    return claim
+
+
+# PUBLIC_INTERFACE
+def store_idempotent_response(claim, body, status_code):
+    """
+    Attach the response to a claimed key; it is committed with the write.
+
+    Args:
+        claim (IdempotencyKey): Key returned by claim_idempotency_key
+        body (dict): JSON response body
+        status_code (int): HTTP status of the response
+    """
+    claim.status_code = status_code
+    claim.response_body = json.dumps(body)
+
+
+# PUBLIC_INTERFACE
+def record_idempotent_responses(user_id, responses):
+    """
+    Store the responses of many writes with one executemany INSERT, inside the
+    caller's transaction. A key taken by a concurrent request fails the insert
+    on the unique index, and with it the whole transaction.
+
+    Args:
+        user_id (int): ID of the user
+        responses (dict): Key -> (body: dict, status_code: int)
+    """
+    if not responses:
+        return
+    now = datetime.utcnow()
+    db.session.execute(insert(IdempotencyKey), [
+        {"user_id": user_id, "key": key, "endpoint": request.endpoint, "status_code": status_code,
+         "response_body": json.dumps(body), "created_at": now}
+        for key, (body, status_code) in responses.items()
+    ])
+
+
+# PUBLIC_INTERFACE
+def purge_expired_idempotency_keys():
+    """
+    Delete keys older than IDEMPOTENCY_KEY_TTL.
+
+    Returns:
+        int: Number of keys deleted
+    """
+    purged = (db.session.query(IdempotencyKey)
+              .filter(IdempotencyKey.created_at < datetime.utcnow() - IDEMPOTENCY_KEY_TTL)
+              .delete(synchronize_session=False))
+    db.session.commit()
+    return purged
@@ -0,0 +1,241 @@
+from . import db
+from .models import BackgroundJob
+from .summaries import recompute_summaries
+from .idempotency import purge_expired_idempotency_keys
+from flask import current_app
+from flask.cli import AppGroup
+from datetime import datetime, timedelta
+import click
+import threading
+import time
+import traceback
+
+jobs_cli = AppGroup("jobs", help="Run and inspect the background job queue.")
+
+RECOMPUTE_SUMMARIES = "recompute-summaries"
+LOG_TOP_SETS = "log-top-sets"
+
+
+def _log_pending_top_sets(user_id):
+    # Imported on use: top_sets queues its own jobs through this module
+    from .top_sets import log_pending_top_sets
+    log_pending_top_sets(user_id)
+
+
+# Job kind -> callable taking the job's user_id
+JOB_HANDLERS = {
+    RECOMPUTE_SUMMARIES: recompute_summaries,
+    LOG_TOP_SETS: _log_pending_top_sets,
+}
+
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = timedelta(seconds=30)
+# A job still running after this long is assumed to belong to a dead worker
+JOB_STALE_AFTER = timedelta(minutes=10)
+JOB_POLL_INTERVAL = 1.0
+# Seconds between requeueing stale jobs and purging expired idempotency keys
+JOB_MAINTENANCE_INTERVAL = 3600.0
+
+
+# PUBLIC_INTERFACE
+def enqueue_job(kind, user_id=None):
+    """
+    Queue a job unless the same job is already waiting. Runs inside the caller's
+    transaction, so the job becomes visible to workers only when the write that
+    caused it commits.
+
+    Args:
+        kind (str): Key of JOB_HANDLERS
+        user_id (int|None): User the job works on
+    """
+    pending = (db.session.query(BackgroundJob.id)
+               .filter_by(kind=kind, user_id=user_id, status="queued")
+               .first())
+    if pending is None:
+        db.session.add(BackgroundJob(kind=kind, user_id=user_id, status="queued",
+                                     attempts=0, run_after=datetime.utcnow()))
+
+
+def _claim_next_job(kind=None, user_id=None):
+    """
+    Mark the oldest due job as running. The conditional UPDATE makes the claim
+    safe with several workers polling the same table.
+
+    Args:
+        kind (str|None): Claim only the queued job of this kind, due or not
+        user_id (int|None): User of that job
+
+    Returns:
+        BackgroundJob|None: Claimed job, or None if nothing is due
+    """
+    now = datetime.utcnow()
+    while True:
+        query = db.session.query(BackgroundJob.id).filter(BackgroundJob.status == "queued")
+        if kind is None:
+            query = query.filter(BackgroundJob.run_after <= now)
+        else:
+            query = query.filter(BackgroundJob.kind == kind, BackgroundJob.user_id == user_id)
+        candidate = query.order_by(BackgroundJob.run_after.asc(), BackgroundJob.id.asc()).first()
+        if candidate is None:
+            db.session.commit()
+            return None
+        claimed = (db.session.query(BackgroundJob)
+                   .filter(BackgroundJob.id == candidate.id, BackgroundJob.status == "queued")
+                   .update({BackgroundJob.status: "running", BackgroundJob.started_at: now,
+                            BackgroundJob.attempts: BackgroundJob.attempts + 1},
+                           synchronize_session=False))
+        db.session.commit()
+        if claimed:
+            return db.session.get(BackgroundJob, candidate.id)
+
+
+# PUBLIC_INTERFACE
+def run_next_job():
+    """
+    Claim and run one due job. A successful job is deleted; a failing one is
+    retried after JOB_RETRY_DELAY until JOB_MAX_ATTEMPTS, then kept as failed.
+
+    Returns:
+        bool: Whether a job was run
+    """
+    job = _claim_next_job()
+    if job is None:
+        return False
+    _run_claimed_job(job)
+    return True
+
+
+# PUBLIC_INTERFACE
+def run_queued_job(kind, user_id):
+    """
+    Claim and run the queued job of a kind for a user now, ahead of the queue
+    order, as run_next_job would. Nothing happens if a worker claimed it first.
+
+    Args:
+        kind (str): Key of JOB_HANDLERS
+        user_id (int): User the job works on
+
+    Returns:
+        bool: Whether the job was run
+    """
+    job = _claim_next_job(kind, user_id)
+    if job is None:
+        return False
+    _run_claimed_job(job)
+    return True
+
+
+def _run_claimed_job(job):
+    try:
+        JOB_HANDLERS[job.kind](job.user_id)
+        db.session.delete(job)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        job = db.session.get(BackgroundJob, job.id)
+        job.error = traceback.format_exc(limit=5)
+        if job.attempts >= JOB_MAX_ATTEMPTS:
+            job.status = "failed"
+        else:
+            job.status = "queued"
+            job.run_after = datetime.utcnow() + JOB_RETRY_DELAY * job.attempts
+        db.session.commit()
+        current_app.logger.exception("Background job %s (%s) failed", job.id, job.kind)
+
+
+# PUBLIC_INTERFACE
+def requeue_stale_jobs():
+    """
+    Put jobs left running by a worker that died back on the queue.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    requeued = (db.session.query(BackgroundJob)
+                .filter(BackgroundJob.status == "running")
+                .filter(BackgroundJob.started_at < datetime.utcnow() - JOB_STALE_AFTER)
+                .update({BackgroundJob.status: "queued"}, synchronize_session=False))
+    db.session.commit()
+    return requeued
+
+
+# PUBLIC_INTERFACE
+def run_worker(app, poll_interval=JOB_POLL_INTERVAL, stop_event=None):
+    """
+    Run jobs until stop_event is set, polling the queue when it is empty.
+    Stale jobs and expired idempotency keys are cleaned up on start and then
+    every JOB_MAINTENANCE_INTERVAL.
+
+    Args:
+        app (Flask): Application whose database holds the queue
+        poll_interval (float): Seconds to wait when no job is due
+        stop_event (threading.Event|None): Set to stop the loop
+    """
+    stop_event = stop_event or threading.Event()
+    with app.app_context():
+        next_maintenance = 0.0
+        while not stop_event.is_set():
+            try:
+                if time.monotonic() >= next_maintenance:
+                    requeue_stale_jobs()
+                    purge_expired_idempotency_keys()
+                    next_maintenance = time.monotonic() + JOB_MAINTENANCE_INTERVAL
+                ran = run_next_job()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Background worker could not claim a job")
+                ran = False
+            finally:
+                db.session.remove()
+            if not ran:
+                stop_event.wait(poll_interval)
+
+
+# PUBLIC_INTERFACE
+def start_worker_thread(app, poll_interval=JOB_POLL_INTERVAL):
+    """
+    Run the worker in a daemon thread of the current process, for single-process
+    deployments that do not start `flask jobs worker` separately.
+
+    Args:
+        app (Flask): Application whose database holds the queue
+        poll_interval (float): Seconds to wait when no job is due
+
+    Returns:
+        threading.Event: Set it to stop the thread
+    """
+    stop_event = threading.Event()
+    thread = threading.Thread(target=run_worker, args=(app, poll_interval, stop_event),
+                              name="background-jobs", daemon=True)
+    thread.start()
+    return stop_event
+
+
+@jobs_cli.command("worker")
+@click.option("--poll-interval", type=float, default=JOB_POLL_INTERVAL, help="Seconds between polls of an empty queue.")
+def worker_command(poll_interval):
+    """Run queued background jobs until interrupted."""
+    click.echo("Background worker started.")
+    try:
+        run_worker(current_app._get_current_object(), poll_interval)
+    except KeyboardInterrupt:
+        pass
+
+
+@jobs_cli.command("run-pending")
+def run_pending_command():
+    """Run every job that is due now, then exit."""
+    count = 0
+    while run_next_job():
+        count += 1
+    click.echo(f"Ran {count} jobs.")
+
+
+@jobs_cli.command("status")
+def status_command():
+    """Show the number of jobs per status."""
+    rows = (db.session.query(BackgroundJob.status, db.func.count(BackgroundJob.id))
+            .group_by(BackgroundJob.status)
+            .all())
+    for status, count in rows or [("empty", 0)]:
+        click.echo(f"{status}: {count}")
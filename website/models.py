@@ -3,10 +3,18 @@ from flask_login import UserMixin
 
 from datetime import datetime
 
+# Predicates of the partial unique indexes behind top-set upserts; ON CONFLICT
+# clauses must repeat them to target the index
+TOP_SET_SESSION_PREDICATE = "top_set_day IS NOT NULL"
+TOP_SET_LOG_PREDICATE = "top_set IS NOT NULL"
+
 class User(db.Model, UserMixin):
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(50), unique=True)
     password = db.Column(db.String(200))
+    # Incremented on every write to the user's training data; keys cached progress results
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default="0")
+    data_modified_at = db.Column(db.DateTime, nullable=True)
     workouts = db.relationship("Workout")
     # PUBLIC_INTERFACE
     workout_sessions = db.relationship("WorkoutSession", backref="user", lazy=True)
@@ -27,7 +35,7 @@ class Workout(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50))
     description = db.Column(db.String(50))
-    user_id = db.Column(db.Integer, db.ForeignKey("user.id"))
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), index=True)
     category_id = db.Column(db.Integer, db.ForeignKey("category.id"), nullable=True)
     exercises = db.relationship("Exercise")
 
@@ -40,30 +48,214 @@ class Exercise(db.Model):
     reps = db.Column(db.String(20))  # Support ranges like "8-12" or "10"
     details = db.Column(db.String(50))  # Increased from 5 to 50 characters for interactive inputs
     include_details = db.Column(db.Boolean)
-    workout_id = db.Column(db.Integer, db.ForeignKey("workout.id"))
+    workout_id = db.Column(db.Integer, db.ForeignKey("workout.id"), index=True)
 
 # PUBLIC_INTERFACE
 class WorkoutSession(db.Model):
     """
     Represents a user's workout session for a specific workout at a specific time.
     """
+    __table_args__ = (
+        # History and analytics routes filter by user and a timestamp range,
+        # optionally narrowed to a single workout.
+        db.Index("ix_workout_session_user_timestamp", "user_id", "timestamp"),
+        db.Index("ix_workout_session_user_workout_timestamp", "user_id", "workout_id", "timestamp"),
+        # One top-set session per workout and day; the upserts in top_sets.py target it
+        db.Index("uq_workout_session_top_set_day", "user_id", "workout_id", "top_set_day", unique=True,
+                 sqlite_where=db.text(TOP_SET_SESSION_PREDICATE),
+                 postgresql_where=db.text(TOP_SET_SESSION_PREDICATE)),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     workout_id = db.Column(db.Integer, db.ForeignKey("workout.id"), nullable=False)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    top_set_day = db.Column(db.Date, nullable=True)  # UTC day, set only on sessions of saved top sets
     exercise_logs = db.relationship("ExerciseLog", backref="session", cascade="all, delete-orphan", lazy=True)
     workout = db.relationship("Workout")  # convenience relationship
 
+# PUBLIC_INTERFACE
+class ExerciseCatalog(db.Model):
+    """
+    Canonical per-user exercise names. Logs reference an entry by id so that
+    lookups by exercise are a single indexed equality on exercise_log.exercise_id.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "name_key", name="uq_exercise_catalog_user_name_key"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    name_key = db.Column(db.String(45), nullable=False)      # Trimmed, case-folded name
+    display_name = db.Column(db.String(45), nullable=False)  # Name as first logged
+
+# PUBLIC_INTERFACE
+class ExerciseNameGram(db.Model):
+    """
+    Trigrams of each catalog name, for prefix and fuzzy exercise search without
+    scanning logs. Written together with the catalog entry.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("exercise_id", "gram", name="uq_exercise_name_gram_exercise_gram"),
+        db.Index("ix_exercise_name_gram_user_gram", "user_id", "gram"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercise_catalog.id"), nullable=False)
+    gram = db.Column(db.String(3), nullable=False)
+
 # PUBLIC_INTERFACE
 class ExerciseLog(db.Model):
     """
     Details of each exercise performed in a WorkoutSession, including sets/reps/weights.
     """
+    __table_args__ = (
+        db.Index("ix_exercise_log_session_exercise_name", "session_id", "exercise_name"),
+        # One top set per exercise in a top-set session; the upserts in top_sets.py target it
+        db.Index("uq_exercise_log_top_set", "session_id", "exercise_id", unique=True,
+                 sqlite_where=db.text(TOP_SET_LOG_PREDICATE),
+                 postgresql_where=db.text(TOP_SET_LOG_PREDICATE)),
+    )
     id = db.Column(db.Integer, primary_key=True)
     session_id = db.Column(db.Integer, db.ForeignKey("workout_session.id"), nullable=False)
     exercise_name = db.Column(db.String(45), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercise_catalog.id"), nullable=True, index=True)
     set_number = db.Column(db.Integer, nullable=True)      # Can be used for multi-set support
     reps = db.Column(db.Integer, nullable=True)
     weight = db.Column(db.Float(5), nullable=True)
     details = db.Column(db.String(10), nullable=True)
     include_details = db.Column(db.Boolean, nullable=True)
+    top_set = db.Column(db.Boolean, nullable=True)  # True on logs of saved top sets, else NULL
+    exercise = db.relationship("ExerciseCatalog")
+
+# PUBLIC_INTERFACE
+class ExerciseDailyRollup(db.Model):
+    """
+    Per-user daily totals for one exercise within one workout. Maintained in the
+    same transaction as log writes so progress endpoints never scan raw logs.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "day", "workout_id", "exercise_id", name="uq_exercise_daily_rollup_key"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    day = db.Column(db.Date, nullable=False)                 # UTC date of the session timestamp
+    workout_id = db.Column(db.Integer, db.ForeignKey("workout.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercise_catalog.id"), nullable=False)
+    set_count = db.Column(db.Integer, nullable=False, default=0)          # All logged sets
+    working_set_count = db.Column(db.Integer, nullable=False, default=0)  # Sets with weight and reps
+    session_count = db.Column(db.Integer, nullable=False, default=0)
+    total_reps = db.Column(db.Integer, nullable=False, default=0)
+    volume = db.Column(db.Float, nullable=False, default=0)               # Sum of weight x reps
+    max_weight = db.Column(db.Float, nullable=True)
+    weight_sum = db.Column(db.Float, nullable=False, default=0)           # For average weight
+    weight_count = db.Column(db.Integer, nullable=False, default=0)
+
+# PUBLIC_INTERFACE
+class SessionTopSet(db.Model):
+    """
+    Pointer to the top set (heaviest weight, then most reps) of each exercise in a
+    session, with per-exercise set totals. Maintained whenever a session's logs change.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("session_id", "exercise_id", name="uq_session_top_set_session_exercise"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    session_id = db.Column(db.Integer, db.ForeignKey("workout_session.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercise_catalog.id"), nullable=False, index=True)
+    log_id = db.Column(db.Integer, db.ForeignKey("exercise_log.id"), nullable=False)
+    weight = db.Column(db.Float, nullable=True)
+    reps = db.Column(db.Integer, nullable=True)
+    set_count = db.Column(db.Integer, nullable=False, default=0)
+    weight_sum = db.Column(db.Float, nullable=False, default=0)
+    log = db.relationship("ExerciseLog")
+
+# PUBLIC_INTERFACE
+class PersonalRecord(db.Model):
+    """
+    A user's best set for an exercise: heaviest weight, best reps at that weight,
+    and when it was first achieved.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "exercise_id", name="uq_personal_record_user_exercise"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    exercise_id = db.Column(db.Integer, db.ForeignKey("exercise_catalog.id"), nullable=False)
+    session_id = db.Column(db.Integer, db.ForeignKey("workout_session.id"), nullable=False)
+    log_id = db.Column(db.Integer, db.ForeignKey("exercise_log.id"), nullable=False)
+    weight = db.Column(db.Float, nullable=True)
+    reps = db.Column(db.Integer, nullable=True)
+    achieved_at = db.Column(db.DateTime, nullable=False)
+    exercise = db.relationship("ExerciseCatalog")
+
+# PUBLIC_INTERFACE
+class BackgroundJob(db.Model):
+    """
+    A unit of deferred work in the database-backed job queue, claimed and run
+    by `flask jobs worker`. Rows are deleted once the job succeeds.
+    """
+    __table_args__ = (
+        db.Index("ix_background_job_status_run_after", "status", "run_after"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=True)
+    status = db.Column(db.String(10), nullable=False, default="queued")  # queued, running or failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+
+# PUBLIC_INTERFACE
+class SummarySnapshot(db.Model):
+    """
+    A precomputed summary response for one user and parameter set, valid while
+    the user's data version and the UTC date it was computed on are current.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "name", "params", name="uq_summary_snapshot_user_name_params"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    name = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.String(100), nullable=False)
+    data_version = db.Column(db.Integer, nullable=False)
+    computed_on = db.Column(db.Date, nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+
+# PUBLIC_INTERFACE
+class IdempotencyKey(db.Model):
+    """
+    A client-supplied Idempotency-Key and the response of the write it made,
+    inserted in the same transaction so a retried request replays the response.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "key", name="uq_idempotency_key_user_key"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    key = db.Column(db.String(100), nullable=False)
+    endpoint = db.Column(db.String(100), nullable=False)   # Flask endpoint that used the key
+    # Set before commit; NULL only while the claiming transaction is open
+    status_code = db.Column(db.Integer, nullable=True)
+    response_body = db.Column(db.Text, nullable=True)      # JSON
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+# PUBLIC_INTERFACE
+class PendingTopSet(db.Model):
+    """
+    A top set saved on the workout page that is not yet in the workout history.
+    Kept once per exercise of a workout, so repeated saves coalesce, and written
+    to the history by the log-top-sets job, which deletes it.
+    """
+    __table_args__ = (
+        db.UniqueConstraint("user_id", "workout_id", "exercise_name", name="uq_pending_top_set_user_workout_exercise"),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
+    workout_id = db.Column(db.Integer, db.ForeignKey("workout.id"), nullable=False)
+    exercise_name = db.Column(db.String(45), nullable=False)
+    weight = db.Column(db.Float(5), nullable=True)
+    reps = db.Column(db.Integer, nullable=True)
+    details = db.Column(db.String(50), nullable=True)
+    include_details = db.Column(db.Boolean, nullable=True)
+    saved_at = db.Column(db.DateTime, nullable=False)  # Time of the latest save; the session's day
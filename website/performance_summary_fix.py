@@ -41,21 +41,7 @@ def get_performance_summary():
             })
         
         # Remove duplicate sessions that are within 5 minutes of each other for the same workout
-        unique_sessions = []
-        session_threshold = timedelta(minutes=5)
-        
-        for session in all_sessions:
-            is_duplicate = False
-            for existing_session in unique_sessions:
-                if (session.workout_id == existing_session.workout_id and 
-                    abs((session.timestamp - existing_session.timestamp).total_seconds()) < session_threshold.total_seconds()):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique_sessions.append(session)
-        
-        sessions = unique_sessions
+        sessions = find_duplicate_sessions(all_sessions).kept
         total_sessions = len(sessions)
         
         # Calculate summary metrics with proper deduplication
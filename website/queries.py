@@ -0,0 +1,228 @@
+from . import db
+from .models import Workout, WorkoutSession, ExerciseLog, SessionTopSet
+from sqlalchemy import and_, or_, func
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# Keeps IN lists well below SQLite's bound-parameter limit
+IN_BATCH_SIZE = 500
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class LogRow:
+    """A single logged set, detached from the ORM."""
+    id: int
+    session_id: int
+    exercise_id: Optional[int]
+    exercise_name: str
+    set_number: Optional[int]
+    reps: Optional[int]
+    weight: Optional[float]
+    details: Optional[str]
+    include_details: Optional[bool]
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class TopSetRow:
+    """The top set of one exercise in a session, with the exercise's set totals."""
+    session_id: int
+    exercise_id: int
+    exercise_name: str
+    set_number: Optional[int]
+    reps: Optional[int]
+    weight: Optional[float]
+    details: Optional[str]
+    include_details: Optional[bool]
+    set_count: int
+    weight_sum: float
+
+
+# PUBLIC_INTERFACE
+@dataclass
+class SessionRow:
+    """A workout session with its workout name and, when requested, its logs or top sets."""
+    id: int
+    workout_id: int
+    workout_name: Optional[str]
+    timestamp: datetime
+    logs: List[LogRow] = field(default_factory=list)
+    top_sets: List[TopSetRow] = field(default_factory=list)
+
+
+def _batches(ids):
+    ids = list(ids)
+    for start in range(0, len(ids), IN_BATCH_SIZE):
+        yield ids[start:start + IN_BATCH_SIZE]
+
+
+# PUBLIC_INTERFACE
+def load_sessions(user_id, since=None, until=None, workout_id=None, before=None,
+                  limit=None, newest_first=True, with_logs=False, with_top_sets=False):
+    """
+    Load a user's sessions with workout names in one query, then bulk-load their
+    logs and/or top sets with one IN query per batch of sessions.
+
+    Args:
+        user_id (int): ID of the user
+        since (datetime|None): Only sessions at or after this time
+        until (datetime|None): Only sessions before this time
+        workout_id (int|None): Only sessions of this workout
+        before (tuple|None): Keyset position (timestamp, id); only sessions strictly
+            after it in newest-first order
+        limit (int|None): Maximum number of sessions
+        newest_first (bool): Order by (timestamp, id) descending instead of ascending
+        with_logs (bool): Populate SessionRow.logs
+        with_top_sets (bool): Populate SessionRow.top_sets
+
+    Returns:
+        list: SessionRow objects in the requested order
+    """
+    query = (db.session.query(WorkoutSession.id, WorkoutSession.workout_id,
+                              Workout.name, WorkoutSession.timestamp)
+             .outerjoin(Workout, Workout.id == WorkoutSession.workout_id)
+             .filter(WorkoutSession.user_id == user_id))
+    if since is not None:
+        query = query.filter(WorkoutSession.timestamp >= since)
+    if until is not None:
+        query = query.filter(WorkoutSession.timestamp < until)
+    if workout_id is not None:
+        query = query.filter(WorkoutSession.workout_id == workout_id)
+    if before is not None:
+        before_timestamp, before_id = before
+        query = query.filter(or_(
+            WorkoutSession.timestamp < before_timestamp,
+            and_(WorkoutSession.timestamp == before_timestamp, WorkoutSession.id < before_id)
+        ))
+
+    if newest_first:
+        query = query.order_by(WorkoutSession.timestamp.desc(), WorkoutSession.id.desc())
+    else:
+        query = query.order_by(WorkoutSession.timestamp.asc(), WorkoutSession.id.asc())
+    if limit is not None:
+        query = query.limit(limit)
+
+    sessions = [SessionRow(id=row[0], workout_id=row[1], workout_name=row[2], timestamp=row[3])
+                for row in query.all()]
+
+    if with_logs:
+        logs = load_logs([session.id for session in sessions])
+        for session in sessions:
+            session.logs = logs[session.id]
+    if with_top_sets:
+        top_sets = load_top_sets([session.id for session in sessions])
+        for session in sessions:
+            session.top_sets = top_sets[session.id]
+    return sessions
+
+
+# PUBLIC_INTERFACE
+def load_logs(session_ids):
+    """
+    Bulk-load the logs of many sessions.
+
+    Args:
+        session_ids (iterable): Session IDs
+
+    Returns:
+        defaultdict: session_id -> list of LogRow in insertion order
+    """
+    logs = defaultdict(list)
+    for batch in _batches(session_ids):
+        rows = (db.session.query(ExerciseLog.id, ExerciseLog.session_id, ExerciseLog.exercise_id,
+                                 ExerciseLog.exercise_name, ExerciseLog.set_number, ExerciseLog.reps,
+                                 ExerciseLog.weight, ExerciseLog.details, ExerciseLog.include_details)
+                .filter(ExerciseLog.session_id.in_(batch))
+                .order_by(ExerciseLog.session_id, ExerciseLog.id)
+                .all())
+        for row in rows:
+            logs[row.session_id].append(LogRow(*row))
+    return logs
+
+
+# PUBLIC_INTERFACE
+def load_top_sets(session_ids):
+    """
+    Bulk-load the stored top set of every exercise in many sessions.
+
+    Args:
+        session_ids (iterable): Session IDs
+
+    Returns:
+        defaultdict: session_id -> list of TopSetRow in the order exercises were first logged
+    """
+    top_sets = defaultdict(list)
+    for batch in _batches(session_ids):
+        rows = (db.session.query(SessionTopSet.session_id, SessionTopSet.exercise_id,
+                                 ExerciseLog.exercise_name, ExerciseLog.set_number, ExerciseLog.reps,
+                                 ExerciseLog.weight, ExerciseLog.details, ExerciseLog.include_details,
+                                 SessionTopSet.set_count, SessionTopSet.weight_sum)
+                .join(ExerciseLog, ExerciseLog.id == SessionTopSet.log_id)
+                .filter(SessionTopSet.session_id.in_(batch))
+                .order_by(SessionTopSet.session_id, SessionTopSet.id)
+                .all())
+        for row in rows:
+            top_sets[row.session_id].append(TopSetRow(*row))
+    return top_sets
+
+
+# PUBLIC_INTERFACE
+def session_totals(user_id, since=None):
+    """
+    Per-session set counts and volume (weight x reps over sets with both
+    recorded), aggregated in one GROUP BY.
+
+    Args:
+        user_id (int): ID of the user
+        since (datetime|None): Only sessions at or after this time
+
+    Returns:
+        dict: session_id -> (set_count, volume), for sessions with logs
+    """
+    query = (db.session.query(ExerciseLog.session_id, func.count(ExerciseLog.id),
+                              func.coalesce(func.sum(ExerciseLog.weight * ExerciseLog.reps), 0))
+             .join(WorkoutSession, WorkoutSession.id == ExerciseLog.session_id)
+             .filter(WorkoutSession.user_id == user_id))
+    if since is not None:
+        query = query.filter(WorkoutSession.timestamp >= since)
+    return {session_id: (set_count, float(volume))
+            for session_id, set_count, volume in query.group_by(ExerciseLog.session_id)}
+
+
+# PUBLIC_INTERFACE
+def iter_sessions_with_logs(user_id, batch_size=1000):
+    """
+    Stream all of a user's sessions, oldest first, each with its logs.
+    Rows are fetched through a server-side cursor in batches of batch_size, so
+    memory use does not depend on the size of the history.
+
+    Args:
+        user_id (int): ID of the user
+        batch_size (int): Rows fetched from the cursor at a time
+
+    Yields:
+        SessionRow: Sessions with logs populated, in (timestamp, id) order
+    """
+    query = (db.session.query(WorkoutSession.id, WorkoutSession.workout_id, Workout.name,
+                              WorkoutSession.timestamp, ExerciseLog.id, ExerciseLog.exercise_id,
+                              ExerciseLog.exercise_name, ExerciseLog.set_number, ExerciseLog.reps,
+                              ExerciseLog.weight, ExerciseLog.details, ExerciseLog.include_details)
+             .outerjoin(Workout, Workout.id == WorkoutSession.workout_id)
+             .outerjoin(ExerciseLog, ExerciseLog.session_id == WorkoutSession.id)
+             .filter(WorkoutSession.user_id == user_id)
+             .order_by(WorkoutSession.timestamp.asc(), WorkoutSession.id.asc(), ExerciseLog.id.asc())
+             .yield_per(batch_size))
+
+    session = None
+    for row in query:
+        if session is None or session.id != row[0]:
+            if session is not None:
+                yield session
+            session = SessionRow(id=row[0], workout_id=row[1], workout_name=row[2], timestamp=row[3])
+        if row[4] is not None:
+            session.logs.append(LogRow(row[4], row[0], *row[5:]))
+    if session is not None:
+        yield session
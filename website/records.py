@@ -0,0 +1,225 @@
+from . import db
+from .models import WorkoutSession, ExerciseLog, SessionTopSet, PersonalRecord
+from .catalog import resolve_missing_exercise_ids
+from flask.cli import AppGroup
+from sqlalchemy import func, insert, select
+from collections import namedtuple
+import click
+
+
+records_cli = AppGroup("records", help="Maintain session top sets and personal records.")
+
+# A candidate set for a personal record
+TopSet = namedtuple("TopSet", ["session_id", "log_id", "weight", "reps", "timestamp"])
+
+
+def set_rank(weight, reps):
+    """
+    Sort key for comparing sets: heavier weight first, then more reps.
+
+    Args:
+        weight (float|None): Weight lifted
+        reps (int|None): Repetitions performed
+
+    Returns:
+        tuple: Comparable rank, higher is better
+    """
+    return (weight or 0, reps or 0)
+
+
+def _beats(candidate, incumbent):
+    """Whether a set should replace the current record; ties go to the earlier set."""
+    candidate_rank = set_rank(candidate.weight, candidate.reps)
+    incumbent_rank = set_rank(incumbent.weight, incumbent.reps)
+    if candidate_rank != incumbent_rank:
+        return candidate_rank > incumbent_rank
+    return candidate.timestamp < incumbent.timestamp
+
+
+def _best_stored_top_set(user_id, exercise_id):
+    """Find the best stored top set of an exercise, used when a record must be recomputed."""
+    row = (db.session.query(SessionTopSet.session_id, SessionTopSet.log_id, SessionTopSet.weight,
+                            SessionTopSet.reps, WorkoutSession.timestamp)
+           .join(WorkoutSession, WorkoutSession.id == SessionTopSet.session_id)
+           .filter(SessionTopSet.exercise_id == exercise_id)
+           .filter(WorkoutSession.user_id == user_id)
+           .order_by(func.coalesce(SessionTopSet.weight, 0).desc(),
+                     func.coalesce(SessionTopSet.reps, 0).desc(),
+                     WorkoutSession.timestamp.asc())
+           .first())
+    return TopSet(*row) if row else None
+
+
+def _save_record(user_id, exercise_id, record, top_set):
+    """Create or overwrite a personal record from a top set row."""
+    if record is None:
+        record = PersonalRecord(user_id=user_id, exercise_id=exercise_id)
+        db.session.add(record)
+    record.session_id = top_set.session_id
+    record.log_id = top_set.log_id
+    record.weight = top_set.weight
+    record.reps = top_set.reps
+    record.achieved_at = top_set.timestamp
+
+
+# PUBLIC_INTERFACE
+def refresh_top_sets(user_id, session_ids):
+    """
+    Recompute the top-set pointers of the given sessions and bring the user's
+    personal records in line. Runs inside the caller's transaction, after the
+    session's logs have been flushed.
+
+    Args:
+        user_id (int): ID of the user owning the sessions
+        session_ids (iterable): Sessions whose logs were inserted, updated or deleted
+    """
+    session_ids = list(set(session_ids))
+    if not session_ids:
+        return
+
+    # Records pointing into these sessions may no longer hold after the refresh
+    stale = {exercise_id for (exercise_id,) in
+             db.session.query(PersonalRecord.exercise_id)
+             .filter(PersonalRecord.user_id == user_id)
+             .filter(PersonalRecord.session_id.in_(session_ids))}
+
+    db.session.query(SessionTopSet).filter(
+        SessionTopSet.session_id.in_(session_ids)
+    ).delete(synchronize_session=False)
+
+    logs = (db.session.query(ExerciseLog.id, ExerciseLog.session_id, ExerciseLog.exercise_id,
+                             ExerciseLog.weight, ExerciseLog.reps, WorkoutSession.timestamp)
+            .join(WorkoutSession, WorkoutSession.id == ExerciseLog.session_id)
+            .filter(ExerciseLog.session_id.in_(session_ids))
+            .filter(ExerciseLog.exercise_id.isnot(None))
+            .order_by(ExerciseLog.id.asc())
+            .all())
+
+    top_sets = {}
+    for log in logs:
+        entry = top_sets.get((log.session_id, log.exercise_id))
+        if entry is None:
+            entry = top_sets[(log.session_id, log.exercise_id)] = {"log": log, "set_count": 0, "weight_sum": 0}
+        elif set_rank(log.weight, log.reps) > set_rank(entry["log"].weight, entry["log"].reps):
+            entry["log"] = log
+        entry["set_count"] += 1
+        entry["weight_sum"] += log.weight or 0
+
+    if top_sets:
+        db.session.execute(insert(SessionTopSet), [{
+            "session_id": entry["log"].session_id,
+            "exercise_id": entry["log"].exercise_id,
+            "log_id": entry["log"].id,
+            "weight": entry["log"].weight,
+            "reps": entry["log"].reps,
+            "set_count": entry["set_count"],
+            "weight_sum": entry["weight_sum"],
+        } for entry in top_sets.values()])
+
+    # Best new top set per exercise
+    candidates = {}
+    for entry in top_sets.values():
+        log = entry["log"]
+        candidate = TopSet(log.session_id, log.id, log.weight, log.reps, log.timestamp)
+        current = candidates.get(log.exercise_id)
+        if current is None or _beats(candidate, current):
+            candidates[log.exercise_id] = candidate
+
+    exercise_ids = set(candidates) | stale
+    records = {record.exercise_id: record for record in
+               PersonalRecord.query.filter(PersonalRecord.user_id == user_id)
+               .filter(PersonalRecord.exercise_id.in_(exercise_ids))}
+
+    for exercise_id in exercise_ids:
+        record = records.get(exercise_id)
+        if exercise_id in stale:
+            best = _best_stored_top_set(user_id, exercise_id)
+            if best is None:
+                db.session.delete(record)
+            else:
+                _save_record(user_id, exercise_id, record, best)
+            continue
+
+        candidate = candidates[exercise_id]
+        if record is None or _beats(candidate, TopSet(record.session_id, record.log_id, record.weight,
+                                                      record.reps, record.achieved_at)):
+            _save_record(user_id, exercise_id, record, candidate)
+
+
+# PUBLIC_INTERFACE
+def serialize_personal_record(record):
+    """
+    Format a PersonalRecord for JSON responses.
+
+    Args:
+        record (PersonalRecord): The record to format
+
+    Returns:
+        dict: Record weight, reps and when it was achieved
+    """
+    return {
+        "exercise_name": record.exercise.display_name,
+        "weight": record.weight,
+        "reps": record.reps,
+        "achieved_at": record.achieved_at.isoformat(),
+        "formatted_date": record.achieved_at.strftime("%b %d, %Y"),
+        "session_id": record.session_id
+    }
+
+
+# PUBLIC_INTERFACE
+def delete_user_records(user_id):
+    """
+    Remove a user's top-set pointers and personal records. Call before the
+    user's sessions are deleted.
+
+    Args:
+        user_id (int): ID of the user
+    """
+    session_ids = select(WorkoutSession.id).filter(WorkoutSession.user_id == user_id)
+    db.session.query(SessionTopSet).filter(
+        SessionTopSet.session_id.in_(session_ids)
+    ).delete(synchronize_session=False)
+    db.session.query(PersonalRecord).filter_by(user_id=user_id).delete(synchronize_session=False)
+
+
+# PUBLIC_INTERFACE
+def rebuild_records(user_id=None, batch_size=500):
+    """
+    Rebuild top-set pointers and personal records from raw logs.
+
+    Args:
+        user_id (int|None): Restrict to one user, or None for all users
+        batch_size (int): Sessions refreshed per batch
+
+    Returns:
+        int: Number of personal records written
+    """
+    resolve_missing_exercise_ids(user_id)
+
+    query = db.session.query(WorkoutSession.user_id, WorkoutSession.id).order_by(WorkoutSession.id)
+    if user_id is not None:
+        query = query.filter(WorkoutSession.user_id == user_id)
+
+    sessions_by_user = {}
+    for owner_id, session_id in query.all():
+        sessions_by_user.setdefault(owner_id, []).append(session_id)
+
+    for owner_id, session_ids in sessions_by_user.items():
+        delete_user_records(owner_id)
+        for start in range(0, len(session_ids), batch_size):
+            refresh_top_sets(owner_id, session_ids[start:start + batch_size])
+    db.session.commit()
+
+    count = db.session.query(func.count(PersonalRecord.id))
+    if user_id is not None:
+        count = count.filter(PersonalRecord.user_id == user_id)
+    return count.scalar()
+
+
+@records_cli.command("backfill")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user's records.")
+def backfill_command(user_id):
+    """Rebuild session top sets and personal records from raw exercise logs."""
+    written = rebuild_records(user_id)
+    click.echo(f"Wrote {written} personal records.")
@@ -0,0 +1,183 @@
+from . import db
+from .models import WorkoutSession, ExerciseLog, ExerciseDailyRollup
+from .catalog import resolve_missing_exercise_ids
+from flask.cli import AppGroup
+from sqlalchemy import and_, case, func, insert, literal, select
+from datetime import datetime, time, timedelta
+import click
+
+
+rollups_cli = AppGroup("rollups", help="Maintain the per-user daily exercise rollups.")
+
+# Columns written by every rollup refresh, in insert order
+ROLLUP_COLUMNS = [
+    "user_id", "day", "workout_id", "exercise_id",
+    "set_count", "working_set_count", "session_count", "total_reps",
+    "volume", "max_weight", "weight_sum", "weight_count",
+]
+
+
+def _aggregate_select(day_column):
+    """
+    Build the aggregate SELECT over raw logs that produces rollup rows.
+
+    Args:
+        day_column: SQL expression for the rollup day
+
+    Returns:
+        Select: Statement yielding ROLLUP_COLUMNS, still to be filtered and grouped
+    """
+    # Mirrors the `if log.weight and log.reps` rule the endpoints used for volume
+    is_working_set = and_(
+        ExerciseLog.weight.isnot(None), ExerciseLog.weight != 0,
+        ExerciseLog.reps.isnot(None), ExerciseLog.reps != 0,
+    )
+    return (select(
+                WorkoutSession.user_id,
+                day_column,
+                WorkoutSession.workout_id,
+                ExerciseLog.exercise_id,
+                func.count(ExerciseLog.id),
+                func.coalesce(func.sum(case((is_working_set, 1), else_=0)), 0),
+                func.count(func.distinct(ExerciseLog.session_id)),
+                func.coalesce(func.sum(ExerciseLog.reps), 0),
+                func.coalesce(func.sum(case((is_working_set, ExerciseLog.weight * ExerciseLog.reps), else_=0)), 0),
+                func.max(ExerciseLog.weight),
+                func.coalesce(func.sum(ExerciseLog.weight), 0),
+                func.count(ExerciseLog.weight),
+            )
+            .select_from(ExerciseLog)
+            .join(WorkoutSession, WorkoutSession.id == ExerciseLog.session_id))
+
+
+# PUBLIC_INTERFACE
+def refresh_rollups(user_id, keys):
+    """
+    Recompute the rollup rows for the given (day, workout_id) groups of a user.
+    Runs inside the caller's transaction so rollups commit together with the logs.
+
+    Args:
+        user_id (int): ID of the user whose logs changed
+        keys (iterable): (datetime.date, workout_id) pairs touched by the write
+    """
+    for day, workout_id in set(keys):
+        db.session.query(ExerciseDailyRollup).filter_by(
+            user_id=user_id, day=day, workout_id=workout_id
+        ).delete(synchronize_session=False)
+
+        # Range on timestamp rather than date(timestamp) so the
+        # (user_id, workout_id, timestamp) index is used
+        day_start = datetime.combine(day, time.min)
+        stmt = (_aggregate_select(literal(day, type_=db.Date))
+                .filter(ExerciseLog.exercise_id.isnot(None))
+                .filter(WorkoutSession.user_id == user_id)
+                .filter(WorkoutSession.workout_id == workout_id)
+                .filter(WorkoutSession.timestamp >= day_start)
+                .filter(WorkoutSession.timestamp < day_start + timedelta(days=1))
+                .group_by(WorkoutSession.user_id, WorkoutSession.workout_id, ExerciseLog.exercise_id))
+        db.session.execute(insert(ExerciseDailyRollup).from_select(ROLLUP_COLUMNS, stmt))
+
+
+# PUBLIC_INTERFACE
+def delete_user_rollups(user_id):
+    """
+    Remove every rollup row of a user, e.g. when their history is cleared.
+
+    Args:
+        user_id (int): ID of the user
+    """
+    db.session.query(ExerciseDailyRollup).filter_by(user_id=user_id).delete(synchronize_session=False)
+
+
+# PUBLIC_INTERFACE
+def rebuild_rollups(user_id=None):
+    """
+    Rebuild rollups from raw logs. Used for the initial backfill and to repair drift.
+
+    Args:
+        user_id (int|None): Restrict to one user, or None for all users
+
+    Returns:
+        int: Number of rollup rows written
+    """
+    resolve_missing_exercise_ids(user_id)
+
+    delete = db.session.query(ExerciseDailyRollup)
+    stmt = (_aggregate_select(func.date(WorkoutSession.timestamp))
+            .filter(ExerciseLog.exercise_id.isnot(None)))
+    if user_id is not None:
+        delete = delete.filter_by(user_id=user_id)
+        stmt = stmt.filter(WorkoutSession.user_id == user_id)
+    delete.delete(synchronize_session=False)
+
+    stmt = stmt.group_by(WorkoutSession.user_id, func.date(WorkoutSession.timestamp),
+                         WorkoutSession.workout_id, ExerciseLog.exercise_id)
+    db.session.execute(insert(ExerciseDailyRollup).from_select(ROLLUP_COLUMNS, stmt))
+    db.session.commit()
+
+    count = db.session.query(func.count(ExerciseDailyRollup.id))
+    if user_id is not None:
+        count = count.filter(ExerciseDailyRollup.user_id == user_id)
+    return count.scalar()
+
+
+# PUBLIC_INTERFACE
+def check_rollups(user_id=None):
+    """
+    Compare stored rollups against a fresh aggregate of raw logs.
+    Logs that were never resolved to a catalog id show up with exercise_id None.
+
+    Args:
+        user_id (int|None): Restrict to one user, or None for all users
+
+    Returns:
+        list: One dict per mismatching key with the expected and stored rows
+    """
+    stmt = _aggregate_select(func.date(WorkoutSession.timestamp).label("day"))
+    stored = db.session.query(*[getattr(ExerciseDailyRollup, c) for c in ROLLUP_COLUMNS])
+    if user_id is not None:
+        stmt = stmt.filter(WorkoutSession.user_id == user_id)
+        stored = stored.filter(ExerciseDailyRollup.user_id == user_id)
+    stmt = stmt.group_by(WorkoutSession.user_id, func.date(WorkoutSession.timestamp),
+                         WorkoutSession.workout_id, ExerciseLog.exercise_id)
+
+    def by_key(rows):
+        out = {}
+        for row in rows:
+            values = dict(zip(ROLLUP_COLUMNS, row))
+            values["day"] = str(values["day"])
+            out[(values["user_id"], values["day"], values["workout_id"], values["exercise_id"])] = values
+        return out
+
+    expected = by_key(db.session.execute(stmt).all())
+    actual = by_key(stored.all())
+
+    mismatches = []
+    for key in sorted(set(expected) | set(actual), key=str):
+        want, have = expected.get(key), actual.get(key)
+        if want and have and all(
+            abs((want[c] or 0) - (have[c] or 0)) < 1e-6 for c in ROLLUP_COLUMNS[4:]
+        ):
+            continue
+        mismatches.append({"key": key, "expected": want, "stored": have})
+    return mismatches
+
+
+@rollups_cli.command("backfill")
+@click.option("--user-id", type=int, default=None, help="Only rebuild this user's rollups.")
+def backfill_command(user_id):
+    """Rebuild daily rollups from raw exercise logs."""
+    written = rebuild_rollups(user_id)
+    click.echo(f"Wrote {written} rollup rows.")
+
+
+@rollups_cli.command("check")
+@click.option("--user-id", type=int, default=None, help="Only check this user's rollups.")
+def check_command(user_id):
+    """Report rollup rows that disagree with raw exercise logs."""
+    mismatches = check_rollups(user_id)
+    for mismatch in mismatches:
+        click.echo(f"{mismatch['key']}: expected {mismatch['expected']}, stored {mismatch['stored']}")
+    if mismatches:
+        raise click.ClickException(f"{len(mismatches)} rollup rows out of date; run 'flask rollups backfill'.")
+    click.echo("Rollups are consistent.")
@@ -0,0 +1,43 @@
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from functools import wraps
+
+# Bind key of the optional read engine in SQLALCHEMY_BINDS
+READ_BIND = "read"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads from views marked read-only to the "read" bind,
+    e.g. a replica. Everything else, including any flush, uses the primary.
+    Without a "read" bind configured, all statements use the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_app_context()
+                and g.get("db_read_only") and READ_BIND in self._db.engines):
+            return self._db.engines[READ_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+# PUBLIC_INTERFACE
+def read_only(view):
+    """
+    Mark a view as read-only so its queries may run on the read engine.
+    Apply below @login_required; the views must not write.
+
+    Args:
+        view (callable): Flask view function
+
+    Returns:
+        callable: Wrapped view
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        previous = g.get("db_read_only", False)
+        g.db_read_only = True
+        try:
+            return view(*args, **kwargs)
+        finally:
+            g.db_read_only = previous
+    return wrapper
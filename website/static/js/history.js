@@ -920,7 +920,8 @@ class WorkoutHistoryManager {
             this.refreshBtn.classList.add('spinning');
         }
         
-        fetch('/api/workout/history', {
+        // Only session headers are needed since the page reloads afterwards
+        fetch('/api/workout/history?limit=1&fields=session', {
             method: 'GET',
             credentials: 'same-origin',
             headers: {
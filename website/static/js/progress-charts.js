@@ -16,6 +16,14 @@ const CHART_COLORS = {
     dark: '#343A40'
 };
 
+// Upper bound on points requested for the weight progression line; the server
+// downsamples longer series so multi-year charts stay light
+const WEIGHT_PROGRESSION_MAX_POINTS = 200;
+
+// Windows, in days, of the performance summary and exercise frequency charts
+const SUMMARY_DAYS = 30;
+const FREQUENCY_DAYS = 90;
+
 // Chart.js default configuration
 const DEFAULT_CHART_OPTIONS = {
     responsive: true,
@@ -64,89 +72,124 @@ function fetchAndRenderCharts() {
      */
     console.log('Initializing progress charts...');
     
-    // Fetch and render performance summary dashboard
-    fetchPerformanceSummary();
-    
-    // Fetch and render exercise frequency chart
-    fetchExerciseFrequency();
-    
     // Check if specific exercise or workout charts are requested
     const urlParams = new URLSearchParams(window.location.search);
     const exerciseName = urlParams.get('exercise');
     const workoutId = urlParams.get('workout_id');
     
-    if (exerciseName) {
-        fetchWeightProgression(exerciseName);
-    }
-    
-    if (workoutId) {
-        fetchVolumeTrends(workoutId);
-    }
+    // Fetch every chart dataset in one request
+    fetchProgressDashboard(FREQUENCY_DAYS, exerciseName, workoutId);
 }
 
 // PUBLIC_INTERFACE
-function fetchPerformanceSummary(days = 30) {
+function fetchProgressDashboard(days = FREQUENCY_DAYS, exerciseName = null, workoutId = null, sections = null,
+                                summaryDays = SUMMARY_DAYS) {
     /**
-     * Fetch and render performance summary metrics from the backend.
-     * @param {number} days - Number of days to include in the summary (default: 30)
+     * Fetch the summary, frequency and, when requested, weight progression and volume
+     * trend datasets from the consolidated dashboard endpoint and render all charts.
+     * @param {number} days - Number of days of the frequency chart (default: FREQUENCY_DAYS)
+     * @param {string|null} exerciseName - Exercise for the weight progression chart
+     * @param {number|string|null} workoutId - Workout for the volume trends chart
+     * @param {string[]|null} sections - Only load these sections (default: summary,
+     *     frequency, plus weight and volume when their arguments are given)
+     * @param {number} summaryDays - Number of days of the summary (default: SUMMARY_DAYS)
      */
-    const url = `/api/progress/performance-summary?days=${days}`;
+    if (!sections) {
+        sections = ['summary', 'frequency'];
+        if (exerciseName && exerciseName.trim() !== '') {
+            sections.push('weight');
+        }
+        if (workoutId) {
+            sections.push('volume');
+        }
+    }
+    const params = new URLSearchParams({ days: days });
     
-    console.log(`Fetching performance summary for ${days} days from: ${url}`);
+    if (sections.includes('summary')) {
+        params.set('summary_days', summaryDays);
+    }
+    if (sections.includes('weight')) {
+        params.set('exercise', exerciseName.trim());
+        params.set('max_points', WEIGHT_PROGRESSION_MAX_POINTS);
+    }
+    if (sections.includes('volume')) {
+        params.set('workout_id', workoutId);
+    }
+    params.set('sections', sections.join(','));
+    
+    const url = `/api/progress/dashboard?${params.toString()}`;
+    console.log(`Fetching progress dashboard from: ${url}`);
     
     fetch(url, {
         method: 'GET',
         headers: {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
+            'Accept': 'application/json'
         },
         credentials: 'same-origin'
     })
         .then(response => {
-            console.log(`Performance summary API response status: ${response.status}`);
             if (response.status === 401) {
                 throw new Error('Authentication required. Please log in.');
             }
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status} - ${response.statusText}`);
-            }
-            return response.json();
+            return response.json().then(data => {
+                if (!response.ok || data.error) {
+                    throw new Error(data.error || `HTTP error! status: ${response.status}`);
+                }
+                return data;
+            });
         })
         .then(data => {
-            console.log('Received performance summary data:', data);
+            console.log('Received progress dashboard data:', data);
             
-            if (data.error) {
-                throw new Error(data.error);
+            if (data.summary) {
+                renderPerformanceSummaryCharts(data.summary);
             }
-            
-            // Validate required data structure
-            if (typeof data.total_sessions === 'undefined') {
-                throw new Error('Invalid response: missing total_sessions');
+            if (data.frequency) {
+                renderExerciseFrequencyChart(data.frequency);
+            }
+            if (data.weight) {
+                renderWeightProgressionChart(data.weight);
+            }
+            if (data.volume) {
+                renderVolumeTrendsChart(data.volume);
             }
-            
-            renderPerformanceSummaryCharts(data);
         })
         .catch(error => {
-            console.error('Error fetching performance summary:', error);
-            
-            let errorMessage = 'Failed to load performance summary';
+            console.error('Error fetching progress dashboard:', error);
             
+            let errorMessage = 'Failed to load progress charts';
             if (error.message.includes('Authentication required')) {
-                errorMessage = 'Please log in to view performance summary.';
+                errorMessage = 'Please log in to view your progress.';
             } else if (error.message.includes('NetworkError') || error.message.includes('Failed to fetch')) {
                 errorMessage = 'Network error. Please check your connection and try again.';
             } else {
                 errorMessage += `\n\nError details: ${error.message}`;
             }
             
-            showChartError('performance-summary-container', errorMessage);
+            const containers = {
+                summary: 'performance-summary-container',
+                frequency: 'exercise-frequency-chart',
+                weight: 'weight-progression-chart',
+                volume: 'volume-trends-chart'
+            };
+            sections.forEach(section => showChartError(containers[section], errorMessage));
         });
 }
 
+// PUBLIC_INTERFACE
+function fetchPerformanceSummary(days = SUMMARY_DAYS) {
+    /**
+     * Fetch and render performance summary metrics through the dashboard endpoint.
+     * @param {number} days - Number of days to include in the summary (default: SUMMARY_DAYS)
+     */
+    fetchProgressDashboard(days, null, null, ['summary'], days);
+}
+
 // PUBLIC_INTERFACE
 function fetchWeightProgression(exerciseName) {
     /**
-     * Fetch weight progression data for a specific exercise and render line chart.
+     * Fetch weight progression data for a specific exercise through the dashboard
+     * endpoint and render line chart. The weight section covers all time.
      * @param {string} exerciseName - Name of the exercise to track
      */
     if (!exerciseName || exerciseName.trim() === '') {
@@ -155,11 +198,6 @@ function fetchWeightProgression(exerciseName) {
         return;
     }
     
-    console.log(`Fetching weight progression for exercise: "${exerciseName}"`);
-    
-    const url = `/api/progress/weight-progression/${encodeURIComponent(exerciseName.trim())}`;
-    console.log(`API URL: ${url}`);
-    
     // Show loading state
     const canvas = document.getElementById('weight-progression-chart');
     const placeholder = document.getElementById('weight-progression-placeholder');
@@ -172,116 +210,26 @@ function fetchWeightProgression(exerciseName) {
         `;
     }
     
-    fetch(url, {
-        method: 'GET',
-        headers: {
-            'Accept': 'application/json',
-            'Content-Type': 'application/json'
-        },
-        credentials: 'same-origin' // Include cookies for authentication
-    })
-        .then(response => {
-            console.log(`API response status: ${response.status}`);
-            if (response.status === 401) {
-                throw new Error('Authentication required. Please log in.');
-            }
-            if (response.status === 404) { 
-                throw new Error(`Exercise "${exerciseName}" not found or no weight data available.`);
-            }
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status} - ${response.statusText}`);
-            }
-            return response.json();
-        })
-        .then(data => {
-            console.log('Received weight progression data:', data);
-            
-            if (data.error) {
-                throw new Error(data.error);
-            }
-            
-            // Validate data structure
-            if (!data.exercise_name) {
-                throw new Error('Invalid response: missing exercise_name');
-            }
-            
-            if (!Array.isArray(data.data_points)) {
-                throw new Error('Invalid response: data_points should be an array');
-            }
-            
-            renderWeightProgressionChart(data);
-        })
-        .catch(error => {
-            console.error('Error fetching weight progression:', error);
-            
-            let errorMessage = `Failed to load weight progression for "${exerciseName}"`;
-            
-            if (error.message.includes('Authentication required')) {
-                errorMessage = 'Please log in to view weight progression data.';
-            } else if (error.message.includes('not found')) {
-                errorMessage = error.message;
-            } else if (error.message.includes('NetworkError') || error.message.includes('Failed to fetch')) {
-                errorMessage = 'Network error. Please check your connection and try again.';
-            } else {
-                errorMessage += `\n\nError details: ${error.message}`;
-            }
-            
-            showChartError('weight-progression-chart', errorMessage);
-        });
+    fetchProgressDashboard(FREQUENCY_DAYS, exerciseName, null, ['weight']);
 }
 
 // PUBLIC_INTERFACE
 function fetchVolumeTrends(workoutId) {
     /**
-     * Fetch volume trends data for a specific workout and render line chart.
+     * Fetch volume trends data for a specific workout through the dashboard endpoint
+     * and render line chart.
      * @param {number} workoutId - ID of the workout to analyze
      */
-    const url = `/api/progress/volume-trends/${workoutId}`;
-    
-    fetch(url)
-        .then(response => {
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return response.json();
-        })
-        .then(data => {
-            if (data.error) {
-                throw new Error(data.error);
-            }
-            renderVolumeTrendsChart(data);
-        })
-        .catch(error => {
-            console.error('Error fetching volume trends:', error);
-            showChartError('volume-trends-chart', `Failed to load volume trends for workout ${workoutId}`);
-        });
+    fetchProgressDashboard(FREQUENCY_DAYS, null, workoutId, ['volume']);
 }
 
 // PUBLIC_INTERFACE
-function fetchExerciseFrequency(days = 90) {
+function fetchExerciseFrequency(days = FREQUENCY_DAYS) {
     /**
-     * Fetch exercise frequency data and render pie/bar chart.
-     * @param {number} days - Number of days to include in the analysis (default: 90)
+     * Fetch exercise frequency data through the dashboard endpoint and render pie/bar chart.
+     * @param {number} days - Number of days to include in the analysis (default: FREQUENCY_DAYS)
      */
-    const url = `/api/progress/exercise-frequency?days=${days}`;
-    
-    fetch(url)
-        .then(response => {
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-            return response.json();
-        })
-        .then(data => {
-            if (data.error) {
-                throw new Error(data.error);
-            }
-            renderExerciseFrequencyChart(data);
-        })
-        .catch(error => {
-            console.error('Error fetching exercise frequency:', error);
-            showChartError('exercise-frequency-chart', 'Failed to load exercise frequency data');
-        });
+    fetchProgressDashboard(days, null, null, ['frequency']);
 }
 
 // PUBLIC_INTERFACE
@@ -210,22 +210,26 @@ function saveCompleteExerciseWithProgressUpdate(exerciseId, workoutId, exerciseD
     // Get exercise index to check if this is the last one
     const exerciseIndex = parseInt(exerciseCard.dataset.exerciseIndex);
     
-    // Save all exercise fields
+    const body = JSON.stringify({
+        workout_id: workoutId,
+        exercise_id: exerciseId,
+        exercise_data: exerciseData,
+        action: 'save_complete_exercise'
+    });
+    
+    // Save all exercise fields; the key makes a resend after a network error safe
     fetch('/workout', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json',
-            'X-Requested-With': 'XMLHttpRequest'
+            'X-Requested-With': 'XMLHttpRequest',
+            'Idempotency-Key': exerciseSaveKey(exerciseCard, body)
         },
-        body: JSON.stringify({
-            workout_id: workoutId,
-            exercise_id: exerciseId,
-            exercise_data: exerciseData,
-            action: 'save_complete_exercise'
-        })
+        body: body
     })
     .then(response => response.json())
     .then(data => {
+        clearExerciseSaveKey(exerciseCard);
         if (data.success) {
             showExerciseSaveStatus(exerciseCard, 'success');
             
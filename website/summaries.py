@@ -0,0 +1,95 @@
+from . import db
+from .models import User, SummarySnapshot
+from .dashboard import load_dashboard_data, summary_section, window_start_day
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime
+import json
+
+PERFORMANCE_SUMMARY = "performance-summary"
+
+# Windows of the performance summary kept precomputed; other windows are computed on request
+SUMMARY_SNAPSHOT_WINDOWS = (7, 30, 90, 365)
+
+
+# PUBLIC_INTERFACE
+def compute_performance_summary(user_id, days):
+    """
+    Aggregate session, set and volume totals of a user over the last days,
+    from the daily rollups and per-workout session counts of the window.
+
+    Args:
+        user_id (int): ID of the user
+        days (int): Length of the window ending now
+
+    Returns:
+        dict: Performance summary as served by /api/progress/performance-summary
+    """
+    return summary_section(load_dashboard_data(user_id, window_start_day(days)), days)
+
+
+def _params_key(days):
+    return f"days={days}"
+
+
+# PUBLIC_INTERFACE
+def load_snapshot(user_id, name, days):
+    """
+    Return a stored summary if it is still current: computed today (UTC) from
+    the user's current data version.
+
+    Args:
+        user_id (int): ID of the user
+        name (str): Summary name, e.g. PERFORMANCE_SUMMARY
+        days (int): Window the summary covers
+
+    Returns:
+        dict|None: Stored summary, or None on a miss
+    """
+    payload = (db.session.query(SummarySnapshot.payload)
+               .join(User, User.id == SummarySnapshot.user_id)
+               .filter(SummarySnapshot.user_id == user_id)
+               .filter(SummarySnapshot.name == name)
+               .filter(SummarySnapshot.params == _params_key(days))
+               .filter(SummarySnapshot.data_version == User.data_version)
+               .filter(SummarySnapshot.computed_on == datetime.utcnow().date())
+               .scalar())
+    return json.loads(payload) if payload is not None else None
+
+
+def _store_snapshot(user_id, name, days, data_version, payload):
+    values = {"data_version": data_version, "computed_on": datetime.utcnow().date(),
+              "payload": json.dumps(payload)}
+    updated = (db.session.query(SummarySnapshot)
+               .filter_by(user_id=user_id, name=name, params=_params_key(days))
+               .update(values, synchronize_session=False))
+    if not updated:
+        try:
+            # Savepoint so a concurrent worker storing the same snapshot does not
+            # abort the whole recompute
+            with db.session.begin_nested():
+                db.session.add(SummarySnapshot(user_id=user_id, name=name, params=_params_key(days), **values))
+        except IntegrityError:
+            (db.session.query(SummarySnapshot)
+             .filter_by(user_id=user_id, name=name, params=_params_key(days))
+             .update(values, synchronize_session=False))
+
+
+# PUBLIC_INTERFACE
+def recompute_summaries(user_id):
+    """
+    Recompute and store every precomputed summary of a user. The snapshots are
+    tagged with the data version read before computing, so a write that lands
+    meanwhile leaves them stale rather than wrong.
+
+    Args:
+        user_id (int): ID of the user
+    """
+    data_version = db.session.query(User.data_version).filter(User.id == user_id).scalar()
+    if data_version is None:
+        return
+    # One load for the longest window; the shorter ones are taken from it
+    data = load_dashboard_data(user_id, window_start_day(max(SUMMARY_SNAPSHOT_WINDOWS)))
+    for days in SUMMARY_SNAPSHOT_WINDOWS:
+        _store_snapshot(user_id, PERFORMANCE_SUMMARY, days, data_version,
+                        summary_section(data.since(window_start_day(days)), days))
+    db.session.commit()
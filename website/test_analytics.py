@@ -0,0 +1,113 @@
+import json
+import pytest
+from datetime import date, datetime, timedelta
+from website import db
+from website.models import Workout, Exercise, WorkoutSession, ExerciseLog
+from website import analytics
+from website.catalog import resolve_exercise_ids
+from website.records import rebuild_records
+
+
+def test_percentiles_interpolate_and_ignore_missing():
+    assert analytics.percentiles([1.0, None, 3.0], qs=(50,)) == {"p50": 2.0}
+    assert analytics.percentiles([40, 10, 30, 20], qs=(0, 25, 100)) == {"p0": 10.0, "p25": 17.5, "p100": 40.0}
+    assert analytics.percentiles([None], qs=(50, 90)) == {"p50": None, "p90": None}
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(Workout(user_id=1, name="Push Day B", description="Chest"))
+        db.session.commit()
+        db.session.add(Exercise(name="BENCH PRESS", include_details=True, workout_id=2, details=""))
+        db.session.commit()
+    yield app
+
+
+def test_weight_progression_merges_sessions_per_day(client):
+    for workout_id, weight in ((1, 100), (2, 90)):
+        resp = client.post("/api/workout/history", data=json.dumps({
+            "workout_id": workout_id,
+            "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": weight}],
+        }), content_type="application/json")
+        assert resp.status_code == 201
+
+    data = client.get("/api/progress/weight-progression/BENCH%20PRESS").get_json()
+    assert len(data["data_points"]) == 1
+    assert data["data_points"][0]["weight"] == 100.0
+    assert data["data_points"][0]["session_count"] == 2
+    assert data["total_logs"] == 2
+    assert data["weight_percentiles"]["p50"] == 100.0
+
+
+def test_debug_metrics_total_sets_and_volume_per_session(client):
+    for workout_id, exercises in (
+        (1, [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": 100},
+             {"exercise_name": "BENCH PRESS", "reps": 3, "weight": 110},
+             {"exercise_name": "BENCH PRESS", "reps": 10}]),
+        (2, [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": 0}]),
+    ):
+        resp = client.post("/api/workout/history", data=json.dumps({"workout_id": workout_id, "exercises": exercises}),
+                           content_type="application/json")
+        assert resp.status_code == 201
+
+    sessions = client.get("/api/debug/performance-metrics").get_json()["raw_data"]["session_analysis"]
+    assert sorted((s["id"], s["exercise_count"], s["total_volume"]) for s in sessions) == [
+        (1, 3, 830.0), (2, 1, 0.0)]
+
+
+def _daily(values, start=date(2026, 1, 1)):
+    return [{"day": start + timedelta(days=n), "weight": float(w),
+             "timestamp": datetime.combine(start + timedelta(days=n), datetime.min.time()),
+             "session_count": 1} for n, w in enumerate(values)]
+
+
+def test_bucket_max_by_week_and_month():
+    points = _daily([100, 120, 90, 95, 101, 80, 70, 130, 60], start=date(2026, 1, 28))  # a Wednesday
+    weeks = analytics.bucket_max(points, "week")
+    assert [(p["day"].isoformat(), p["weight"], p["session_count"]) for p in weeks] == [
+        ("2026-01-26", 120.0, 5), ("2026-02-02", 130.0, 4)]
+    months = analytics.bucket_max(points, "month")
+    assert [(p["day"].isoformat(), p["weight"]) for p in months] == [("2026-01-01", 120.0), ("2026-02-01", 130.0)]
+    assert analytics.bucket_max(points, "day") == points
+
+
+def test_lttb_keeps_ends_and_peaks():
+    values = [100 + (n % 7) for n in range(1000)]
+    values[500] = 400
+    points = _daily(values)
+    sampled = analytics.lttb(points, 50)
+    assert len(sampled) == 50
+    assert sampled[0] is points[0] and sampled[-1] is points[-1]
+    assert any(p["weight"] == 400 for p in sampled)
+    assert [p["day"] for p in sampled] == sorted(p["day"] for p in sampled)
+    assert analytics.lttb(points[:10], 50) == points[:10]
+
+
+def test_weight_progression_downsamples(client):
+    with client.application.app_context():
+        exercise_id = resolve_exercise_ids(1, ["BENCH PRESS"])["BENCH PRESS"]
+        start = datetime(2023, 1, 2, 9)
+        for n in range(400):
+            session = WorkoutSession(user_id=1, workout_id=1, timestamp=start + timedelta(days=n))
+            db.session.add(session)
+            db.session.flush()
+            db.session.add(ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                                       exercise_id=exercise_id, reps=5, weight=100 + n % 30))
+        db.session.commit()
+        rebuild_records()
+
+    full = client.get("/api/progress/weight-progression/BENCH%20PRESS").get_json()
+    assert len(full["data_points"]) == full["original_points"] == 400
+
+    thinned = client.get("/api/progress/weight-progression/BENCH%20PRESS?max_points=60").get_json()
+    assert len(thinned["data_points"]) == 60
+    assert thinned["weight_range"] == full["weight_range"]
+
+    weekly = client.get("/api/progress/weight-progression/BENCH%20PRESS?bucket=week").get_json()
+    assert len(weekly["data_points"]) == 58
+    assert weekly["data_points"][0]["date"] == "2023-01-02"
+    assert weekly["data_points"][0]["session_count"] == 7
+
+    assert client.get("/api/progress/weight-progression/BENCH%20PRESS?bucket=year").status_code == 400
+    assert client.get("/api/progress/weight-progression/BENCH%20PRESS?max_points=2").status_code == 400
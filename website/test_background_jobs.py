@@ -0,0 +1,124 @@
+import json
+import time
+import pytest
+from datetime import datetime, timedelta
+from website import db
+from website import jobs
+from website.models import BackgroundJob, SummarySnapshot
+from website.jobs import (RECOMPUTE_SUMMARIES, enqueue_job, run_next_job, requeue_stale_jobs,
+                          start_worker_thread, _claim_next_job)
+from website.summaries import PERFORMANCE_SUMMARY, SUMMARY_SNAPSHOT_WINDOWS, load_snapshot
+
+
+@pytest.fixture
+def file_app(make_app, seed_user, tmp_path):
+    # A file database: the worker thread needs its own connection
+    app = make_app(f"sqlite:///{tmp_path / 'app.db'}")
+    seed_user(app)
+    yield app
+
+
+def _log(client, weight=100):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": weight}],
+    }), content_type="application/json")
+    assert resp.status_code == 201
+
+
+def _jobs(app):
+    with app.app_context():
+        return [(job.kind, job.user_id, job.status) for job in BackgroundJob.query.all()]
+
+
+def test_logging_a_workout_queues_one_recompute(app, client):
+    _log(client)
+    with app.app_context():
+        enqueue_job(RECOMPUTE_SUMMARIES, 1)  # Coalesced with the waiting job
+        db.session.commit()
+    assert _jobs(app) == [(RECOMPUTE_SUMMARIES, 1, "queued")]
+
+
+def test_summary_served_from_snapshot_until_next_write(app, client):
+    _log(client)
+    with app.app_context():
+        assert run_next_job()
+        assert not run_next_job()
+        assert BackgroundJob.query.count() == 0
+        assert SummarySnapshot.query.count() == len(SUMMARY_SNAPSHOT_WINDOWS)
+
+    resp = client.get("/api/progress/performance-summary?days=90")
+    assert resp.headers["X-Summary-Source"] == "snapshot"
+    assert resp.get_json()["total_volume"] == 500.0
+    # A cached response keeps the header of the response it was stored from
+    resp = client.get("/api/progress/performance-summary?days=90")
+    assert (resp.headers["X-Cache"], resp.headers["X-Summary-Source"]) == ("HIT", "snapshot")
+
+    # Windows that are not precomputed are computed on request
+    assert client.get("/api/progress/performance-summary?days=45").headers["X-Summary-Source"] == "computed"
+
+    with app.app_context():
+        from website.cache import bump_data_version
+        bump_data_version(1)
+        db.session.commit()
+        assert load_snapshot(1, PERFORMANCE_SUMMARY, 90) is None
+    resp = client.get("/api/progress/performance-summary?days=90")
+    assert resp.headers["X-Summary-Source"] == "computed"
+    assert resp.get_json()["total_volume"] == 500.0
+
+
+def test_snapshot_from_yesterday_is_a_miss(app, client):
+    _log(client)
+    with app.app_context():
+        run_next_job()
+        SummarySnapshot.query.update({SummarySnapshot.computed_on: datetime.utcnow().date() - timedelta(days=1)})
+        db.session.commit()
+        assert load_snapshot(1, PERFORMANCE_SUMMARY, 30) is None
+
+
+def test_failing_job_is_retried_then_kept(app, monkeypatch):
+    calls = []
+
+    def broken(user_id):
+        calls.append(user_id)
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, "broken", broken)
+    monkeypatch.setattr(jobs, "JOB_RETRY_DELAY", timedelta(0))
+    with app.app_context():
+        enqueue_job("broken", 1)
+        db.session.commit()
+        while run_next_job():
+            pass
+        job = BackgroundJob.query.one()
+        assert (job.status, job.attempts) == ("failed", jobs.JOB_MAX_ATTEMPTS)
+        assert "boom" in job.error
+    assert calls == [1] * jobs.JOB_MAX_ATTEMPTS
+
+
+def test_job_is_claimed_once(app):
+    with app.app_context():
+        enqueue_job(RECOMPUTE_SUMMARIES, 1)
+        db.session.commit()
+        first = _claim_next_job()
+        assert first is not None and first.status == "running"
+        assert _claim_next_job() is None
+
+        BackgroundJob.query.update({BackgroundJob.started_at: datetime.utcnow() - timedelta(hours=1)})
+        db.session.commit()
+        assert requeue_stale_jobs() == 1
+        assert _claim_next_job().id == first.id
+
+
+def test_worker_thread_drains_queue(file_app, make_client):
+    _log(make_client(file_app))
+    stop = start_worker_thread(file_app, poll_interval=0.05)
+    try:
+        deadline = time.time() + 5
+        while _jobs(file_app) and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        stop.set()
+    assert _jobs(file_app) == []
+    with file_app.app_context():
+        assert load_snapshot(1, PERFORMANCE_SUMMARY, 30)["total_sessions"] == 1
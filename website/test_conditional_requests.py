@@ -0,0 +1,104 @@
+import json
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, Exercise
+
+
+@pytest.fixture
+def app(app):
+    # A second user with the same workout and exercise
+    with app.app_context():
+        user = User(email="user2@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Push Day", description="Chest")
+        db.session.add(workout)
+        db.session.commit()
+        db.session.add(Exercise(name="BENCH PRESS", include_details=True, workout_id=workout.id, details=""))
+        db.session.commit()
+    yield app
+
+
+def _log(client, weight):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": weight}],
+    }), content_type="application/json")
+    assert resp.status_code == 201
+
+
+def test_history_revalidates_until_next_write(app, make_client):
+    client = make_client(app, 1)
+    _log(client, 100)
+    first = client.get("/api/workout/history")
+    assert first.status_code == 200
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    assert first.last_modified is not None
+    etag = first.headers["ETag"]
+
+    again = client.get("/api/workout/history", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["ETag"] == etag
+
+    weak = client.get("/api/workout/history", headers={"If-None-Match": f"W/{etag}"})
+    assert weak.status_code == 304
+
+    other_page = client.get("/api/workout/history?limit=5", headers={"If-None-Match": etag})
+    assert other_page.status_code == 200
+
+    client.delete("/api/workout/history/clear")
+    changed = client.get("/api/workout/history", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_history_if_modified_since(app, make_client):
+    client = make_client(app, 1)
+    _log(client, 100)
+    last_modified = client.get("/api/workout/history").headers["Last-Modified"]
+    resp = client.get("/api/workout/history", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 304
+    resp = client.get("/api/workout/history", headers={"If-Modified-Since": "Thu, 01 Jan 2015 00:00:00 GMT"})
+    assert resp.status_code == 200
+
+
+def test_progress_not_modified_skips_view(app, make_client):
+    client = make_client(app, 1)
+    _log(client, 100)
+    first = client.get("/api/progress/personal-records")
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/progress/personal-records", headers={"If-None-Match": etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert resp.status_code == 304
+    assert "X-Cache" not in resp.headers
+    # Loading the logged-in user and reading the data version, nothing else
+    assert len(statements) == 2
+    assert all("user" in statement for statement in statements)
+
+    # Progress windows move with the date, so If-Modified-Since alone is not trusted
+    resp = client.get("/api/progress/personal-records", headers={"If-Modified-Since": last_modified})
+    assert resp.status_code == 200
+
+
+def test_etags_are_per_user(app, make_client):
+    etag = make_client(app, 1).get("/api/workout/history").headers["ETag"]
+    resp = make_client(app, 2).get("/api/workout/history", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+def test_errors_carry_no_validators(app, make_client):
+    resp = make_client(app, 1).get("/api/workout/history?cursor=bogus")
+    assert resp.status_code == 400
+    assert "ETag" not in resp.headers
@@ -0,0 +1,146 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.catalog import resolve_exercise_ids
+from website.rollups import rebuild_rollups
+from website.records import rebuild_records
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="dashboard@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        for name in ("Push Day", "Pull Day"):
+            db.session.add(Workout(user_id=user.id, name=name, description=""))
+        db.session.commit()
+
+        ids = resolve_exercise_ids(user.id, ["BENCH PRESS", "ROW", "CURL"])
+        now = datetime.utcnow().replace(hour=9, minute=0, second=0, microsecond=0)
+        for n in range(60):
+            workout_id = 1 if n % 2 == 0 else 2
+            session = WorkoutSession(user_id=user.id, workout_id=workout_id,
+                                     timestamp=now - timedelta(days=n, hours=n % 3))
+            db.session.add(session)
+            db.session.flush()
+            names = ["BENCH PRESS", "CURL"] if workout_id == 1 else ["ROW", "CURL"]
+            for name in names:
+                for set_number in range(1, 4):
+                    db.session.add(ExerciseLog(session_id=session.id, exercise_name=name,
+                                               exercise_id=ids[name], set_number=set_number,
+                                               reps=8 - set_number, weight=(60 + n % 7 * 5) if n % 5 else 0))
+        db.session.commit()
+        rebuild_rollups()
+        rebuild_records()
+    yield app
+
+
+def test_sections_match_standalone_endpoints(client):
+    data = client.get("/api/progress/dashboard?days=30&sections=summary,frequency").get_json()
+    assert data["sections"] == ["summary", "frequency"]
+    assert "volume" not in data and "weight" not in data
+
+    summary = client.get("/api/progress/performance-summary?days=30").get_json()
+    assert data["summary"] == summary
+    # One session a day, today included, alternating Push and Pull Day
+    assert (summary["total_sessions"], summary["total_exercises"]) == (31, 186)
+    assert summary["top_workouts"] == [{"name": "Push Day", "frequency": 16}, {"name": "Pull Day", "frequency": 15}]
+
+    frequency = client.get("/api/progress/exercise-frequency?days=30").get_json()
+    assert data["frequency"] == frequency
+    assert [(entry["exercise_name"], entry["frequency"], entry["sessions"]) for entry in frequency["exercises"]] == [
+        ("CURL", 93, 31), ("BENCH PRESS", 48, 16), ("ROW", 45, 15)]
+
+
+def test_summary_has_its_own_window(client):
+    data = client.get("/api/progress/dashboard?days=90&summary_days=30").get_json()
+    assert data["summary"] == client.get("/api/progress/performance-summary?days=30").get_json()
+    assert data["frequency"] == client.get("/api/progress/exercise-frequency?days=90").get_json()
+    assert (data["summary"]["total_sessions"], data["period_days"]) == (31, 90)
+
+
+def test_volume_and_weight_sections(client):
+    data = client.get("/api/progress/dashboard?days=365&workout_id=1&exercise=bench%20press").get_json()
+    assert data["sections"] == ["summary", "frequency", "volume", "weight"]
+
+    volume = client.get("/api/progress/volume-trends/1").get_json()
+    assert data["volume"] == volume
+    assert volume["total_sessions"] == 30
+
+    weight = client.get("/api/progress/weight-progression/bench%20press").get_json()
+    assert data["weight"] == weight
+
+
+def test_item_sections_match_endpoints_beyond_the_window(client):
+    # Volume and weight cover all time, and weight falls back to the closest catalog
+    # name, as their own endpoints do
+    data = client.get("/api/progress/dashboard?days=7&workout_id=1&exercise=BENCH%20PRES").get_json()
+    assert data["volume"] == client.get("/api/progress/volume-trends/1").get_json()
+    weight = client.get("/api/progress/weight-progression/BENCH%20PRES").get_json()
+    assert data["weight"] == weight
+    assert weight["matched_exercise"] == "BENCH PRESS"
+    assert weight["total_sessions"] > 4
+
+
+def test_one_load_for_all_sections(app, client):
+    client.get("/api/progress/dashboard")  # Warm up the app before counting
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/progress/dashboard?days=90&workout_id=2&exercise=ROW&max_points=10")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert resp.status_code == 200
+    assert len(resp.get_json()["weight"]["data_points"]) == 10
+    # Current user, data version, workout ownership, shared load (2), the volume
+    # section's session count and daily volume, then the weight section's exercise
+    # lookup, daily top sets and personal record
+    assert len(statements) == 10
+    assert sum("exercise_daily_rollup" in statement for statement in statements) == 2
+
+
+def test_item_sections_skip_the_window_load(app, client):
+    client.get("/api/progress/dashboard")  # Warm up the app before counting
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/progress/dashboard?sections=volume&workout_id=2")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert resp.get_json()["sections"] == ["volume"]
+    # Only the volume section's daily volume reads the rollups
+    assert sum("exercise_daily_rollup" in statement for statement in statements) == 1
+
+
+@pytest.mark.parametrize("query,status", [
+    ("sections=summary,calendar", 400),
+    ("sections=volume", 400),
+    ("sections=weight", 400),
+    ("days=0", 400),
+    ("summary_days=0", 400),
+    ("exercise=ROW&max_points=2", 400),
+    ("exercise=ROW&bucket=year", 400),
+    ("workout_id=99", 404),
+])
+def test_invalid_requests(client, query, status):
+    resp = client.get(f"/api/progress/dashboard?{query}")
+    assert resp.status_code == status
+    assert "error" in resp.get_json()
+
+
+def test_unknown_exercise_has_empty_weight_section(client):
+    data = client.get("/api/progress/dashboard?sections=weight&exercise=SQUAT").get_json()
+    assert data["sections"] == ["weight"]
+    assert data["weight"]["data_points"] == []
@@ -0,0 +1,85 @@
+import random
+import pytest
+from collections import namedtuple
+from datetime import datetime, timedelta
+from website import db
+from website.models import WorkoutSession
+from website.dedup import find_duplicate_sessions
+
+Session = namedtuple("Session", ["id", "workout_id", "timestamp"])
+THRESHOLD = timedelta(minutes=5)
+
+
+def summary_reference(all_sessions):
+    """The pairwise filter performance_summary_fix.py used before."""
+    unique_sessions = []
+    for session in all_sessions:
+        is_duplicate = False
+        for existing_session in unique_sessions:
+            if (session.workout_id == existing_session.workout_id and
+                    abs((session.timestamp - existing_session.timestamp).total_seconds()) < THRESHOLD.total_seconds()):
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            unique_sessions.append(session)
+    return unique_sessions
+
+
+def debug_reference(all_sessions):
+    """The pairwise scan debug_performance_metrics used before."""
+    matches = {}
+    for i, session in enumerate(all_sessions):
+        for other_session in all_sessions[:i]:
+            if (session.workout_id == other_session.workout_id and
+                    abs((session.timestamp - other_session.timestamp).total_seconds()) < THRESHOLD.total_seconds()):
+                matches[session.id] = (other_session, abs((session.timestamp - other_session.timestamp).total_seconds()))
+                break
+    return matches
+
+
+def _random_sessions(seed, count):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    sessions = [Session(n, rng.choice([1, 2, 3, None]), start + timedelta(seconds=rng.randrange(0, 3 * 3600, 30)))
+                for n in range(count)]
+    # Newest first, as the endpoints load them; ties keep their id order
+    return sorted(sessions, key=lambda s: s.timestamp, reverse=True)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_pairwise_reference(seed):
+    sessions = _random_sessions(seed, 200)
+    result = find_duplicate_sessions(sessions)
+    assert result.kept == summary_reference(sessions)
+    assert result.matches == debug_reference(sessions)
+
+
+def test_chain_of_close_sessions():
+    start = datetime(2026, 1, 1, 12)
+    a, b, c = (Session(n, 1, start - timedelta(minutes=4 * n)) for n in range(3))
+    result = find_duplicate_sessions([a, b, c])
+    # c is 8 minutes from the kept session a, but only 4 from b
+    assert result.kept == [a, c]
+    assert result.matches == {b.id: (a, 240.0), c.id: (b, 240.0)}
+
+
+def test_exactly_at_threshold_is_not_duplicate():
+    start = datetime(2026, 1, 1, 12)
+    sessions = [Session(1, 1, start), Session(2, 1, start - THRESHOLD)]
+    result = find_duplicate_sessions(sessions)
+    assert result.kept == sessions
+    assert result.matches == {}
+
+
+def test_debug_endpoint_reports_pairs(app, client):
+    with app.app_context():
+        now = datetime.utcnow()
+        for minutes_ago in (0, 2, 30):
+            db.session.add(WorkoutSession(user_id=1, workout_id=1,
+                                          timestamp=now - timedelta(minutes=minutes_ago)))
+        db.session.commit()
+    data = client.get("/api/debug/performance-metrics?days=1").get_json()
+
+    assert data["raw_data"]["potential_duplicates"] == 1
+    assert data["raw_data"]["duplicate_pairs"] == [
+        {"session1_id": 1, "session2_id": 2, "time_diff_seconds": 120.0, "same_workout": True}]
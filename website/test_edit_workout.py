@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, Exercise, Category
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="edit@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Push Day", description="Chest", category_id=1)
+        db.session.add(workout)
+        db.session.commit()
+        for n in range(20):
+            db.session.add(Exercise(name=f"EXERCISE {n}", include_details=n % 2 == 0, workout_id=workout.id,
+                                    weight=50 + n, sets=3, reps="8-12", details="seat 4" if n == 0 else ""))
+        db.session.commit()
+    yield app
+
+
+def _form(app):
+    """The edit form as the page renders it."""
+    with app.app_context():
+        exercises = db.session.get(Workout, 1).exercises
+        return {
+            "request_type": "save", "workout": "1", "workout_name": "Push Day",
+            "workout_description": "Chest", "category_id": "1",
+            "exercise_id": [str(e.id) for e in exercises],
+            "exercise_name": [e.name for e in exercises],
+            "include_details": [str(i) for i, e in enumerate(exercises) if e.include_details],
+            "weight": [str(e.weight) if e.weight else "None" for e in exercises],
+            "details": [e.details or "" for e in exercises],
+        }
+
+
+def _save(client, app, form):
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.post("/edit-workout", data=form)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert resp.status_code == 302
+    return [s for s in statements if s.split()[0] in ("INSERT", "UPDATE", "DELETE")]
+
+
+def _exercises(app):
+    with app.app_context():
+        return [(e.id, e.name, e.weight, e.include_details, e.sets, e.reps, e.details)
+                for e in Exercise.query.order_by(Exercise.id).all()]
+
+
+def test_one_changed_weight_updates_one_row(app, client):
+    form = _form(app)
+    form["weight"][7] = "99.5"
+    writes = _save(client, app, form)
+    # The exercise row, plus the user's data version for the progress caches
+    assert [s.split()[:2] for s in writes] == [["UPDATE", "exercise"], ["UPDATE", "user"]]
+    assert "weight=?" in writes[0].replace(" ", "") and "name" not in writes[0].split("SET")[1]
+    assert _exercises(app)[7][2] == 99.5
+
+
+def test_unchanged_form_writes_nothing(app, client):
+    before = _exercises(app)
+    assert _save(client, app, _form(app)) == []
+    assert _exercises(app) == before
+
+
+def test_added_and_removed_rows_keep_other_ids_and_fields(app, client):
+    before = _exercises(app)
+    form = _form(app)
+    for field in ("exercise_id", "exercise_name", "weight", "details"):
+        del form[field][3]
+    form["include_details"] = [str(i) for i in range(19) if before[i if i < 3 else i + 1][3]]
+    form["exercise_id"].append("")
+    form["exercise_name"].append("dips")
+    form["weight"].append("None")
+    form["details"].append("")
+    _save(client, app, form)
+
+    after = _exercises(app)
+    assert [row[0] for row in after] == [row[0] for row in before if row[0] != before[3][0]] + [21]
+    # Sets and reps are not in the form and survive the edit
+    assert after[:3] == before[:3]
+    assert after[-1][1:3] == ("DIPS", None)
+
+
+def test_ids_of_other_workouts_are_treated_as_new_rows(app, client):
+    with app.app_context():
+        other = Workout(user_id=1, name="Legs", description="")
+        db.session.add(other)
+        db.session.commit()
+        db.session.add(Exercise(name="SQUAT", include_details=False, workout_id=other.id))
+        db.session.commit()
+        squat_id = Exercise.query.filter_by(name="SQUAT").one().id
+    form = _form(app)
+    form["exercise_id"][0] = str(squat_id)
+    _save(client, app, form)
+    with app.app_context():
+        assert db.session.get(Exercise, squat_id).workout_id != 1
+        assert Exercise.query.filter_by(workout_id=1).count() == 20
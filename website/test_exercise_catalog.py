@@ -0,0 +1,66 @@
+import json
+from website import db
+from website.models import User, ExerciseCatalog, ExerciseLog
+from website.catalog import normalize_exercise_name, resolve_exercise_ids
+
+
+def _log_session(client, *names):
+    return client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": name, "reps": 5, "weight": 100 + i}
+                      for i, name in enumerate(names)],
+    }), content_type="application/json")
+
+
+def test_normalize_exercise_name():
+    assert normalize_exercise_name("  Bench   Press ") == "bench press"
+    assert normalize_exercise_name("BENCH PRESS") == "bench press"
+    assert normalize_exercise_name(None) == ""
+
+
+def test_resolve_creates_one_entry_per_key(app):
+    with app.app_context():
+        ids = resolve_exercise_ids(1, ["Squat", " squat", "SQUAT", "Deadlift"])
+        db.session.commit()
+        assert ids["Squat"] == ids[" squat"] == ids["SQUAT"]
+        assert ids["Deadlift"] != ids["Squat"]
+        assert ExerciseCatalog.query.count() == 2
+        assert resolve_exercise_ids(1, ["squat"])["squat"] == ids["Squat"]
+
+
+def test_catalog_is_per_user(app):
+    with app.app_context():
+        other = User(email="other@example.com", password="testpass")
+        db.session.add(other)
+        db.session.commit()
+        mine = resolve_exercise_ids(1, ["Squat"])["Squat"]
+        theirs = resolve_exercise_ids(other.id, ["Squat"])["Squat"]
+        assert mine != theirs
+
+
+def test_session_logs_reference_catalog(app, client):
+    resp = _log_session(client, "Bench Press", "bench press ")
+    assert resp.status_code == 201
+    with app.app_context():
+        logs = ExerciseLog.query.all()
+        assert len(logs) == 2
+        assert logs[0].exercise_id is not None
+        assert logs[0].exercise_id == logs[1].exercise_id
+        assert logs[0].exercise.name_key == "bench press"
+
+
+def test_weight_progression_matches_normalized_name(client):
+    _log_session(client, "Bench Press")
+    resp = client.get("/api/progress/weight-progression/%20bench%20PRESS%20")
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert len(data["data_points"]) == 1
+    assert data["data_points"][0]["weight"] == 100.0
+
+
+def test_weight_progression_unknown_lists_catalog(client):
+    _log_session(client, "Bench Press", "Squat")
+    resp = client.get("/api/progress/weight-progression/Curl")
+    data = resp.get_json()
+    assert data["data_points"] == []
+    assert data["available_exercises"] == ["Bench Press", "Squat"]
@@ -0,0 +1,103 @@
+import json
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, Exercise, ExerciseNameGram
+from website.catalog import name_trigrams, resolve_exercise_ids, search_exercises, rebuild_search_index
+
+NAMES = ["BENCH PRESS", "INCLINE BENCH PRESS", "BARBELL ROW", "BICEP CURL", "SQUAT"]
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        for email in ("search1@example.com", "search2@example.com"):
+            user = User(email=email, password="testpass")
+            db.session.add(user)
+            db.session.commit()
+            workout = Workout(user_id=user.id, name="Full Body", description="")
+            db.session.add(workout)
+            db.session.commit()
+            for name in NAMES:
+                db.session.add(Exercise(name=name, include_details=True, workout_id=workout.id, details=""))
+        db.session.commit()
+        resolve_exercise_ids(2, ["DEADLIFT"])
+        db.session.commit()
+    yield app
+
+
+@pytest.fixture
+def client(app, make_client):
+    client = make_client(app)
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": name, "reps": 5, "weight": 50 + n} for n, name in enumerate(NAMES)]
+                     + [{"exercise_name": "BENCH PRESS", "reps": 3, "weight": 80}],
+    }), content_type="application/json")
+    assert resp.status_code == 201
+    return client
+
+
+def test_trigrams_pad_word_starts():
+    assert name_trigrams("row") == {"  r", " ro", "row", "ow "}
+    assert name_trigrams("leg  press") == name_trigrams("leg press")
+
+
+def test_prefix_then_fuzzy(app, client):
+    with app.app_context():
+        results = search_exercises(1, "b")
+        assert [r["name"] for r in results] == ["BARBELL ROW", "BENCH PRESS", "BICEP CURL"]
+        assert {r["match"] for r in results} == {"prefix"}
+
+        results = search_exercises(1, "bench pres")
+        assert [(r["name"], r["match"]) for r in results] == [
+            ("BENCH PRESS", "prefix"), ("INCLINE BENCH PRESS", "fuzzy")]
+
+        typo = search_exercises(1, "bicpe curl")
+        assert typo[0]["name"] == "BICEP CURL" and typo[0]["match"] == "fuzzy"
+
+        assert search_exercises(1, "deadlift") == []  # Another user's exercise
+        assert search_exercises(1, "zzz") == []
+        assert search_exercises(1, "   ") == []
+        assert len(search_exercises(1, "bench", limit=1)) == 1
+
+
+def test_index_follows_catalog_writes_and_rebuild(app, client):
+    with app.app_context():
+        resolve_exercise_ids(1, ["Lat Pulldown"])
+        db.session.commit()
+        assert [r["name"] for r in search_exercises(1, "lat pul")] == ["Lat Pulldown"]
+        before = db.session.query(ExerciseNameGram).count()
+        assert rebuild_search_index() == 7
+        assert db.session.query(ExerciseNameGram).count() == before
+
+
+def test_autocomplete_endpoint_skips_logs(app, client):
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        data = client.get("/api/exercises/search?q=bench").get_json()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [(r["name"], r["match"], r["set_count"]) for r in data["results"]] == [
+        ("BENCH PRESS", "prefix", 2), ("INCLINE BENCH PRESS", "fuzzy", 1)]
+    assert not any("exercise_log" in statement for statement in statements)
+    assert client.get("/api/exercises/search?q=").get_json()["results"] == []
+
+
+def test_history_filter_from_rollups(client):
+    page = client.get("/history").get_data(as_text=True)
+    assert 'value="bench press"' in page
+    assert "BENCH PRESS (2)" in page
+    assert "DEADLIFT" not in page
+
+
+def test_weight_progression_falls_back_to_closest_name(client):
+    data = client.get("/api/progress/weight-progression/bicpe%20curl").get_json()
+    assert data["matched_exercise"] == "BICEP CURL"
+    assert [point["weight"] for point in data["data_points"]] == [53.0]
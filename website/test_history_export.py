@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime, timedelta
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.queries import iter_sessions_with_logs
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="export@example.com", password="testpass")
+        other = User(email="other@example.com", password="testpass")
+        db.session.add_all([user, other])
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Push Day", description="Chest")
+        db.session.add(workout)
+        db.session.commit()
+
+        base = datetime(2026, 3, 1, 18, 0)
+        for day in range(4):
+            session = WorkoutSession(user_id=user.id, workout_id=workout.id,
+                                     timestamp=base + timedelta(days=day))
+            db.session.add(session)
+            db.session.flush()
+            db.session.add_all([
+                ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                            set_number=n, reps=8, weight=100 + day, details="slow, controlled",
+                            include_details=True)
+                for n in range(1, 4)
+            ])
+        # A session with no logs and one belonging to another user
+        db.session.add(WorkoutSession(user_id=user.id, workout_id=workout.id,
+                                      timestamp=base + timedelta(days=10)))
+        db.session.add(WorkoutSession(user_id=other.id, workout_id=workout.id, timestamp=base))
+        db.session.commit()
+    yield app
+
+
+def test_ndjson_export_streams_one_session_per_line(client):
+    resp = client.get("/api/workout/history/export")
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    assert resp.mimetype == "application/x-ndjson"
+    assert "workout-history.ndjson" in resp.headers["Content-Disposition"]
+
+    sessions = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    assert len(sessions) == 5
+    assert [s["timestamp"] for s in sessions] == sorted(s["timestamp"] for s in sessions)
+    assert [len(s["exercises"]) for s in sessions] == [3, 3, 3, 3, 0]
+    assert sessions[1]["exercises"][0] == {
+        "exercise_name": "BENCH PRESS", "set_number": 1, "reps": 8, "weight": 101.0,
+        "details": "slow, controlled", "include_details": True,
+    }
+
+
+def test_csv_export_has_one_row_per_set(client):
+    resp = client.get("/api/workout/history/export?format=csv")
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/csv"
+
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert len(rows) == 13
+    assert rows[0]["workout_name"] == "Push Day"
+    assert rows[0]["details"] == "slow, controlled"
+    assert rows[-1]["exercise_name"] == ""
+
+
+def test_export_matches_paginated_history(client):
+    exported = [json.loads(line) for line in
+                client.get("/api/workout/history/export").get_data(as_text=True).splitlines()]
+    paged = client.get("/api/workout/history?limit=200").get_json()
+    assert list(reversed(exported)) == paged
+
+
+def test_export_rejects_unknown_format(client):
+    resp = client.get("/api/workout/history/export?format=xml")
+    assert resp.status_code == 400
+
+
+def test_iterator_groups_logs_across_batches(app):
+    with app.app_context():
+        sessions = list(iter_sessions_with_logs(1, batch_size=2))
+    assert [len(session.logs) for session in sessions] == [3, 3, 3, 3, 0]
+    assert all(log.session_id == session.id for session in sessions for log in session.logs)
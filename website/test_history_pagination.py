@@ -0,0 +1,87 @@
+import pytest
+from datetime import datetime, timedelta
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="pages@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        push = Workout(user_id=user.id, name="Push Day", description="Chest")
+        pull = Workout(user_id=user.id, name="Pull Day", description="Back")
+        db.session.add_all([push, pull])
+        db.session.commit()
+
+        base = datetime(2026, 1, 31, 18, 0)
+        for day in range(10):
+            workout = push if day % 2 == 0 else pull
+            session = WorkoutSession(user_id=user.id, workout_id=workout.id,
+                                     timestamp=base - timedelta(days=day))
+            db.session.add(session)
+            db.session.flush()
+            db.session.add(ExerciseLog(session_id=session.id, exercise_name="ROW",
+                                       set_number=1, reps=8, weight=50 + day))
+        # Two sessions sharing a timestamp must not be skipped across pages
+        twin = WorkoutSession(user_id=user.id, workout_id=push.id, timestamp=base - timedelta(days=4))
+        db.session.add(twin)
+        db.session.commit()
+    yield app
+
+
+def _all_pages(client, query):
+    seen, cursor = [], None
+    while True:
+        url = f"/api/workout/history?{query}" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(url)
+        assert resp.status_code == 200
+        seen.extend(resp.get_json())
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return seen
+
+
+def test_keyset_pages_cover_everything_once(client):
+    full = client.get("/api/workout/history?limit=200").get_json()
+    assert len(full) == 11
+
+    paged = _all_pages(client, "limit=3")
+    assert [s["session_id"] for s in paged] == [s["session_id"] for s in full]
+    stamps = [(s["timestamp"], s["session_id"]) for s in paged]
+    assert stamps == sorted(stamps, reverse=True)
+
+
+def test_default_page_is_bounded(client):
+    resp = client.get("/api/workout/history")
+    assert len(resp.get_json()) == 11
+    assert "X-Next-Cursor" not in resp.headers
+
+    resp = client.get("/api/workout/history?limit=0")
+    assert len(resp.get_json()) == 1
+
+
+def test_filters_are_applied(client):
+    pushes = _all_pages(client, "limit=2&workout_id=1")
+    assert len(pushes) == 6
+    assert {s["workout_name"] for s in pushes} == {"Push Day"}
+
+    window = client.get("/api/workout/history?since=2026-01-25&until=2026-01-27").get_json()
+    assert sorted(s["timestamp"][:10] for s in window) == ["2026-01-25", "2026-01-26", "2026-01-27", "2026-01-27"]
+
+
+def test_fields_selection(client):
+    headers = client.get("/api/workout/history?fields=session&limit=1").get_json()
+    assert set(headers[0]) == {"session_id", "timestamp", "workout_id", "workout_name"}
+
+    full = client.get("/api/workout/history?limit=1").get_json()
+    assert full[0]["exercises"][0]["exercise_name"] == "ROW"
+
+
+@pytest.mark.parametrize("query", ["cursor=not-a-cursor", "since=yesterday", "fields=logs", "workout_id=x"])
+def test_invalid_parameters(client, query):
+    resp = client.get(f"/api/workout/history?{query}")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
@@ -0,0 +1,123 @@
+import json
+from datetime import datetime, timedelta
+from website import db
+from website import views
+from website.models import WorkoutSession, ExerciseLog, IdempotencyKey
+from website.idempotency import IDEMPOTENCY_KEY_TTL, purge_expired_idempotency_keys
+
+
+def _log(client, key=None, weight=100):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": weight}],
+    }), content_type="application/json", headers=headers)
+
+
+def _save_exercise(client, key=None, weight="100"):
+    headers = {"Idempotency-Key": key} if key else {}
+    return client.post("/workout", data=json.dumps({
+        "action": "save_complete_exercise",
+        "workout_id": 1,
+        "exercise_id": 1,
+        "exercise_data": {"weight": weight, "reps": "5", "details": ""},
+    }), content_type="application/json", headers=headers)
+
+
+def _counts(app):
+    with app.app_context():
+        return WorkoutSession.query.count(), ExerciseLog.query.count()
+
+
+def test_retry_with_same_key_replays_original_response(app, client):
+    first = _log(client, key="retry-1")
+    second = _log(client, key="retry-1")
+    assert first.status_code == second.status_code == 201
+    assert second.get_json() == first.get_json()
+    assert _counts(app) == (1, 1)
+
+
+def test_distinct_keys_are_not_merged_by_the_time_window(app, client):
+    assert _log(client, key="set-1").status_code == 201
+    assert _log(client, key="set-2", weight=105).status_code == 201
+    assert _counts(app) == (2, 2)
+
+
+def test_requests_without_key_keep_the_time_window(app, client):
+    assert _log(client).status_code == 201
+    second = _log(client)
+    assert second.status_code == 200
+    assert second.get_json()["note"] == "Used existing recent session"
+    assert _counts(app) == (1, 1)
+
+
+def test_key_reused_on_another_endpoint_is_rejected(app, client):
+    assert _log(client, key="shared").status_code == 201
+    resp = _save_exercise(client, key="shared")
+    assert resp.status_code == 422
+    assert _counts(app) == (1, 1)
+
+
+def test_overlong_key_is_rejected(app, client):
+    assert _log(client, key="k" * 101).status_code == 400
+    assert _counts(app) == (0, 0)
+
+
+def test_failed_request_does_not_store_its_key(app, client):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1, "exercises": [{"reps": 5}],
+    }), content_type="application/json", headers={"Idempotency-Key": "fix-and-retry"})
+    assert resp.status_code == 400
+    assert _log(client, key="fix-and-retry").status_code == 201
+
+
+def test_concurrent_duplicate_replays_the_committed_request(app, client, monkeypatch):
+    assert _log(client, key="race").status_code == 201
+    stored = _log(client, key="race").get_json()
+
+    # The duplicate misses the lookup, as if both requests arrived together,
+    # and then loses on the unique index
+    real_find = views.find_idempotent_response
+    calls = []
+    monkeypatch.setattr(views, "find_idempotent_response",
+                        lambda user_id, key: None if not calls.append(key) and len(calls) == 1
+                        else real_find(user_id, key))
+    resp = _log(client, key="race")
+    assert resp.status_code == 201
+    assert resp.get_json() == stored
+    assert _counts(app) == (1, 1)
+
+
+def test_save_complete_exercise_logs_once_per_key(app, client):
+    first = _save_exercise(client, key="save-1")
+    second = _save_exercise(client, key="save-1")
+    assert first.status_code == second.status_code == 200
+    assert second.get_json() == first.get_json()
+    assert _counts(app) == (1, 1)
+
+    # A new key saves again, updating the day's top set rather than adding one
+    assert _save_exercise(client, key="save-2", weight="105").status_code == 200
+    assert _counts(app) == (1, 1)
+    with app.app_context():
+        assert ExerciseLog.query.one().weight == 105
+
+
+def test_complete_workout_accepts_key_as_form_field(app, client):
+    form = {"exercise_1_weight": "100", "exercise_1_reps": "5", "idempotency_key": "form-1"}
+    for _ in range(2):
+        resp = client.post("/complete-workout/1", data=form)
+        assert resp.status_code == 302
+    assert _counts(app) == (1, 1)
+    with app.app_context():
+        assert IdempotencyKey.query.one().endpoint == "views.complete_workout"
+
+
+def test_expired_keys_are_purged(app, client):
+    _log(client, key="old")
+    _log(client, key="new", weight=105)
+    with app.app_context():
+        old = IdempotencyKey.query.filter_by(key="old").one()
+        old.created_at = datetime.utcnow() - IDEMPOTENCY_KEY_TTL - timedelta(minutes=1)
+        db.session.commit()
+        assert purge_expired_idempotency_keys() == 1
+        assert [k.key for k in IdempotencyKey.query.all()] == ["new"]
@@ -0,0 +1,86 @@
+import json
+import pytest
+from website import db
+from website.models import User, Workout, Exercise
+from website.cache import LRUCache
+
+
+@pytest.fixture
+def app(app):
+    # A second user with the same workout and exercise
+    with app.app_context():
+        user = User(email="user2@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Push Day", description="Chest")
+        db.session.add(workout)
+        db.session.commit()
+        db.session.add(Exercise(name="BENCH PRESS", include_details=True, workout_id=workout.id, details=""))
+        db.session.commit()
+    yield app
+
+
+def _log(client, workout_id, weight):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": workout_id,
+        "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": weight}],
+    }), content_type="application/json")
+    assert resp.status_code == 201
+
+
+def test_hit_after_miss_and_miss_after_write(app, make_client):
+    client = make_client(app, 1)
+    first = client.get("/api/progress/personal-records")
+    assert first.headers["X-Cache"] == "MISS"
+    second = client.get("/api/progress/personal-records")
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.get_json() == first.get_json()
+
+    _log(client, 1, 100)
+    fresh = client.get("/api/progress/personal-records")
+    assert fresh.headers["X-Cache"] == "MISS"
+    assert fresh.get_json()["total_records"] == 1
+
+
+def test_query_arguments_are_part_of_the_key(app, make_client):
+    client = make_client(app, 1)
+    assert client.get("/api/progress/volume-trends/1?days=7").headers["X-Cache"] == "MISS"
+    assert client.get("/api/progress/volume-trends/1?days=30").headers["X-Cache"] == "MISS"
+    assert client.get("/api/progress/volume-trends/1?days=7").headers["X-Cache"] == "HIT"
+
+
+def test_users_do_not_share_entries(app, make_client):
+    _log(make_client(app, 1), 1, 100)
+    assert make_client(app, 1).get("/api/progress/personal-records").headers["X-Cache"] == "MISS"
+    other = make_client(app, 2).get("/api/progress/personal-records")
+    assert other.headers["X-Cache"] == "MISS"
+    assert other.get_json()["total_records"] == 0
+
+
+def test_errors_are_not_cached(app, make_client):
+    client = make_client(app, 1)
+    for _ in range(2):
+        resp = client.get("/api/progress/volume-trends/2")
+        assert resp.status_code == 404
+        assert resp.headers["X-Cache"] == "MISS"
+
+
+def test_clear_history_invalidates(app, make_client):
+    client = make_client(app, 1)
+    _log(client, 1, 100)
+    assert client.get("/api/progress/personal-records").get_json()["total_records"] == 1
+    assert client.delete("/api/workout/history/clear").status_code == 200
+    resp = client.get("/api/progress/personal-records")
+    assert resp.headers["X-Cache"] == "MISS"
+    assert resp.get_json()["total_records"] == 0
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
@@ -0,0 +1,137 @@
+import random
+import pytest
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+from sqlalchemy import event
+from website import db
+from website.models import WorkoutSession, ExerciseLog
+from website.buckets import utc_offset_segments, bucket_start
+
+BERLIN = ZoneInfo("Europe/Berlin")
+
+
+def _add_session(timestamp, sets=((100.0, 5),)):
+    session = WorkoutSession(user_id=1, workout_id=1, timestamp=timestamp)
+    db.session.add(session)
+    db.session.flush()
+    for weight, reps in sets:
+        db.session.add(ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                                   weight=weight, reps=reps))
+
+
+def test_offset_segments_follow_dst():
+    segments = utc_offset_segments(BERLIN, datetime(2026, 1, 1), datetime(2027, 1, 1))
+    assert segments == [
+        (datetime(2026, 3, 29, 1), 3600),
+        (datetime(2026, 10, 25, 1), 7200),
+        (None, 3600),
+    ]
+    assert utc_offset_segments(ZoneInfo("UTC"), datetime(2026, 1, 1), datetime(2027, 1, 1)) == [(None, 0)]
+    # Morocco leaves summer time for Ramadan, five weeks apart
+    assert utc_offset_segments(ZoneInfo("Africa/Casablanca"), datetime(2023, 1, 1), datetime(2024, 1, 1)) == [
+        (datetime(2023, 3, 19, 2), 3600),
+        (datetime(2023, 4, 23, 2), 0),
+        (None, 3600),
+    ]
+    # Boa Vista kept summer time for one week in 2000
+    assert utc_offset_segments(ZoneInfo("America/Boa_Vista"), datetime(2000, 9, 1), datetime(2000, 11, 1)) == [
+        (datetime(2000, 10, 8, 4), -14400),
+        (datetime(2000, 10, 15, 3), -10800),
+        (None, -14400),
+    ]
+
+
+def test_late_evening_sessions_use_local_day(app, client):
+    with app.app_context():
+        _add_session(datetime(2026, 3, 1, 23, 30))    # 00:30 on March 2 in Berlin
+        _add_session(datetime(2026, 6, 30, 22, 30))   # 00:30 on July 1, summer time
+        _add_session(datetime(2026, 12, 31, 23, 30))  # New Year in Berlin
+        db.session.commit()
+
+    days = client.get("/api/progress/calendar?bucket=day&tz=Europe/Berlin"
+                      "&since=2026-03-01&until=2026-03-02").get_json()["buckets"]
+    assert [(b["start"], b["sessions"]) for b in days] == [("2026-03-01", 0), ("2026-03-02", 1)]
+
+    utc_days = client.get("/api/progress/calendar?bucket=day"
+                          "&since=2026-03-01&until=2026-03-02").get_json()["buckets"]
+    assert [(b["start"], b["sessions"]) for b in utc_days] == [("2026-03-01", 1), ("2026-03-02", 0)]
+
+    months = client.get("/api/progress/calendar?bucket=month&tz=Europe/Berlin"
+                        "&since=2026-06-01&until=2026-07-31").get_json()["buckets"]
+    assert [(b["start"], b["end"], b["sessions"]) for b in months] == [
+        ("2026-06-01", "2026-06-30", 0), ("2026-07-01", "2026-07-31", 1)]
+
+    years = client.get("/api/progress/calendar?bucket=year&tz=Europe/Berlin"
+                       "&since=2026-01-01&until=2027-12-31").get_json()
+    assert [(b["start"], b["sessions"], b["volume"]) for b in years["buckets"]] == [
+        ("2026-01-01", 2, 1000.0), ("2027-01-01", 1, 500.0)]
+    assert years["totals"]["sessions"] == 3
+
+
+def test_matches_python_reference(app, client):
+    tz = ZoneInfo("America/New_York")
+    rng = random.Random(3)
+    expected = defaultdict(lambda: {"sessions": 0, "sets": 0, "volume": 0.0, "max_weight": None})
+    with app.app_context():
+        for _ in range(300):
+            timestamp = datetime(2025, 1, 1) + timedelta(minutes=rng.randrange(0, 2 * 365 * 24 * 60))
+            sets = [(float(rng.choice([0, 40, 60, 80])), rng.randrange(0, 10)) for _ in range(rng.randrange(0, 4))]
+            _add_session(timestamp, sets)
+            local_day = timestamp.replace(tzinfo=timezone.utc).astimezone(tz).date()
+            totals = expected[bucket_start(local_day, "week")]
+            totals["sessions"] += 1
+            totals["sets"] += len(sets)
+            totals["volume"] += sum(weight * reps for weight, reps in sets)
+            weights = [weight for weight, _ in sets if weight]
+            if weights:
+                totals["max_weight"] = max(weights + [totals["max_weight"] or 0])
+        db.session.commit()
+
+    data = client.get("/api/progress/calendar?bucket=week&tz=America/New_York"
+                      "&since=2024-12-01&until=2027-01-31").get_json()
+    assert "error" not in data, data.get("error")
+    assert data["since"] == "2024-11-25"  # Moved back to the Monday of its week
+    assert all(date.fromisoformat(b["start"]).weekday() == 0 for b in data["buckets"])
+    actual = {date.fromisoformat(b["start"]): b for b in data["buckets"] if b["sessions"]}
+    assert set(actual) == set(expected)
+    for start, totals in expected.items():
+        bucket = actual[start]
+        assert (bucket["sessions"], bucket["sets"], bucket["max_weight"]) == (
+            totals["sessions"], totals["sets"], totals["max_weight"]), start
+        assert bucket["volume"] == pytest.approx(totals["volume"])
+
+
+def test_one_aggregate_query(app, client):
+    client.get("/api/progress/calendar")  # Warm up the app before counting
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        resp = client.get("/api/progress/calendar?bucket=week&tz=Europe/Berlin")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert resp.status_code == 200
+    assert len(resp.get_json()["buckets"]) in (52, 53)
+    # Current user, data version and the aggregate
+    assert len(statements) == 3
+    assert "GROUP BY" in statements[-1]
+
+
+@pytest.mark.parametrize("query", [
+    "bucket=quarter",
+    "tz=Mars/Olympus",
+    "since=2026-13-01",
+    "since=2026-02-01&until=2026-01-01",
+    "bucket=day&since=2020-01-01&until=2026-01-01",
+    "bucket=year&since=1970-01-01&until=2100-12-31",
+    "bucket=year&since=0001-01-01&until=0001-12-31",
+    "bucket=year&since=9999-01-01&until=9999-12-31",
+])
+def test_invalid_requests(client, query):
+    resp = client.get(f"/api/progress/calendar?{query}")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
@@ -0,0 +1,86 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from website import db
+from website.models import WorkoutSession, ExerciseLog
+from website.catalog import resolve_exercise_ids
+from website.rollups import rebuild_rollups
+from website.records import rebuild_records
+from website.cache import bump_data_version
+
+
+def _log_sessions(app, count):
+    with app.app_context():
+        logged = WorkoutSession.query.count()
+        exercise_ids = resolve_exercise_ids(1, ["BENCH PRESS", "SQUAT"])
+        for n in range(logged, logged + count):
+            session = WorkoutSession(user_id=1, workout_id=1,
+                                     timestamp=datetime.utcnow() - timedelta(days=n))
+            db.session.add(session)
+            db.session.flush()
+            db.session.add_all([
+                ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                            exercise_id=exercise_ids["BENCH PRESS"], set_number=1, reps=8, weight=100 + n),
+                ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                            exercise_id=exercise_ids["BENCH PRESS"], set_number=2, reps=6, weight=105 + n),
+                ExerciseLog(session_id=session.id, exercise_name="SQUAT",
+                            exercise_id=exercise_ids["SQUAT"], set_number=1, reps=5, weight=140 + n),
+            ])
+        db.session.commit()
+        rebuild_rollups()
+        rebuild_records()
+        bump_data_version(1)
+        db.session.commit()
+
+
+def _count_queries(app, client, url, **kwargs):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    # Warm-up request so the logged-in user is already in the session identity map
+    client.get(url, **kwargs)
+    # New data version, so cached progress routes are measured on a miss rather than the LRU
+    with app.app_context():
+        bump_data_version(1)
+        db.session.commit()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        resp = client.get(url, **kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert resp.status_code == 200, resp.data
+    if url.startswith("/api/progress/"):
+        assert resp.headers["X-Cache"] == "MISS"
+    return len(statements)
+
+
+@pytest.mark.parametrize("url,headers", [
+    ("/history", {}),
+    ("/history?workout_id=1", {}),
+    ("/history", {"X-Requested-With": "XMLHttpRequest"}),
+    ("/api/workout/history?limit=200", {}),
+    ("/api/workout/history?limit=200&fields=session", {}),
+    ("/api/progress/volume-trends/1", {}),
+    ("/api/progress/performance-summary?days=30", {}),
+    ("/api/debug/performance-metrics?days=30", {}),
+])
+def test_query_count_does_not_grow_with_sessions(app, client, url, headers):
+    _log_sessions(app, 3)
+    few = _count_queries(app, client, url, headers=headers)
+    _log_sessions(app, 9)
+    many = _count_queries(app, client, url, headers=headers)
+    assert few == many
+
+
+def test_history_page_shows_top_sets(app, client):
+    _log_sessions(app, 2)
+    resp = client.get("/history")
+    assert resp.status_code == 200
+    html = resp.get_data(as_text=True)
+    assert "Push Day" in html
+    assert "106" in html  # top bench set of the older session
+    assert "2 sets" in html
@@ -0,0 +1,135 @@
+import re
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+from website import db
+from website.models import User, Workout, Exercise, WorkoutSession, ExerciseLog
+from website.catalog import resolve_exercise_ids
+from website.rollups import rebuild_rollups
+from website.records import rebuild_records
+
+# Tables that grow with a user's training history. A plain "SCAN <table>" in
+# SQLite's query plan means the whole table is read without using an index.
+HOT_TABLES = ("workout_session", "exercise_log", "exercise", "workout", "exercise_catalog",
+              "exercise_daily_rollup", "session_top_set", "personal_record")
+TABLE_SCAN = re.compile(r"^SCAN (%s)(?: AS \w+)?$" % "|".join(HOT_TABLES))
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="plans@example.com", password="testpass")
+        other = User(email="other@example.com", password="testpass")
+        db.session.add_all([user, other])
+        db.session.commit()
+
+        for owner in (user, other):
+            workout = Workout(user_id=owner.id, name="Push Day", description="Chest")
+            db.session.add(workout)
+            db.session.commit()
+            db.session.add(Exercise(name="BENCH PRESS", weight=100, reps="8",
+                                    include_details=True, workout_id=workout.id, details=""))
+            exercise_id = resolve_exercise_ids(owner.id, ["BENCH PRESS"])["BENCH PRESS"]
+            for days_ago in range(5):
+                session = WorkoutSession(user_id=owner.id, workout_id=workout.id,
+                                         timestamp=datetime.utcnow() - timedelta(days=days_ago))
+                db.session.add(session)
+                db.session.flush()
+                db.session.add_all([
+                    ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                                exercise_id=exercise_id, set_number=n, weight=100 + n, reps=8)
+                    for n in range(1, 4)
+                ])
+            db.session.commit()
+        rebuild_rollups()
+        rebuild_records()
+    yield app
+
+
+def _capture_selects(app, client, url, method="GET", **kwargs):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        resp = client.open(url, method=method, **kwargs)
+        resp.get_data()  # drain streamed responses while still listening
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert resp.status_code == 200, resp.data
+    return statements
+
+
+def _table_scans(statements):
+    scans = []
+    with db.engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+            for row in plan:
+                if TABLE_SCAN.match(row[-1]):
+                    scans.append((row[-1], statement))
+    return scans
+
+
+@pytest.mark.parametrize("url,headers", [
+    ("/", {}),
+    ("/history", {}),
+    ("/history", {"X-Requested-With": "XMLHttpRequest"}),
+    ("/api/workout/history", {}),
+    ("/api/workout/history?limit=2&workout_id=1&since=2000-01-01&fields=session", {}),
+    ("/api/workout/history/export", {}),
+    ("/api/workout/history/export?format=csv", {}),
+    ("/api/progress/performance-summary?days=30", {}),
+    ("/api/progress/exercise-frequency?days=90", {}),
+    ("/api/progress/volume-trends/1", {}),
+    ("/api/progress/weight-progression/BENCH%20PRESS", {}),
+    ("/api/progress/weight-progression/BENCH%20PRESS?bucket=month&max_points=10", {}),
+    ("/api/progress/weight-progression/no-such-exercise", {}),
+    ("/api/progress/personal-records", {}),
+    ("/api/progress/dashboard?days=30&workout_id=1&exercise=BENCH%20PRESS", {}),
+    ("/api/progress/calendar?bucket=day&tz=Europe/Berlin", {}),
+    ("/api/exercises/search?q=ben", {}),
+    ("/api/exercises/search?q=bench%20prss", {}),
+    ("/api/debug/weight-data", {}),
+    ("/api/debug/performance-metrics?days=30", {}),
+])
+def test_route_queries_use_indexes(app, client, url, headers):
+    statements = _capture_selects(app, client, url, headers=headers)
+    assert statements
+    with app.app_context():
+        scans = _table_scans(statements)
+    assert not scans, "\n\n".join(f"{detail}\n{statement}" for detail, statement in scans)
+
+
+def test_sync_queries_use_indexes(app, client):
+    payload = {"sessions": [
+        {"client_id": f"offline-{n}", "workout_id": 1,
+         "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": 100 + n}]}
+        for n in range(3)
+    ]}
+    # New sessions, then the same batch replayed as duplicates
+    for _ in range(2):
+        statements = _capture_selects(app, client, "/api/workout/history/sync", method="POST", json=payload)
+        assert statements
+        with app.app_context():
+            scans = _table_scans(statements)
+        assert not scans, "\n\n".join(f"{detail}\n{statement}" for detail, statement in scans)
+
+
+def test_hot_path_indexes_exist(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert {
+        "ix_workout_session_user_timestamp",
+        "ix_workout_session_user_workout_timestamp",
+        "ix_exercise_log_session_exercise_name",
+        "ix_exercise_workout_id",
+        "ix_workout_user_id",
+    } <= indexes
@@ -0,0 +1,74 @@
+import shutil
+import pytest
+from flask import g
+from website import create_app, db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.routing import READ_BIND
+
+
+def _seed_user():
+    user = User(email="replica@example.com", password="testpass")
+    db.session.add(user)
+    db.session.commit()
+    db.session.add(Workout(user_id=user.id, name="Push Day", description="Chest"))
+    db.session.commit()
+
+
+def _add_session():
+    session = WorkoutSession(user_id=1, workout_id=1)
+    db.session.add(session)
+    db.session.flush()
+    db.session.add(ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS", reps=5, weight=100))
+    db.session.commit()
+
+
+@pytest.fixture
+def replica_app(make_app, tmp_path):
+    primary, replica = tmp_path / "primary.db", tmp_path / "replica.db"
+    app = make_app(f"sqlite:///{primary}", READ_DATABASE_URL=f"sqlite:///file:{replica}?mode=ro&uri=true")
+    with app.app_context():
+        _seed_user()
+        # The replica lags one session behind the primary
+        db.engine.dispose()
+        shutil.copy(primary, replica)
+        _add_session()
+    yield app
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose()
+    # Bind metadata lives on the shared db object; drop it so later apps
+    # created without a read engine can still create_all()
+    db.metadatas.pop(READ_BIND, None)
+
+
+@pytest.fixture
+def client(replica_app, make_client):
+    return make_client(replica_app)
+
+
+def test_read_only_views_use_replica(client):
+    data = client.get("/api/debug/weight-data").get_json()
+    assert data["total_weight_logs"] == 0
+
+
+def test_other_views_use_primary(client):
+    assert len(client.get("/api/workout/history").get_json()) == 1
+
+
+def test_flush_inside_read_only_goes_to_primary(replica_app):
+    with replica_app.test_request_context():
+        g.db_read_only = True
+        assert db.session.get_bind() is db.engines[READ_BIND]
+        _add_session()
+        g.db_read_only = False
+        assert WorkoutSession.query.count() == 2
+
+
+def test_falls_back_to_primary_without_replica(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+    monkeypatch.delenv("READ_DATABASE_URL", raising=False)
+    app = create_app()
+    with app.test_request_context():
+        g.db_read_only = True
+        assert READ_BIND not in db.engines
+        assert db.session.get_bind() is db.engine
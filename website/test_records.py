@@ -0,0 +1,118 @@
+import json
+from datetime import datetime, timedelta
+from website import db
+from website.models import WorkoutSession, ExerciseLog, SessionTopSet, PersonalRecord
+from website.records import rebuild_records, refresh_top_sets
+
+
+def _log_session(client, sets):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1,
+        "exercises": [{"exercise_name": "Bench Press", "set_number": i + 1, "weight": weight, "reps": reps}
+                      for i, (weight, reps) in enumerate(sets)],
+    }), content_type="application/json")
+    assert resp.status_code == 201
+    return resp.get_json()["session_id"]
+
+
+def _age_sessions(days):
+    # Sessions within five minutes of each other are deduplicated, so move
+    # existing ones back before logging the next
+    for session in WorkoutSession.query.all():
+        session.timestamp -= timedelta(days=days)
+    db.session.commit()
+
+
+def test_top_set_pointer_per_session(app, client):
+    session_id = _log_session(client, [(100, 5), (110, 3), (110, 4), (90, 8)])
+    with app.app_context():
+        top_set = SessionTopSet.query.filter_by(session_id=session_id).one()
+        assert (top_set.weight, top_set.reps) == (110, 4)
+        assert top_set.set_count == 4
+        assert top_set.weight_sum == 410
+        assert top_set.log.set_number == 3
+
+
+def test_personal_record_follows_best_set(app, client):
+    first = _log_session(client, [(100, 5)])
+    with app.app_context():
+        _age_sessions(2)
+
+    _log_session(client, [(95, 10)])
+    with app.app_context():
+        record = PersonalRecord.query.one()
+        assert (record.weight, record.reps) == (100, 5)
+        assert record.session_id == first
+        _age_sessions(2)
+
+    newest = _log_session(client, [(100, 6)])
+    with app.app_context():
+        record = PersonalRecord.query.one()
+        assert (record.weight, record.reps) == (100, 6)
+        assert record.session_id == newest
+
+
+def test_record_recomputed_when_logs_change(app, client):
+    _log_session(client, [(100, 5)])
+    with app.app_context():
+        _age_sessions(2)
+    best = _log_session(client, [(120, 5)])
+    with app.app_context():
+        # Edit the record-holding set down and refresh its session
+        log = ExerciseLog.query.join(WorkoutSession).filter(WorkoutSession.id == best).one()
+        log.weight = 80
+        refresh_top_sets(1, [best])
+        db.session.commit()
+        record = PersonalRecord.query.one()
+        assert record.weight == 100
+
+        # Delete every log and the record disappears
+        ExerciseLog.query.delete()
+        refresh_top_sets(1, [s.id for s in WorkoutSession.query.all()])
+        db.session.commit()
+        assert PersonalRecord.query.count() == 0
+        assert SessionTopSet.query.count() == 0
+
+
+def test_rebuild_records_from_raw_logs(app):
+    with app.app_context():
+        for days_ago, weight in [(10, 100), (5, 120), (1, 110)]:
+            session = WorkoutSession(user_id=1, workout_id=1,
+                                     timestamp=datetime.utcnow() - timedelta(days=days_ago))
+            db.session.add(session)
+            db.session.flush()
+            db.session.add(ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                                       weight=weight, reps=5))
+        db.session.commit()
+
+        assert rebuild_records() == 1
+        assert SessionTopSet.query.count() == 3
+        assert PersonalRecord.query.one().weight == 120
+
+
+def test_personal_records_endpoint_and_progression(client):
+    _log_session(client, [(100, 5), (105, 3)])
+    data = client.get("/api/progress/personal-records").get_json()
+    assert data["total_records"] == 1
+    assert data["records"][0]["exercise_name"] == "Bench Press"
+    assert data["records"][0]["weight"] == 105
+
+    progression = client.get("/api/progress/weight-progression/bench%20press").get_json()
+    assert progression["data_points"][0]["weight"] == 105
+    assert progression["total_logs"] == 2
+    assert progression["personal_record"]["reps"] == 3
+
+
+def test_history_page_uses_stored_top_sets(client):
+    _log_session(client, [(100, 5), (105, 3)])
+    html = client.get("/history").data.decode()
+    assert 'data-exercise-name="bench press"' in html
+    assert "2 sets" in html
+
+
+def test_clear_history_removes_records(app, client):
+    _log_session(client, [(100, 5)])
+    client.delete("/api/workout/history/clear")
+    with app.app_context():
+        assert SessionTopSet.query.count() == 0
+        assert PersonalRecord.query.count() == 0
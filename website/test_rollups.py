@@ -0,0 +1,138 @@
+import json
+import pytest
+from datetime import datetime, timedelta
+from website import db
+from website.models import User, Workout, Exercise, WorkoutSession, ExerciseLog, ExerciseDailyRollup
+from website.rollups import check_rollups, rebuild_rollups
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="rollups@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        workout = Workout(user_id=user.id, name="Leg Day", description="Legs")
+        db.session.add(workout)
+        db.session.commit()
+        db.session.add(Exercise(name="SQUAT", weight=100, reps="5", include_details=True,
+                                workout_id=workout.id, details=""))
+        db.session.commit()
+    yield app
+
+
+def _log_session(client, exercises):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1, "exercises": exercises,
+    }), content_type="application/json")
+    assert resp.status_code == 201
+    return resp.get_json()
+
+
+def _add_old_session(days_ago, logs):
+    session = WorkoutSession(user_id=1, workout_id=1,
+                             timestamp=datetime.utcnow() - timedelta(days=days_ago))
+    db.session.add(session)
+    db.session.flush()
+    db.session.add_all([ExerciseLog(session_id=session.id, **log) for log in logs])
+    db.session.commit()
+
+
+def test_session_write_updates_rollup(app, client):
+    _log_session(client, [
+        {"exercise_name": "Squat", "set_number": 1, "reps": 5, "weight": 100},
+        {"exercise_name": "squat", "set_number": 2, "reps": 3, "weight": 110},
+        {"exercise_name": "Lunge", "set_number": 1, "reps": 10},
+    ])
+    with app.app_context():
+        rows = {r.exercise_id: r for r in ExerciseDailyRollup.query.all()}
+        assert len(rows) == 2
+        squat = max(rows.values(), key=lambda r: r.set_count)
+        assert squat.set_count == 2
+        assert squat.working_set_count == 2
+        assert squat.session_count == 1
+        assert squat.total_reps == 8
+        assert squat.volume == 100 * 5 + 110 * 3
+        assert squat.max_weight == 110
+        assert check_rollups() == []
+
+
+def test_top_set_write_updates_rollup(app, client):
+    resp = client.post("/workout", json={
+        "action": "save_complete_exercise", "workout_id": 1, "exercise_id": 1,
+        "exercise_data": {"weight": "120", "reps": "5", "details": ""},
+    })
+    assert resp.status_code == 200
+    with app.app_context():
+        row = ExerciseDailyRollup.query.one()
+        assert row.volume == 600
+        assert check_rollups() == []
+
+
+def test_endpoints_read_rollup(client):
+    _log_session(client, [
+        {"exercise_name": "Squat", "reps": 5, "weight": 100},
+        {"exercise_name": "Squat", "reps": 5, "weight": 120},
+        {"exercise_name": "Lunge", "reps": 10, "weight": 20},
+    ])
+
+    summary = client.get("/api/progress/performance-summary?days=30").get_json()
+    assert summary["total_sessions"] == 1
+    assert summary["total_exercises"] == 3
+    assert summary["total_volume"] == 1300
+    assert summary["top_exercises"][0] == {"name": "Squat", "frequency": 2}
+    assert summary["top_workouts"] == [{"name": "Leg Day", "frequency": 1}]
+
+    frequency = client.get("/api/progress/exercise-frequency?days=90").get_json()
+    squat = frequency["exercises"][0]
+    assert squat["exercise_name"] == "Squat"
+    assert squat["frequency"] == 2
+    assert squat["sessions"] == 1
+    assert squat["avg_weight"] == 110
+    assert squat["max_weight"] == 120
+    assert frequency["total_frequency"] == 3
+
+    trends = client.get("/api/progress/volume-trends/1").get_json()
+    assert trends["total_sessions"] == 1
+    assert len(trends["data_points"]) == 1
+    assert trends["data_points"][0]["volume"] == 1300
+    assert trends["data_points"][0]["total_sets"] == 3
+
+
+def test_backfill_and_checker(app):
+    with app.app_context():
+        # Rows written behind the write paths' back leave the rollup stale
+        _add_old_session(3, [{"exercise_name": "SQUAT", "reps": 5, "weight": 100}])
+        _add_old_session(40, [{"exercise_name": "SQUAT", "reps": 5, "weight": 90}])
+        assert len(check_rollups()) == 2
+
+        assert rebuild_rollups() == 2
+        assert check_rollups() == []
+        assert ExerciseLog.query.filter(ExerciseLog.exercise_id.is_(None)).count() == 0
+
+
+def test_backfill_cli(app):
+    with app.app_context():
+        _add_old_session(1, [{"exercise_name": "SQUAT", "reps": 5, "weight": 100}])
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["rollups", "check"])
+    assert result.exit_code != 0
+    assert "out of date" in result.output
+
+    result = runner.invoke(args=["rollups", "backfill"])
+    assert result.exit_code == 0
+    assert "Wrote 1 rollup rows." in result.output
+
+    result = runner.invoke(args=["rollups", "check"])
+    assert result.exit_code == 0
+    assert "consistent" in result.output
+
+
+def test_clear_history_removes_rollups(app, client):
+    _log_session(client, [{"exercise_name": "Squat", "reps": 5, "weight": 100}])
+    resp = client.delete("/api/workout/history/clear")
+    assert resp.status_code == 200
+    with app.app_context():
+        assert ExerciseDailyRollup.query.count() == 0
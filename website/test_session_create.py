@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog, SessionTopSet
+from website.views import _create_workout_session, _parse_exercise_log_rows
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="create@example.com", password="testpass")
+        db.session.add(user)
+        db.session.commit()
+        db.session.add(Workout(user_id=user.id, name="Push Day", description="Chest"))
+        db.session.commit()
+    yield app
+
+
+def _sets(count):
+    return [{"exercise_name": "BENCH PRESS" if n % 2 else "SQUAT", "set_number": n,
+             "reps": 5, "weight": 100 + n} for n in range(1, count + 1)]
+
+
+def test_parse_coerces_blank_and_malformed_numbers():
+    rows, error = _parse_exercise_log_rows([
+        {"exercise_name": " Bench ", "set_number": "2", "reps": " ", "weight": "heavy"},
+        {"exercise_name": "Squat", "reps": 5.0, "weight": "102.5", "include_details": True, "details": "belt"},
+    ])
+    assert error is None
+    assert rows[0] == {"exercise_name": "Bench", "set_number": 2, "reps": None, "weight": None,
+                       "details": None, "include_details": False}
+    assert rows[1]["reps"] == 5
+    assert rows[1]["weight"] == 102.5
+    assert rows[1]["details"] == "belt"
+
+
+def test_missing_name_writes_nothing(app):
+    with app.app_context():
+        success, result, status = _create_workout_session(
+            1, [{"exercise_name": "Bench", "reps": 5}, {"exercise_name": "  ", "reps": 5}], 1)
+        assert (success, status) == (False, 400)
+        assert result == "Missing exercise_name in entry 1"
+        assert WorkoutSession.query.count() == 0
+        assert ExerciseLog.query.count() == 0
+
+
+def test_logs_are_written_with_one_insert(app):
+    inserts = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO EXERCISE_LOG"):
+            inserts.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            success, result, status = _create_workout_session(1, _sets(30), 1)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        assert (success, status) == (True, 201)
+        assert result["exercises_logged"] == 30
+        assert len(inserts) == 1
+        logs = ExerciseLog.query.order_by(ExerciseLog.id).all()
+        assert [log.set_number for log in logs] == list(range(1, 31))
+        assert all(log.exercise_id is not None for log in logs)
+        assert SessionTopSet.query.count() == 2
@@ -0,0 +1,116 @@
+import json
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog, ExerciseDailyRollup
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        user = User(email="sync@example.com", password="testpass")
+        other = User(email="other@example.com", password="testpass")
+        db.session.add_all([user, other])
+        db.session.commit()
+        db.session.add_all([
+            Workout(user_id=user.id, name="Push Day", description="Chest"),
+            Workout(user_id=user.id, name="Leg Day", description="Legs"),
+            Workout(user_id=other.id, name="Theirs", description=""),
+        ])
+        db.session.commit()
+    yield app
+
+
+def _session(client_id, workout_id=1, timestamp="2026-10-01T07:30:00Z", weight=100):
+    return {"client_id": client_id, "workout_id": workout_id, "timestamp": timestamp,
+            "exercises": [{"exercise_name": "BENCH PRESS", "set_number": 1, "reps": 5, "weight": weight},
+                          {"exercise_name": "SQUAT", "set_number": 1, "reps": 5, "weight": weight + 40}]}
+
+
+def _sync(client, sessions, headers=None):
+    return client.post("/api/workout/history/sync", data=json.dumps({"sessions": sessions}),
+                       content_type="application/json", headers=headers or {})
+
+
+def test_sync_creates_sessions_at_client_timestamps(app, client):
+    resp = _sync(client, [_session("a"), _session("b", workout_id=2, timestamp="2026-10-02T09:00:00+02:00")])
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert (data["created"], data["duplicates"], data["errors"]) == (2, 0, 0)
+    assert [r["status"] for r in data["results"]] == ["created", "created"]
+    assert data["results"][1]["timestamp"] == "2026-10-02T07:00:00"
+    assert data["results"][1]["workout_name"] == "Leg Day"
+    with app.app_context():
+        assert WorkoutSession.query.count() == 2
+        assert ExerciseLog.query.count() == 4
+        # Derived tables follow the synced logs
+        assert ExerciseDailyRollup.query.count() == 4
+
+
+def test_replayed_sync_reports_duplicates(app, client):
+    first = _sync(client, [_session("a"), _session("b")]).get_json()
+    second = _sync(client, [_session("a"), _session("b"), _session("c")]).get_json()
+    assert [r["status"] for r in second["results"]] == ["duplicate", "duplicate", "created"]
+    assert second["results"][0]["session_id"] == first["results"][0]["session_id"]
+    with app.app_context():
+        assert WorkoutSession.query.count() == 3
+
+
+def test_client_id_repeated_within_batch_is_logged_once(app, client):
+    data = _sync(client, [_session("a"), _session("a")]).get_json()
+    assert [r["status"] for r in data["results"]] == ["created", "duplicate"]
+    assert data["results"][0]["session_id"] == data["results"][1]["session_id"]
+    with app.app_context():
+        assert WorkoutSession.query.count() == 1
+
+
+def test_sessions_logged_with_idempotency_key_are_duplicates(app, client):
+    resp = client.post("/api/workout/history", data=json.dumps({
+        "workout_id": 1, "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": 100}],
+    }), content_type="application/json", headers={"Idempotency-Key": "a"})
+    data = _sync(client, [_session("a")]).get_json()
+    assert data["results"][0]["status"] == "duplicate"
+    assert data["results"][0]["session_id"] == resp.get_json()["session_id"]
+
+
+def test_invalid_items_are_reported_and_skipped(app, client):
+    data = _sync(client, [
+        _session("ok"),
+        _session("theirs", workout_id=3),
+        _session("future", timestamp="2999-01-01T00:00:00"),
+        {"client_id": "empty", "workout_id": 1, "exercises": []},
+        {"workout_id": 1, "exercises": [{"exercise_name": "X"}]},
+    ]).get_json()
+    assert [r["status"] for r in data["results"]] == ["created", "error", "error", "error", "error"]
+    assert data["results"][1]["error"] == "Workout not found or access denied"
+    with app.app_context():
+        assert WorkoutSession.query.count() == 1
+
+
+def test_batch_must_be_a_bounded_list(app, client):
+    assert _sync(client, []).status_code == 400
+    assert _sync(client, [_session(str(n)) for n in range(501)]).status_code == 400
+
+
+def test_query_count_does_not_grow_with_batch_size(app, client):
+    def count_queries(batch):
+        statements = []
+        with app.app_context():
+            engine = db.engines[None]
+        # SQLite inserts sessions one row at a time to return their ids in
+        # order; PostgreSQL batches them like every other statement here
+        listener = lambda *args: (statements.append(args[2])
+                                  if not args[2].startswith("INSERT INTO workout_session") else None)
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            assert _sync(client, batch).get_json()["created"] == len(batch)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        return len(statements)
+
+    count_queries([_session("warm-up")])  # Creates the catalog entries
+    # Both batches set new records, so both update them
+    small = count_queries([_session(f"s{n}", weight=200 + n) for n in range(2)])
+    large = count_queries([_session(f"l{n}", weight=300 + n) for n in range(40)])
+    assert large == small
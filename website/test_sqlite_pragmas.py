@@ -0,0 +1,85 @@
+import threading
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from website import db
+from website.models import User, Workout, WorkoutSession, ExerciseLog
+from website.queries import load_sessions
+
+WRITERS = 4
+READERS = 4
+SESSIONS_PER_WRITER = 25
+
+
+@pytest.fixture
+def app(make_app, tmp_path):
+    app = make_app(f"sqlite:///{tmp_path / 'stress.db'}")
+    with app.app_context():
+        for n in range(WRITERS):
+            user = User(email=f"writer{n}@example.com", password="testpass")
+            db.session.add(user)
+            db.session.flush()
+            db.session.add(Workout(user_id=user.id, name="Push Day", description="Chest"))
+        db.session.commit()
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_connections_use_production_pragmas(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            pragma = lambda name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            assert pragma("journal_mode") == "wal"
+            assert pragma("synchronous") == 1  # NORMAL
+            assert pragma("busy_timeout") == 5000
+            assert pragma("temp_store") == 2  # MEMORY
+            assert pragma("cache_size") == -65536
+
+
+def test_concurrent_reads_and_writes_do_not_lock(app):
+    errors = []
+    writers_done = threading.Event()
+    reads = []
+
+    def write(user_id):
+        try:
+            with app.app_context():
+                for n in range(SESSIONS_PER_WRITER):
+                    session = WorkoutSession(user_id=user_id, workout_id=user_id,
+                                             timestamp=datetime.utcnow() - timedelta(minutes=n))
+                    db.session.add(session)
+                    db.session.flush()
+                    db.session.add_all([
+                        ExerciseLog(session_id=session.id, exercise_name="BENCH PRESS",
+                                    set_number=s, reps=5, weight=100 + s)
+                        for s in range(1, 6)
+                    ])
+                    db.session.commit()
+        except Exception as e:
+            errors.append(e)
+
+    def read(user_id):
+        try:
+            with app.app_context():
+                while not writers_done.is_set():
+                    reads.append(len(load_sessions(user_id, with_logs=True)))
+                    db.session.rollback()
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write, args=(n + 1,)) for n in range(WRITERS)]
+    readers = [threading.Thread(target=read, args=(n % WRITERS + 1,)) for n in range(READERS)]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    writers_done.set()
+    for thread in readers:
+        thread.join()
+
+    assert not errors, errors
+    assert reads
+    with app.app_context():
+        assert WorkoutSession.query.count() == WRITERS * SESSIONS_PER_WRITER
+        assert ExerciseLog.query.count() == WRITERS * SESSIONS_PER_WRITER * 5
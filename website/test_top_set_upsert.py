@@ -0,0 +1,88 @@
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from website import db
+from website.models import Workout, Exercise, WorkoutSession, ExerciseLog, ExerciseDailyRollup, PersonalRecord
+from website.rollups import check_rollups
+
+
+@pytest.fixture
+def app(app):
+    with app.app_context():
+        db.session.add(Workout(user_id=1, name="Pull Day", description="Back"))
+        db.session.commit()
+        db.session.add_all([
+            Exercise(name="DIPS", include_details=False, workout_id=1, details=""),
+            Exercise(name="ROW", include_details=False, workout_id=2, details=""),
+        ])
+        db.session.commit()
+    yield app
+
+
+def _save(client, exercise_id, weight, reps="5", workout_id=1):
+    resp = client.post("/workout", json={
+        "action": "save_complete_exercise", "workout_id": workout_id, "exercise_id": exercise_id,
+        "exercise_data": {"weight": weight, "reps": reps, "details": ""},
+    })
+    assert resp.status_code == 200
+
+
+def _logs(app):
+    with app.app_context():
+        return sorted((log.session_id, log.exercise_name, log.weight, log.reps) for log in ExerciseLog.query.all())
+
+
+def test_saves_of_a_workout_share_the_days_session(app, client):
+    _save(client, 1, "100")
+    _save(client, 2, "20", reps="10")
+    _save(client, 3, "60", workout_id=2)
+    assert _logs(app) == [(1, "BENCH PRESS", 100, 5), (1, "DIPS", 20, 10), (2, "ROW", 60, 5)]
+    with app.app_context():
+        assert [s.top_set_day for s in WorkoutSession.query.all()] == [datetime.utcnow().date()] * 2
+
+
+def test_saving_again_updates_the_top_set(app, client):
+    _save(client, 1, "100")
+    _save(client, 1, "110", reps="3")
+    assert _logs(app) == [(1, "BENCH PRESS", 110, 3)]
+    with app.app_context():
+        assert ExerciseDailyRollup.query.one().max_weight == 110
+        assert PersonalRecord.query.one().weight == 110
+        assert check_rollups() == []
+
+
+def test_next_day_starts_a_new_session(app, client):
+    _save(client, 1, "100")
+    with app.app_context():
+        session = db.session.get(WorkoutSession, 1)
+        session.top_set_day -= timedelta(days=1)
+        session.timestamp -= timedelta(days=1)
+        db.session.commit()
+    _save(client, 1, "100")
+    assert [log[0] for log in _logs(app)] == [1, 2]
+
+
+def test_logged_sessions_are_not_merged_into_top_set_session(app, client):
+    resp = client.post("/api/workout/history", json={
+        "workout_id": 1, "exercises": [{"exercise_name": "BENCH PRESS", "reps": 5, "weight": 90}],
+    })
+    assert resp.status_code == 201
+    _save(client, 1, "100")
+    assert [log[0] for log in _logs(app)] == [1, 2]
+
+
+def test_upsert_takes_no_row_locks(app, client):
+    _save(client, 1, "100")
+    statements = []
+    with app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        _save(client, 1, "105")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    upserts = [s for s in statements if "ON CONFLICT" in s]
+    # The pending set, then the session and log written from it
+    assert [s.split()[2] for s in upserts] == ["pending_top_set", "workout_session", "exercise_log"]
+    assert not any("FOR UPDATE" in s for s in statements)
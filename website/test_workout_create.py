@@ -0,0 +1,96 @@
+import pytest
+from sqlalchemy import event
+from website import db
+from website.models import User, Workout, Exercise
+
+
+@pytest.fixture
+def app(make_app):
+    app = make_app()
+    with app.app_context():
+        db.session.add_all([User(email="create@example.com", password="testpass"),
+                            User(email="other@example.com", password="testpass")])
+        db.session.commit()
+    yield app
+
+
+def _watch(app):
+    """Record statements and commits on the app's engine."""
+    log = {"statements": [], "commits": 0}
+    with app.app_context():
+        engine = db.engines[None]
+
+    def on_statement(*args):
+        log["statements"].append(args[2])
+
+    def on_commit(conn):
+        log["commits"] += 1
+
+    event.listen(engine, "before_cursor_execute", on_statement)
+    event.listen(engine, "commit", on_commit)
+    return engine, on_statement, on_commit, log
+
+
+def _unwatch(engine, on_statement, on_commit):
+    event.remove(engine, "before_cursor_execute", on_statement)
+    event.remove(engine, "commit", on_commit)
+
+
+def test_new_workout_is_one_transaction_with_bulk_insert(app, client):
+    names = [f"exercise {n}" for n in range(50)]
+    engine, on_statement, on_commit, log = _watch(app)
+    try:
+        resp = client.post("/new-workout", data={
+            "workout_name": "Full Body", "workout_description": "All", "category_id": "1",
+            "exercise_name": names, "include_details": ["1" if n % 2 else "0" for n in range(50)],
+        })
+    finally:
+        _unwatch(engine, on_statement, on_commit)
+    assert resp.status_code == 302
+    assert log["commits"] == 1
+    assert len([s for s in log["statements"] if s.startswith("INSERT INTO exercise ")]) == 1
+    with app.app_context():
+        workout = Workout.query.one()
+        assert workout.category_id == 1
+        assert [(e.name, e.include_details) for e in workout.exercises] == [
+            (name.upper(), bool(n % 2)) for n, name in enumerate(names)]
+
+
+def test_duplicate_copies_exercises_with_insert_select(app, client):
+    with app.app_context():
+        workout = Workout(user_id=1, name="Push Day", description="Chest")
+        db.session.add(workout)
+        db.session.commit()
+        db.session.add_all([
+            Exercise(name="BENCH PRESS", weight=100, sets=3, reps="5", details="grip 2",
+                     include_details=True, workout_id=workout.id),
+            Exercise(name="DIPS", weight=None, sets=4, reps="8-12", details="",
+                     include_details=False, workout_id=workout.id),
+        ])
+        db.session.commit()
+
+    engine, on_statement, on_commit, log = _watch(app)
+    try:
+        resp = client.post("/duplicate-workout/1")
+    finally:
+        _unwatch(engine, on_statement, on_commit)
+    assert resp.status_code == 302
+    assert log["commits"] == 1
+    copies = [s for s in log["statements"] if s.startswith("INSERT INTO exercise ")]
+    assert len(copies) == 1 and "SELECT" in copies[0]
+    assert not any(s.startswith("SELECT exercise.") for s in log["statements"])
+
+    with app.app_context():
+        original, copy = Workout.query.order_by(Workout.id).all()
+        assert copy.name == "Push Day (Copy)"
+        fields = lambda w: [(e.name, e.weight, e.sets, e.reps, e.details, e.include_details) for e in w.exercises]
+        assert fields(copy) == fields(original)
+
+
+def test_cannot_duplicate_another_users_workout(app, client):
+    with app.app_context():
+        db.session.add(Workout(user_id=2, name="Theirs", description=""))
+        db.session.commit()
+    assert client.post("/duplicate-workout/1").status_code == 404
+    with app.app_context():
+        assert Workout.query.count() == 1
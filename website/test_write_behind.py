@@ -0,0 +1,110 @@
+import pytest
+from datetime import timedelta
+from sqlalchemy import event
+from website import db
+from website.models import User, Exercise, WorkoutSession, ExerciseLog, PendingTopSet, BackgroundJob
+from website.jobs import LOG_TOP_SETS, run_next_job
+
+
+def _make_app(make_app, seed_user, tmp_path, mode):
+    # A file database: the writer thread needs its own connection
+    app = make_app(f"sqlite:///{tmp_path / 'app.db'}", TOP_SETS_WRITE_BEHIND=mode)
+    seed_user(app)
+    with app.app_context():
+        db.session.add(Exercise(name="DIPS", include_details=False, workout_id=1, details=""))
+        db.session.commit()
+    return app
+
+
+@pytest.fixture
+def app(make_app, seed_user, tmp_path):
+    yield _make_app(make_app, seed_user, tmp_path, "thread")
+
+
+@pytest.fixture
+def worker_app(make_app, seed_user, tmp_path):
+    yield _make_app(make_app, seed_user, tmp_path, "worker")
+
+
+def _save(client, exercise_id, weight, reps="5"):
+    resp = client.post("/workout", json={
+        "action": "save_complete_exercise", "workout_id": 1, "exercise_id": exercise_id,
+        "exercise_data": {"weight": weight, "reps": reps, "details": ""},
+    })
+    assert resp.status_code == 200
+    return resp
+
+
+def _logs(app):
+    with app.app_context():
+        return sorted((log.exercise_name, log.weight, log.reps) for log in ExerciseLog.query.all())
+
+
+def test_writer_thread_logs_the_top_set(app, make_client):
+    _save(make_client(app), 1, "100")
+    app.extensions["top_set_writer"].join()
+    assert _logs(app) == [("BENCH PRESS", 100, 5)]
+    with app.app_context():
+        assert PendingTopSet.query.count() == 0
+        assert BackgroundJob.query.filter_by(kind=LOG_TOP_SETS).count() == 0
+
+
+def test_save_responds_before_logging(worker_app, make_client):
+    statements = []
+    with worker_app.app_context():
+        engine = db.engines[None]
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        _save(make_client(worker_app), 1, "100")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    assert not any("exercise_log" in s or "workout_session" in s for s in statements)
+    assert _logs(worker_app) == []
+
+    with worker_app.app_context():
+        while run_next_job():
+            pass
+    assert _logs(worker_app) == [("BENCH PRESS", 100, 5)]
+
+
+def test_saves_coalesce_until_the_job_runs(worker_app, make_client):
+    client = make_client(worker_app)
+    _save(client, 1, "100")
+    _save(client, 1, "110", reps="3")
+    _save(client, 2, "20", reps="10")
+    with worker_app.app_context():
+        assert PendingTopSet.query.count() == 2
+        assert BackgroundJob.query.filter_by(kind=LOG_TOP_SETS).count() == 1
+        version = db.session.get(User, 1).data_version
+        while run_next_job():
+            pass
+        # One transaction for the workout, however many of its exercises were saved
+        assert db.session.get(User, 1).data_version == version + 1
+        assert WorkoutSession.query.count() == 1
+    assert _logs(worker_app) == [("BENCH PRESS", 110, 3), ("DIPS", 20, 10)]
+
+
+def test_top_set_is_logged_on_the_day_it_was_saved(worker_app, make_client):
+    _save(make_client(worker_app), 1, "100")
+    with worker_app.app_context():
+        pending = PendingTopSet.query.one()
+        pending.saved_at -= timedelta(days=1)
+        saved_at = pending.saved_at
+        db.session.commit()
+        while run_next_job():
+            pass
+        session = WorkoutSession.query.one()
+        assert (session.timestamp, session.top_set_day) == (saved_at, saved_at.date())
+
+
+def test_deleting_the_workout_drops_its_pending_top_sets(worker_app, make_client):
+    client = make_client(worker_app)
+    _save(client, 1, "100")
+    resp = client.post("/edit-workout", data={"request_type": "delete", "workout": "1"})
+    assert resp.status_code == 302
+    with worker_app.app_context():
+        assert PendingTopSet.query.count() == 0
+        while run_next_job():
+            pass
+        assert WorkoutSession.query.count() == 0
@@ -0,0 +1,193 @@
+from . import db
+from .models import TOP_SET_SESSION_PREDICATE, TOP_SET_LOG_PREDICATE, WorkoutSession, ExerciseLog, PendingTopSet
+from .catalog import resolve_exercise_ids
+from .derived import sync_derived_tables
+from .jobs import LOG_TOP_SETS, enqueue_job, run_queued_job
+from .upsert import upsert
+from flask import current_app
+from sqlalchemy import text
+from datetime import datetime
+from itertools import groupby
+from operator import attrgetter
+import queue
+import threading
+
+# How top sets saved on the workout page reach the history: "thread" writes them
+# behind the response, "worker" leaves them to `flask jobs worker`, "off" writes
+# them before responding
+TOP_SET_WRITE_MODES = ("thread", "worker", "off")
+
+# Users waiting for the writer thread; beyond this, saves wait for the jobs worker
+TOP_SET_QUEUE_SIZE = 1000
+
+
+# PUBLIC_INTERFACE
+def queue_top_set(exercise, workout_id, user_id):
+    """
+    Keep a completed top set (has both weight and reps) for the history and
+    queue the job that logs it. Runs inside the caller's transaction, so the set
+    is kept only if the save commits. A later save of the same exercise before
+    the job runs replaces the set.
+
+    Args:
+        exercise (Exercise): The exercise that was completed
+        workout_id (int): ID of the workout
+        user_id (int): ID of the user
+    """
+    values = {
+        "exercise_name": exercise.name,
+        "weight": exercise.weight,
+        "reps": int(exercise.reps) if exercise.reps and exercise.reps.isdigit() else None,
+        "details": exercise.details,
+        "include_details": exercise.include_details,
+        "saved_at": datetime.utcnow(),
+    }
+    stmt = upsert(PendingTopSet).values(user_id=user_id, workout_id=workout_id, **values)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "workout_id", "exercise_name"],
+        set_={column: stmt.excluded[column] for column in values if column != "exercise_name"},
+    ))
+    enqueue_job(LOG_TOP_SETS, user_id)
+
+
+def _write_top_set(user_id, entry, exercise_id):
+    """
+    Record a pending top set in the workout's top-set session of its day. The
+    session and the log are each written with one INSERT ... ON CONFLICT DO
+    UPDATE against a partial unique index, so another save the same day updates
+    the log instead of adding one, without locking rows first.
+
+    Returns:
+        int: ID of the top-set session
+    """
+    # The no-op update makes RETURNING yield the id of an existing session too
+    stmt = upsert(WorkoutSession).values(user_id=user_id, workout_id=entry.workout_id,
+                                         timestamp=entry.saved_at, top_set_day=entry.saved_at.date())
+    session_id = db.session.execute(stmt.on_conflict_do_update(
+        index_elements=["user_id", "workout_id", "top_set_day"],
+        index_where=text(TOP_SET_SESSION_PREDICATE),
+        set_={"top_set_day": stmt.excluded.top_set_day},
+    ).returning(WorkoutSession.id)).scalar_one()
+
+    stmt = upsert(ExerciseLog).values(session_id=session_id, exercise_name=entry.exercise_name,
+                                      exercise_id=exercise_id, weight=entry.weight, reps=entry.reps,
+                                      details=entry.details, include_details=entry.include_details,
+                                      top_set=True)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=["session_id", "exercise_id"],
+        index_where=text(TOP_SET_LOG_PREDICATE),
+        set_={column: stmt.excluded[column]
+              for column in ("exercise_name", "weight", "reps", "details", "include_details")},
+    ))
+    return session_id
+
+
+# PUBLIC_INTERFACE
+def log_pending_top_sets(user_id):
+    """
+    Write a user's pending top sets to the history, in one transaction per
+    workout that also brings the derived tables up to date. A set saved again
+    while this runs is left pending for the next run.
+
+    Args:
+        user_id (int): ID of the user
+    """
+    pending = (PendingTopSet.query
+               .filter_by(user_id=user_id)
+               .order_by(PendingTopSet.workout_id, PendingTopSet.saved_at)
+               .all())
+    if not pending:
+        return
+    exercise_ids = resolve_exercise_ids(user_id, [entry.exercise_name for entry in pending])
+
+    for _, entries in groupby(pending, key=attrgetter("workout_id")):
+        entries = list(entries)
+        session_ids = {_write_top_set(user_id, entry, exercise_ids[entry.exercise_name]) for entry in entries}
+        for entry in entries:
+            (db.session.query(PendingTopSet)
+             .filter_by(id=entry.id, saved_at=entry.saved_at)
+             .delete(synchronize_session=False))
+        sync_derived_tables(user_id, WorkoutSession.query.filter(WorkoutSession.id.in_(session_ids)).all())
+        db.session.commit()
+
+
+# PUBLIC_INTERFACE
+class TopSetWriter:
+    """
+    Bounded in-process queue of users with pending top sets, drained by one
+    daemon thread started on first use. The sets and their job are already
+    committed, so a full queue or a restart only leaves them to the jobs worker
+    or the user's next save.
+    """
+
+    def __init__(self, app, maxsize=TOP_SET_QUEUE_SIZE):
+        self.app = app
+        self._queue = queue.Queue(maxsize)
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, user_id):
+        """
+        Have the thread log a user's pending top sets. Coalesces with a run for
+        the same user that has not started yet.
+
+        Args:
+            user_id (int): ID of the user
+
+        Returns:
+            bool: False if the queue is full
+        """
+        with self._lock:
+            if user_id in self._queued:
+                return True
+            try:
+                self._queue.put_nowait(user_id)
+            except queue.Full:
+                return False
+            self._queued.add(user_id)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="top-set-writer", daemon=True)
+                self._thread.start()
+        return True
+
+    def join(self):
+        """Block until every submitted user has been written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            user_id = self._queue.get()
+            with self._lock:
+                self._queued.discard(user_id)
+            with self.app.app_context():
+                try:
+                    run_queued_job(LOG_TOP_SETS, user_id)
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception("Could not log top sets of user %s", user_id)
+                finally:
+                    db.session.remove()
+                    self._queue.task_done()
+
+
+# PUBLIC_INTERFACE
+def write_top_sets_behind(user_id):
+    """
+    Log a user's pending top sets as configured by TOP_SETS_WRITE_BEHIND, after
+    the save that queued them has committed.
+
+    Args:
+        user_id (int): ID of the user
+    """
+    mode = current_app.config["TOP_SETS_WRITE_BEHIND"]
+    if mode == "thread":
+        if not current_app.extensions["top_set_writer"].submit(user_id):
+            current_app.logger.warning("Top-set writer queue is full; leaving user %s to the jobs worker", user_id)
+    elif mode == "off":
+        try:
+            run_queued_job(LOG_TOP_SETS, user_id)
+        except Exception:
+            # The save has committed; the job stays queued for the worker
+            db.session.rollback()
+            current_app.logger.exception("Could not log top sets of user %s", user_id)
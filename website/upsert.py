@@ -0,0 +1,26 @@
+from . import db
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+# PUBLIC_INTERFACE
+def upsert(model):
+    """
+    INSERT statement of the bound database's dialect, which supports
+    on_conflict_do_update / on_conflict_do_nothing with the same arguments
+    on SQLite and PostgreSQL.
+
+    Args:
+        model: Mapped class or Table to insert into
+
+    Returns:
+        Insert: Dialect-specific insert construct
+
+    Raises:
+        NotImplementedError: On databases without ON CONFLICT support here
+    """
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model)
+    if dialect == "sqlite":
+        return sqlite.insert(model)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
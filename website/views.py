@@ -1,15 +1,63 @@
 from . import db
-from .models import Workout, Exercise, WorkoutSession, ExerciseLog, Category
-from flask import Blueprint, render_template, request, flash, redirect, url_for, jsonify
+from .models import (Workout, Exercise, WorkoutSession, ExerciseLog, Category,
+                     PersonalRecord, PendingTopSet)
+from .catalog import (resolve_exercise_ids, search_exercises, exercise_set_counts,
+                      SEARCH_DEFAULT_LIMIT)
+from .queries import load_sessions, load_logs, iter_sessions_with_logs, session_totals
+from .rollups import delete_user_rollups
+from .records import delete_user_records, serialize_personal_record
+from .routing import read_only
+from .cache import cached_progress, conditional_on_data, bump_data_version
+from .dedup import find_duplicate_sessions
+from .summaries import PERFORMANCE_SUMMARY, compute_performance_summary, load_snapshot
+from .derived import sync_derived_tables
+from .top_sets import queue_top_set, write_top_sets_behind
+from .idempotency import (IDEMPOTENCY_KEY_MAX_LENGTH, read_idempotency_key, find_idempotent_response,
+                          find_idempotent_responses, claim_idempotency_key, store_idempotent_response,
+                          record_idempotent_responses)
+from .buckets import CALENDAR_BUCKETS, CALENDAR_EARLIEST, CALENDAR_LATEST, bucket_start, calendar_totals
+from .dashboard import (DASHBOARD_SECTIONS, window_start_day, load_dashboard_data, summary_section,
+                        frequency_section, volume_section, weight_section)
+from flask import (Blueprint, render_template, request, flash, redirect, url_for, jsonify,
+                   Response, stream_with_context)
 from flask_login import login_required, current_user
-from sqlalchemy import func, desc, asc
-from datetime import datetime, timedelta
+from sqlalchemy import asc, insert, literal, select
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, time, timedelta, timezone
 from collections import defaultdict
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import base64
+import csv
+import io
+import json
 
 
 # Define blueprint
 views = Blueprint('views', __name__)
 
+# Page size bounds for GET /api/workout/history
+HISTORY_PAGE_SIZE = 50
+HISTORY_MAX_PAGE_SIZE = 200
+HISTORY_FIELDS = {"session", "exercises"}
+
+# Point granularities for GET /api/progress/weight-progression
+WEIGHT_PROGRESSION_BUCKETS = ("day", "week", "month")
+
+# Upper bounds on buckets returned by, and days covered by, one calendar request
+CALENDAR_MAX_BUCKETS = 1000
+CALENDAR_MAX_DAYS = 10 * 366
+
+# Bounds for POST /api/workout/history/sync
+SYNC_MAX_SESSIONS = 500
+SYNC_CLOCK_SKEW = timedelta(minutes=5)  # Tolerated lead of a client clock
+
+# Formats and CSV layout of GET /api/workout/history/export
+HISTORY_EXPORT_FORMATS = {"ndjson", "csv"}
+HISTORY_EXPORT_CSV_COLUMNS = [
+    "session_id", "timestamp", "workout_id", "workout_name",
+    "exercise_name", "set_number", "reps", "weight", "details", "include_details",
+]
+
 
 # PUBLIC_INTERFACE
 def get_workout_completion_status(workout_id, user_id):
@@ -49,76 +97,6 @@ def get_workout_completion_status(workout_id, user_id):
         return {"completed": 0, "total": 0, "percentage": 0}
 
 
-# PUBLIC_INTERFACE
-def _create_top_set_log(exercise, workout_id, user_id):
-    """
-    Create a workout session log entry when a top set is completed (has both weight and reps).
-    Uses a session-scoped lock to prevent duplicate entries.
-    
-    Args:
-        exercise (Exercise): The exercise that was completed
-        workout_id (int): ID of the workout
-        user_id (int): ID of the user
-    """
-    try:
-        from datetime import datetime, timedelta
-        from sqlalchemy import and_, func
-        
-        # Start a transaction
-        with db.session.begin_nested():
-            # Use FOR UPDATE to lock the rows we're checking
-            recent_threshold = datetime.utcnow() - timedelta(minutes=30)  # Reduced window to 30 minutes
-            
-            # Get most recent session with this exercise using a precise query
-            existing_session = (db.session.query(WorkoutSession)
-                .join(ExerciseLog)
-                .filter(and_(
-                    WorkoutSession.user_id == user_id,
-                    WorkoutSession.workout_id == workout_id,
-                    WorkoutSession.timestamp >= recent_threshold,
-                    ExerciseLog.exercise_name == exercise.name,
-                    ExerciseLog.weight == exercise.weight,  # Match exact weight
-                    func.coalesce(ExerciseLog.reps, -1) == (int(exercise.reps) if exercise.reps and exercise.reps.isdigit() else -1)
-                ))
-                .with_for_update()
-                .first())
-            
-            if existing_session:
-                # Update existing log with the same values - idempotent operation
-                existing_log = (db.session.query(ExerciseLog)
-                    .filter(and_(
-                        ExerciseLog.session_id == existing_session.id,
-                        ExerciseLog.exercise_name == exercise.name
-                    ))
-                    .with_for_update()
-                    .first())
-                
-                if existing_log:
-                    # No need to update if values are the same
-                    return
-            
-            # Create new session if no matching recent one exists
-            session = WorkoutSession(user_id=user_id, workout_id=workout_id)
-            db.session.add(session)
-            db.session.flush()  # Get ID without committing
-        
-        # Create exercise log
-        log = ExerciseLog(
-            session_id=session.id,
-            exercise_name=exercise.name,
-            weight=exercise.weight,
-            reps=int(exercise.reps) if exercise.reps and exercise.reps.isdigit() else None,
-            details=exercise.details,
-            include_details=exercise.include_details
-        )
-        db.session.add(log)
-        db.session.commit()
-        
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error creating top set log: {str(e)}")
-
-
 def handle_complete_exercise_save(data):
     """
     Handle complete exercise save with validation.
@@ -131,6 +109,30 @@ def handle_complete_exercise_save(data):
         flask.Response: JSON response with success/error status
     """
     
+    idempotency_key, key_error = read_idempotency_key()
+    if key_error:
+        return jsonify({"success": False, "error": key_error}), 400
+    if idempotency_key:
+        stored = find_idempotent_response(current_user.id, idempotency_key)
+        if stored:
+            body, status_code = stored
+            return jsonify(body), status_code
+        try:
+            claim = claim_idempotency_key(current_user.id, idempotency_key)
+        except IntegrityError:
+            db.session.rollback()
+            # A concurrent request with the same key committed first
+            stored = find_idempotent_response(current_user.id, idempotency_key)
+            if stored:
+                body, status_code = stored
+                return jsonify(body), status_code
+            return jsonify({
+                "success": False,
+                "error": "A request with this Idempotency-Key is in progress"
+            }), 409
+    else:
+        claim = None
+    
     try:
         workout_id = data.get("workout_id")
         exercise_id = data.get("exercise_id")
@@ -196,19 +198,24 @@ def handle_complete_exercise_save(data):
         exercise.reps = reps_str
         exercise.details = details_str if details_str else ""
         
-        # Save to database
-        db.session.commit()
-        
-        # Create workout session log for this completed exercise
-        _create_top_set_log(exercise, workout_id, current_user.id)
+        # The top set commits with the exercise and reaches the history after the response
+        queue_top_set(exercise, workout_id, current_user.id)
         
-        return jsonify({
+        response = {
             "success": True, 
             "message": "Exercise saved and marked as complete",
             "exercise_id": exercise_id,
             "exercise_completed": True,
             "workout_id": workout_id
-        }), 200
+        }
+        if claim:
+            store_idempotent_response(claim, response, 200)
+        
+        # Save to database
+        db.session.commit()
+        write_top_sets_behind(current_user.id)
+        
+        return jsonify(response), 200
         
     except Exception as e:
         db.session.rollback()
@@ -218,15 +225,64 @@ def handle_complete_exercise_save(data):
         }), 500
 
 
-def _create_workout_session(workout_id, exercises_data, user_id):
+def _coerce_log_number(value, cast):
+    """
+    Coerce an optional numeric field of a logged set. Blank or malformed values
+    are stored as missing rather than rejecting the whole session.
+    
+    Args:
+        value: Raw value from the request payload
+        cast (type): int or float
+        
+    Returns:
+        int|float|None: Coerced value
+    """
+    if value is None:
+        return None
+    try:
+        return cast(value) if str(value).strip() else None
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_exercise_log_rows(exercises_data):
+    """
+    Validate a session payload in one pass and build the rows for a bulk insert.
+    
+    Args:
+        exercises_data (list): List of exercise data dictionaries
+        
+    Returns:
+        tuple: (rows: list of dicts keyed by ExerciseLog column, error: str|None)
+    """
+    rows = []
+    for idx, exercise_data in enumerate(exercises_data):
+        exercise_name = exercise_data.get("exercise_name", "").strip() if exercise_data.get("exercise_name") else ""
+        if not exercise_name:
+            return [], f"Missing exercise_name in entry {idx}"
+        rows.append({
+            "exercise_name": exercise_name,
+            "set_number": _coerce_log_number(exercise_data.get("set_number"), int),
+            "reps": _coerce_log_number(exercise_data.get("reps"), int),
+            "weight": _coerce_log_number(exercise_data.get("weight"), float),
+            "details": exercise_data.get("details"),
+            "include_details": exercise_data.get("include_details", False),
+        })
+    return rows, None
+
+
+def _create_workout_session(workout_id, exercises_data, user_id, idempotency_key=None):
     """
     Unified function to create a workout session with exercise logs.
-    Includes deduplication logic to prevent duplicate session creation.
+    Includes deduplication logic to prevent duplicate session creation: with an
+    idempotency key, a retry returns the stored result of the first request;
+    without one, a session of the same workout in the last 5 minutes is reused.
     
     Args:
         workout_id (int): ID of the workout being completed
         exercises_data (list): List of exercise data dictionaries
         user_id (int): ID of the user completing the workout
+        idempotency_key (str|None): Client key identifying this request
         
     Returns:
         tuple: (success: bool, result: dict|str, status_code: int)
@@ -236,14 +292,28 @@ def _create_workout_session(workout_id, exercises_data, user_id):
     from datetime import datetime, timedelta
     from sqlalchemy import and_
     
+    claim = None
+    if idempotency_key:
+        replayed = _replay_idempotent_result(user_id, idempotency_key)
+        if replayed:
+            return replayed
+        try:
+            claim = claim_idempotency_key(user_id, idempotency_key)
+        except IntegrityError:
+            db.session.rollback()
+            # A concurrent request with the same key committed first
+            return (_replay_idempotent_result(user_id, idempotency_key)
+                    or (False, "A request with this Idempotency-Key is in progress", 409))
+    
     # Start transaction
     try:
         with db.session.begin_nested():
             # Validate workout exists and belongs to user
-            workout = (Workout.query
-                      .filter_by(id=workout_id, user_id=user_id)
-                      .with_for_update()
-                      .first())
+            workout_query = Workout.query.filter_by(id=workout_id, user_id=user_id)
+            if not idempotency_key:
+                # Serializes the time-window duplicate check below
+                workout_query = workout_query.with_for_update()
+            workout = workout_query.first()
             
             if not workout:
                 return False, "Workout not found or access denied", 404
@@ -251,9 +321,9 @@ def _create_workout_session(workout_id, exercises_data, user_id):
             if not exercises_data:
                 return False, "No exercises provided", 400
             
-            # Check for recent duplicate session
+            # Check for recent duplicate session; a keyed request is deduplicated by its key
             recent_threshold = datetime.utcnow() - timedelta(minutes=5)
-            recent_session = (WorkoutSession.query
+            recent_session = None if idempotency_key else (WorkoutSession.query
                             .filter(and_(
                                 WorkoutSession.user_id == user_id,
                                 WorkoutSession.workout_id == workout_id,
@@ -273,6 +343,11 @@ def _create_workout_session(workout_id, exercises_data, user_id):
                     "note": "Used existing recent session"
                 }, 200
             
+            # Validate the whole payload before anything is written
+            rows, error = _parse_exercise_log_rows(exercises_data)
+            if error:
+                return False, error, 400
+            
             # Create new session if no recent duplicate
             session = WorkoutSession(user_id=user_id, workout_id=workout_id)
             db.session.add(session)
@@ -282,86 +357,64 @@ def _create_workout_session(workout_id, exercises_data, user_id):
         db.session.rollback()
         return False, f"Database error: {str(e)}", 500
     
-    # Initialize logs list outside try block
-    logs = []
     try:
-        exercises_logged = 0
-        
-        for idx, exercise_data in enumerate(exercises_data):
-            # Extract and validate exercise name
-            exercise_name = exercise_data.get("exercise_name", "").strip() if exercise_data.get("exercise_name") else ""
-            if not exercise_name:
-                # Rollback session if exercise name is missing
-                db.session.delete(session)
-                db.session.commit()
-                return False, f"Missing exercise_name in entry {idx}", 400
-            
-            # Parse and validate numeric fields with error handling
-            set_number = exercise_data.get("set_number")
-            reps = exercise_data.get("reps")
-            weight = exercise_data.get("weight")
-            
-            if set_number is not None:
-                try:
-                    set_number = int(set_number) if str(set_number).strip() else None
-                except (ValueError, TypeError):
-                    set_number = None
-                    
-            if reps is not None:
-                try:
-                    reps = int(reps) if str(reps).strip() else None
-                except (ValueError, TypeError):
-                    reps = None
-                    
-            if weight is not None:
-                try:
-                    weight = float(weight) if str(weight).strip() else None
-                except (ValueError, TypeError):
-                    weight = None
-            
-            # Create exercise log
-            log = ExerciseLog(
-                session_id=session.id,
-                exercise_name=exercise_name,
-                set_number=set_number,
-                reps=reps,
-                weight=weight,
-                details=exercise_data.get("details"),
-                include_details=exercise_data.get("include_details", False),
-            )
-            db.session.add(log)
-            logs.append(log)
-            exercises_logged += 1
+        exercises_logged = len(rows)
         
-        # Commit all changes
-        db.session.commit()
+        # Resolve free-text names to catalog ids in one lookup for the whole session
+        exercise_ids = resolve_exercise_ids(user_id, [row["exercise_name"] for row in rows])
+        for row in rows:
+            row["session_id"] = session.id
+            row["exercise_id"] = exercise_ids[row["exercise_name"]]
         
-        # Return success data
-        return True, {
+        # One executemany INSERT for all logs instead of an ORM object per set
+        db.session.execute(insert(ExerciseLog), rows)
+        
+        # Keep rollups, top sets and records in step with the logs, in the same transaction
+        sync_derived_tables(user_id, [session])
+        
+        result = {
             "session_id": session.id,
             "timestamp": session.timestamp.isoformat(),
             "workout_id": session.workout_id,
             "workout_name": workout.name,
             "exercises_logged": exercises_logged,
-        }, 201
+        }
+        if claim:
+            store_idempotent_response(claim, result, 201)
+        
+        # Commit all changes
+        db.session.commit()
+        
+        # Return success data
+        return True, result, 201
         
     except Exception as e:
         db.session.rollback()
         return False, f"Error creating exercise logs: {str(e)}", 500
+
+
+def _replay_idempotent_result(user_id, idempotency_key):
+    """
+    Result of an earlier session write made with the same idempotency key, in
+    the (success, result, status_code) form of _create_workout_session.
     
-    # Return success data
-    return True, {
-        "session_id": session.id,
-        "timestamp": session.timestamp.isoformat(),
-        "workout_id": session.workout_id,
-        "workout_name": workout.name,
-        "exercises_logged": exercises_logged,
-    }, 201
+    Returns:
+        tuple|None: Stored result, or None if the key is unused
+    """
+    stored = find_idempotent_response(user_id, idempotency_key)
+    if stored is None:
+        return None
+    body, status_code = stored
+    if status_code >= 400:
+        return False, body.get("error"), status_code
+    return True, body, status_code
 
 
 # PUBLIC_INTERFACE
 @views.route("/api/progress/weight-progression/<exercise_name>", methods=["GET"])
 @login_required
+@read_only
+@cached_progress
 def get_weight_progression(exercise_name):
     """
     Get weight progression data for a specific exercise over time.
@@ -370,6 +423,10 @@ def get_weight_progression(exercise_name):
     Args:
         exercise_name (str): Name of the exercise to track
         
+    Query parameters:
+        bucket (str): "day" (default), "week" or "month"; each point is the heaviest top set in it
+        max_points (int): Downsample to at most this many points with Largest-Triangle-Three-Buckets
+        
     Returns:
         JSON response with weight progression data points
     """
@@ -378,117 +435,15 @@ def get_weight_progression(exercise_name):
         from urllib.parse import unquote
         exercise_name = unquote(exercise_name).strip()
         
-        # Get all exercise logs for this exercise for the current user
-        # Use exact match first, then fuzzy match if no results
-        logs = (db.session.query(ExerciseLog, WorkoutSession.timestamp)
-                .join(WorkoutSession)
-                .filter(WorkoutSession.user_id == current_user.id)
-                .filter(ExerciseLog.exercise_name == exercise_name)
-                .filter(ExerciseLog.weight.isnot(None))
-                .filter(ExerciseLog.weight > 0)  # Ensure positive weights
-                .order_by(WorkoutSession.timestamp.asc())
-                .all())
-        
-        # If no exact match, try case-insensitive search
-        if not logs:
-            logs = (db.session.query(ExerciseLog, WorkoutSession.timestamp)
-                    .join(WorkoutSession)
-                    .filter(WorkoutSession.user_id == current_user.id)
-                    .filter(ExerciseLog.exercise_name.ilike(exercise_name))
-                    .filter(ExerciseLog.weight.isnot(None))
-                    .filter(ExerciseLog.weight > 0)
-                    .order_by(WorkoutSession.timestamp.asc())
-                    .all())
-        
-        # If still no match, try partial match
-        if not logs:
-            logs = (db.session.query(ExerciseLog, WorkoutSession.timestamp)
-                    .join(WorkoutSession)
-                    .filter(WorkoutSession.user_id == current_user.id)
-                    .filter(ExerciseLog.exercise_name.ilike(f"%{exercise_name}%"))
-                    .filter(ExerciseLog.weight.isnot(None))
-                    .filter(ExerciseLog.weight > 0)
-                    .order_by(WorkoutSession.timestamp.asc())
-                    .all())
-        
-        if not logs:
-            # Find all available exercises for debugging
-            available_exercises = (db.session.query(ExerciseLog.exercise_name)
-                                 .join(WorkoutSession)
-                                 .filter(WorkoutSession.user_id == current_user.id)
-                                 .filter(ExerciseLog.weight.isnot(None))
-                                 .filter(ExerciseLog.weight > 0)
-                                 .distinct()
-                                 .all())
-            
-            return jsonify({
-                "exercise_name": exercise_name,
-                "data_points": [],
-                "message": f"No weight data found for exercise '{exercise_name}'",
-                "available_exercises": [ex[0] for ex in available_exercises],
-                "debug_info": {
-                    "searched_name": exercise_name,
-                    "user_id": current_user.id,
-                    "total_available": len(available_exercises)
-                }
-            })
-        
-        # Process all data points (not just daily max) to show progression
-        data_points = []
-        seen_dates = set()
+        bucket = request.args.get("bucket", "day")
+        max_points = request.args.get("max_points", type=int)
+        if bucket not in WEIGHT_PROGRESSION_BUCKETS:
+            return jsonify({"error": f"bucket must be one of {', '.join(WEIGHT_PROGRESSION_BUCKETS)}",
+                            "exercise_name": exercise_name}), 400
+        if max_points is not None and max_points < 3:
+            return jsonify({"error": "max_points must be at least 3", "exercise_name": exercise_name}), 400
         
-        for log, timestamp in logs:
-            date_key = timestamp.date().isoformat()
-            formatted_date = timestamp.strftime("%b %d, %Y")
-            
-            # If we have multiple entries on the same date, take the highest weight
-            existing_point = None
-            for point in data_points:
-                if point["date"] == date_key:
-                    existing_point = point
-                    break
-            
-            if existing_point:
-                if log.weight > existing_point["weight"]:
-                    existing_point["weight"] = float(log.weight)
-                    existing_point["session_count"] = existing_point.get("session_count", 1) + 1
-            else:
-                data_points.append({
-                    "date": date_key,
-                    "weight": float(log.weight),
-                    "formatted_date": formatted_date,
-                    "session_count": 1,
-                    "timestamp": timestamp.isoformat()
-                })
-        
-        # Sort by date to ensure proper chronological order
-        data_points.sort(key=lambda x: x["date"])
-        
-        # Calculate weight range and progression stats
-        weights = [point["weight"] for point in data_points]
-        min_weight = min(weights) if weights else 0
-        max_weight = max(weights) if weights else 0
-        
-        # Calculate progression (difference between first and last)
-        progression = 0
-        if len(weights) >= 2:
-            progression = weights[-1] - weights[0]
-        
-        return jsonify({
-            "exercise_name": exercise_name,
-            "data_points": data_points,
-            "total_sessions": len(data_points),
-            "total_logs": len(logs),
-            "weight_range": {
-                "min": min_weight,
-                "max": max_weight
-            },
-            "progression_stats": {
-                "total_progression": round(progression, 2),
-                "progression_percentage": round((progression / weights[0] * 100) if weights and weights[0] > 0 else 0, 1),
-                "average_weight": round(sum(weights) / len(weights), 2) if weights else 0
-            }
-        })
+        return jsonify(weight_section(current_user.id, exercise_name, bucket, max_points))
         
     except Exception as e:
         print(f"Error in get_weight_progression: {str(e)}")  # Debug logging
@@ -502,13 +457,47 @@ def get_weight_progression(exercise_name):
         }), 500
 
 
+# PUBLIC_INTERFACE
+@views.route("/api/progress/personal-records", methods=["GET"])
+@login_required
+@read_only
+@cached_progress
+def get_personal_records():
+    """
+    Get the current user's personal record for every exercise they have logged.
+    Records are maintained on write, so this is a single indexed lookup.
+    
+    Returns:
+        JSON response with one record per exercise, heaviest first
+    """
+    try:
+        records = (PersonalRecord.query
+                   .options(db.joinedload(PersonalRecord.exercise))
+                   .filter_by(user_id=current_user.id)
+                   .all())
+        records.sort(key=lambda record: (-(record.weight or 0), -(record.reps or 0)))
+        
+        return jsonify({
+            "records": [serialize_personal_record(record) for record in records],
+            "total_records": len(records)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "error": f"Failed to retrieve personal records: {str(e)}"
+        }), 500
+
+
 # PUBLIC_INTERFACE
 @views.route("/api/progress/volume-trends/<int:workout_id>", methods=["GET"])
 @login_required
+@read_only
+@cached_progress
 def get_volume_trends(workout_id):
     """
-    Get workout volume trends for a specific workout over time.
-    Volume is calculated as total weight lifted (sets × reps × weight).
+    Get workout volume trends for a specific workout over time, one point per day.
+    Volume is calculated as total weight lifted (sets × reps × weight) and is read
+    from the daily rollup table rather than raw exercise logs.
     
     Args:
         workout_id (int): ID of the workout to analyze
@@ -522,51 +511,7 @@ def get_volume_trends(workout_id):
         if not workout:
             return jsonify({"error": "Workout not found or access denied"}), 404
         
-        # Get all sessions for this workout
-        sessions = (WorkoutSession.query
-                   .filter_by(user_id=current_user.id, workout_id=workout_id)
-                   .order_by(WorkoutSession.timestamp.asc())
-                   .all())
-        
-        if not sessions:
-            return jsonify({
-                "workout_id": workout_id,
-                "workout_name": workout.name,
-                "data_points": [],
-                "message": "No workout sessions found"
-            })
-        
-        # Calculate volume for each session
-        data_points = []
-        for session in sessions:
-            total_volume = 0
-            total_sets = 0
-            
-            for log in session.exercise_logs:
-                if log.weight and log.reps:
-                    # Calculate volume for this set (weight × reps)
-                    set_volume = log.weight * log.reps
-                    total_volume += set_volume
-                    total_sets += 1
-            
-            data_points.append({
-                "date": session.timestamp.date().isoformat(),
-                "volume": round(total_volume, 2),
-                "total_sets": total_sets,
-                "session_id": session.id,
-                "formatted_date": session.timestamp.strftime("%b %d, %Y")
-            })
-        
-        return jsonify({
-            "workout_id": workout_id,
-            "workout_name": workout.name,
-            "data_points": data_points,
-            "total_sessions": len(data_points),
-            "volume_range": {
-                "min": min(point["volume"] for point in data_points) if data_points else 0,
-                "max": max(point["volume"] for point in data_points) if data_points else 0
-            }
-        })
+        return jsonify(volume_section(current_user.id, workout))
         
     except Exception as e:
         return jsonify({
@@ -578,10 +523,13 @@ def get_volume_trends(workout_id):
 # PUBLIC_INTERFACE
 @views.route("/api/progress/performance-summary", methods=["GET"])
 @login_required
+@read_only
+@cached_progress
 def get_performance_summary():
     """
     Get overall performance summary including key metrics across all workouts.
-    Provides aggregate statistics suitable for dashboard display.
+    Provides aggregate statistics suitable for dashboard display. Common windows
+    are precomputed by the background worker after each logged workout.
     
     Returns:
         JSON response with performance summary metrics
@@ -589,70 +537,18 @@ def get_performance_summary():
     try:
         # Get date range filter from query parameters
         days = request.args.get('days', 30, type=int)
-        start_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get all sessions within the date range
-        sessions = (WorkoutSession.query
-                   .filter_by(user_id=current_user.id)
-                   .filter(WorkoutSession.timestamp >= start_date)
-                   .all())
+        # Serve the snapshot the background worker stored after the last write,
+        # computing synchronously only when it is missing or stale
+        summary = load_snapshot(current_user.id, PERFORMANCE_SUMMARY, days)
+        source = "snapshot"
+        if summary is None:
+            summary = compute_performance_summary(current_user.id, days)
+            source = "computed"
         
-        if not sessions:
-            return jsonify({
-                "period_days": days,
-                "total_sessions": 0,
-                "message": "No workout sessions found in the specified period"
-            })
-        
-        # Calculate summary metrics
-        total_sessions = len(sessions)
-        total_exercises = sum(len(session.exercise_logs) for session in sessions)
-        total_volume = 0
-        exercise_frequency = defaultdict(int)
-        workout_frequency = defaultdict(int)
-        
-        for session in sessions:
-            # Track workout frequency
-            if session.workout and session.workout.name:
-                workout_frequency[session.workout.name] += 1
-            
-            for log in session.exercise_logs:
-                # Track exercise frequency
-                exercise_frequency[log.exercise_name] += 1
-                
-                # Calculate total volume
-                if log.weight and log.reps:
-                    total_volume += log.weight * log.reps
-        
-        # Find most frequent exercises and workouts
-        top_exercises = sorted(exercise_frequency.items(), key=lambda x: x[1], reverse=True)[:5]
-        top_workouts = sorted(workout_frequency.items(), key=lambda x: x[1], reverse=True)[:5]
-        
-        # Calculate averages
-        avg_exercises_per_session = round(total_exercises / total_sessions, 1) if total_sessions > 0 else 0
-        avg_volume_per_session = round(total_volume / total_sessions, 2) if total_sessions > 0 else 0
-        
-        # Calculate weekly frequency
-        weeks_in_period = max(1, days / 7)
-        sessions_per_week = round(total_sessions / weeks_in_period, 1)
-        
-        return jsonify({
-            "period_days": days,
-            "start_date": start_date.date().isoformat(),
-            "end_date": datetime.utcnow().date().isoformat(),
-            "total_sessions": total_sessions,
-            "total_exercises": total_exercises,
-            "total_volume": round(total_volume, 2),
-            "averages": {
-                "exercises_per_session": avg_exercises_per_session,
-                "volume_per_session": avg_volume_per_session,
-                "sessions_per_week": sessions_per_week
-            },
-            "top_exercises": [{"name": name, "frequency": freq} for name, freq in top_exercises],
-            "top_workouts": [{"name": name, "frequency": freq} for name, freq in top_workouts],
-            "unique_exercises": len(exercise_frequency),
-            "unique_workouts": len(workout_frequency)
-        })
+        response = jsonify(summary)
+        response.headers["X-Summary-Source"] = source
+        return response
         
     except Exception as e:
         return jsonify({
@@ -662,7 +558,8 @@ def get_performance_summary():
 
 # PUBLIC_INTERFACE  
 @views.route("/api/debug/weight-data", methods=["GET"])
-@login_required  
+@login_required
+@read_only
 def debug_weight_data():
     """
     Debug endpoint to show available weight data for troubleshooting.
@@ -727,7 +624,8 @@ def debug_weight_data():
 
 # PUBLIC_INTERFACE  
 @views.route("/api/debug/performance-metrics", methods=["GET"])
-@login_required  
+@login_required
+@read_only
 def debug_performance_metrics():
     """
     Debug endpoint to show performance metrics calculation breakdown for troubleshooting.
@@ -736,46 +634,35 @@ def debug_performance_metrics():
         days = request.args.get('days', 30, type=int)
         start_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get raw session data
-        all_sessions = (WorkoutSession.query
-                       .filter_by(user_id=current_user.id)
-                       .filter(WorkoutSession.timestamp >= start_date)
-                       .order_by(WorkoutSession.timestamp.desc())
-                       .all())
+        # Get raw session data, plus per-session set counts and volume aggregated in SQL
+        all_sessions = load_sessions(current_user.id, since=start_date)
+        totals = session_totals(current_user.id, since=start_date)
         
-        # Analyze sessions for duplicates
+        # Analyze sessions for duplicates in one sweep per workout
+        duplicates = find_duplicate_sessions(all_sessions)
         session_analysis = []
         duplicate_pairs = []
-        session_threshold = timedelta(minutes=5)
         
-        for i, session in enumerate(all_sessions):
-            session_info = {
+        for session in all_sessions:
+            match = duplicates.matches.get(session.id)
+            session_analysis.append({
                 'id': session.id,
                 'workout_id': session.workout_id,
-                'workout_name': session.workout.name if session.workout else 'Unknown',
+                'workout_name': session.workout_name or 'Unknown',
                 'timestamp': session.timestamp.isoformat(),
-                'exercise_count': len(session.exercise_logs),
-                'total_volume': sum(log.weight * log.reps for log in session.exercise_logs 
-                                  if log.weight and log.reps),
-                'is_potential_duplicate': False,
-                'duplicate_of': None
-            }
-            
-            # Check for potential duplicates
-            for j, other_session in enumerate(all_sessions[:i]):
-                if (session.workout_id == other_session.workout_id and 
-                    abs((session.timestamp - other_session.timestamp).total_seconds()) < session_threshold.total_seconds()):
-                    session_info['is_potential_duplicate'] = True
-                    session_info['duplicate_of'] = other_session.id
-                    duplicate_pairs.append({
-                        'session1_id': other_session.id,
-                        'session2_id': session.id,
-                        'time_diff_seconds': abs((session.timestamp - other_session.timestamp).total_seconds()),
-                        'same_workout': session.workout_id == other_session.workout_id
-                    })
-                    break
-            
-            session_analysis.append(session_info)
+                'exercise_count': totals.get(session.id, (0, 0))[0],
+                'total_volume': totals.get(session.id, (0, 0))[1],
+                'is_potential_duplicate': match is not None,
+                'duplicate_of': match[0].id if match else None
+            })
+            if match:
+                other_session, time_diff = match
+                duplicate_pairs.append({
+                    'session1_id': other_session.id,
+                    'session2_id': session.id,
+                    'time_diff_seconds': time_diff,
+                    'same_workout': session.workout_id == other_session.workout_id
+                })
         
         # Get the corrected performance summary
         performance_summary = get_performance_summary()
@@ -813,6 +700,8 @@ def debug_performance_metrics():
 # PUBLIC_INTERFACE
 @views.route("/api/progress/exercise-frequency", methods=["GET"])
 @login_required
+@read_only
+@cached_progress
 def get_exercise_frequency():
     """
     Get exercise frequency data showing how often each exercise is performed.
@@ -824,90 +713,425 @@ def get_exercise_frequency():
     try:
         # Get date range filter from query parameters
         days = request.args.get('days', 90, type=int)  # Default to 90 days
-        start_date = datetime.utcnow() - timedelta(days=days)
         
-        # Get exercise frequency data
-        frequency_data = (db.session.query(
-                ExerciseLog.exercise_name,
-                func.count(ExerciseLog.id).label('frequency'),
-                func.count(func.distinct(WorkoutSession.id)).label('sessions'),
-                func.avg(ExerciseLog.weight).label('avg_weight'),
-                func.max(ExerciseLog.weight).label('max_weight')
-            )
-            .join(WorkoutSession)
-            .filter(WorkoutSession.user_id == current_user.id)
-            .filter(WorkoutSession.timestamp >= start_date)
-            .group_by(ExerciseLog.exercise_name)
-            .order_by(desc('frequency'))
-            .all())
+        data = load_dashboard_data(current_user.id, window_start_day(days))
+        return jsonify(frequency_section(data, days))
         
-        if not frequency_data:
-            return jsonify({
-                "period_days": days,
-                "exercises": [],
-                "message": "No exercise data found in the specified period"
-            })
+    except Exception as e:
+        return jsonify({
+            "error": f"Failed to retrieve exercise frequency: {str(e)}"
+        }), 500
+
+
+# PUBLIC_INTERFACE
+@views.route("/api/progress/dashboard", methods=["GET"])
+@login_required
+@read_only
+@cached_progress
+def get_progress_dashboard():
+    """
+    Get the datasets of several progress charts in one response. Summary and
+    frequency are computed from a single load of the user's daily rollups and
+    session counts for the window, skipped when neither is requested; volume and
+    weight cover all time, as on their own endpoints.
+    Each section has the shape of the matching /api/progress/* endpoint.
+    
+    Query parameters:
+        days (int): Length of the window ending today (default 30)
+        summary_days (int): Window of the summary section, if different (default days)
+        sections (str): Comma-separated subset of summary, frequency, volume and weight;
+            defaults to summary and frequency, plus volume and weight when their
+            arguments are given
+        workout_id (int): Workout for the volume section
+        exercise (str): Exercise for the weight section
+        bucket (str): "day" (default), "week" or "month" for the weight section
+        max_points (int): Downsample the weight section to at most this many points
         
-        # Format data for chart consumption
-        exercises = []
-        total_frequency = sum(row.frequency for row in frequency_data)
+    Returns:
+        JSON response with one key per requested section
+    """
+    try:
+        days = request.args.get("days", 30, type=int)
+        summary_days = request.args.get("summary_days", days, type=int)
+        workout_id = request.args.get("workout_id", type=int)
+        exercise_name = (request.args.get("exercise") or "").strip()
+        bucket = request.args.get("bucket", "day")
+        max_points = request.args.get("max_points", type=int)
+        
+        if request.args.get("sections"):
+            sections = [name.strip() for name in request.args["sections"].split(",") if name.strip()]
+        else:
+            sections = ["summary", "frequency"]
+            if workout_id is not None:
+                sections.append("volume")
+            if exercise_name:
+                sections.append("weight")
+        
+        unknown = [name for name in sections if name not in DASHBOARD_SECTIONS]
+        if unknown:
+            return jsonify({"error": f"Unknown sections: {', '.join(unknown)}",
+                            "available_sections": list(DASHBOARD_SECTIONS)}), 400
+        if days < 1 or summary_days < 1:
+            return jsonify({"error": "days and summary_days must be at least 1"}), 400
+        if "volume" in sections and workout_id is None:
+            return jsonify({"error": "The volume section requires workout_id"}), 400
+        if "weight" in sections and not exercise_name:
+            return jsonify({"error": "The weight section requires exercise"}), 400
+        if bucket not in WEIGHT_PROGRESSION_BUCKETS:
+            return jsonify({"error": f"bucket must be one of {', '.join(WEIGHT_PROGRESSION_BUCKETS)}"}), 400
+        if max_points is not None and max_points < 3:
+            return jsonify({"error": "max_points must be at least 3"}), 400
+        
+        workout = None
+        if "volume" in sections:
+            workout = Workout.query.filter_by(id=workout_id, user_id=current_user.id).first()
+            if not workout:
+                return jsonify({"error": "Workout not found or access denied"}), 404
         
-        for row in frequency_data:
-            percentage = round((row.frequency / total_frequency) * 100, 1) if total_frequency > 0 else 0
-            
-            exercises.append({
-                "exercise_name": row.exercise_name,
-                "frequency": row.frequency,
-                "sessions": row.sessions,
-                "percentage": percentage,
-                "avg_weight": round(row.avg_weight, 2) if row.avg_weight else None,
-                "max_weight": round(row.max_weight, 2) if row.max_weight else None
-            })
+        start_day = window_start_day(days)
+        summary_start_day = window_start_day(summary_days)
+        data = None
+        if "summary" in sections or "frequency" in sections:
+            data = load_dashboard_data(current_user.id, min(start_day, summary_start_day))
         
-        return jsonify({
+        response = {
             "period_days": days,
-            "start_date": start_date.date().isoformat(),
+            "start_date": start_day.isoformat(),
             "end_date": datetime.utcnow().date().isoformat(),
-            "exercises": exercises,
-            "total_exercises": len(exercises),
-            "total_frequency": total_frequency
+            "sections": [name for name in DASHBOARD_SECTIONS if name in sections],
+        }
+        if "summary" in sections:
+            response["summary"] = summary_section(data.since(summary_start_day), summary_days)
+        if "frequency" in sections:
+            response["frequency"] = frequency_section(data.since(start_day), days)
+        if "volume" in sections:
+            response["volume"] = volume_section(current_user.id, workout)
+        if "weight" in sections:
+            response["weight"] = weight_section(current_user.id, exercise_name, bucket, max_points)
+        
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({
+            "error": f"Failed to retrieve progress dashboard: {str(e)}"
+        }), 500
+
+
+# PUBLIC_INTERFACE
+@views.route("/api/progress/calendar", methods=["GET"])
+@login_required
+@read_only
+@cached_progress
+def get_progress_calendar():
+    """
+    Get volume, set count, session count and max weight per calendar day, ISO week,
+    month or year in the user's time zone, aggregated in SQL in one query.
+    
+    Query parameters:
+        bucket (str): "day", "week" (default), "month" or "year"
+        tz (str): IANA time zone name, e.g. "Europe/Berlin" (default "UTC")
+        since (str): First local day as YYYY-MM-DD, moved back to the start of its
+            bucket (default 52 weeks before until)
+        until (str): Last local day as YYYY-MM-DD (default today in tz)
+        
+    Both days must lie between CALENDAR_EARLIEST and CALENDAR_LATEST, at most
+    CALENDAR_MAX_DAYS and CALENDAR_MAX_BUCKETS buckets apart.
+        
+    Returns:
+        JSON response with one entry per bucket, oldest first, including empty buckets
+    """
+    try:
+        bucket = request.args.get("bucket", "week")
+        if bucket not in CALENDAR_BUCKETS:
+            return jsonify({"error": f"bucket must be one of {', '.join(CALENDAR_BUCKETS)}"}), 400
+        try:
+            tz = ZoneInfo(request.args.get("tz", "UTC"))
+        except (ZoneInfoNotFoundError, ValueError):
+            return jsonify({"error": f"Unknown time zone: {request.args.get('tz')}"}), 400
+        try:
+            until = (datetime.fromisoformat(request.args["until"]).date() if request.args.get("until")
+                     else datetime.now(tz).date())
+            since = (datetime.fromisoformat(request.args["since"]).date() if request.args.get("since")
+                     else until - timedelta(weeks=52) + timedelta(days=1))
+        except ValueError:
+            return jsonify({"error": "since and until must be dates in YYYY-MM-DD format"}), 400
+        if since > until:
+            return jsonify({"error": "since must not be after until"}), 400
+        if since < CALENDAR_EARLIEST or until > CALENDAR_LATEST:
+            return jsonify({"error": f"since and until must be between {CALENDAR_EARLIEST.isoformat()} "
+                                     f"and {CALENDAR_LATEST.isoformat()}"}), 400
+        
+        span_days = (until - bucket_start(since, bucket)).days + 1
+        if span_days > CALENDAR_MAX_DAYS:
+            return jsonify({"error": f"At most {CALENDAR_MAX_DAYS} days per request"}), 400
+        max_days = {"day": 1, "week": 7, "month": 31, "year": 366}[bucket] * CALENDAR_MAX_BUCKETS
+        if span_days > max_days:
+            return jsonify({"error": f"At most {CALENDAR_MAX_BUCKETS} {bucket} buckets per request"}), 400
+        
+        buckets = calendar_totals(current_user.id, bucket, tz, since, until)
+        
+        return jsonify({
+            "bucket": bucket,
+            "timezone": tz.key,
+            "since": buckets[0]["start"],
+            "until": until.isoformat(),
+            "buckets": buckets,
+            "totals": {
+                "sessions": sum(entry["sessions"] for entry in buckets),
+                "sets": sum(entry["sets"] for entry in buckets),
+                "volume": round(sum(entry["volume"] for entry in buckets), 2)
+            }
         })
         
     except Exception as e:
         return jsonify({
-            "error": f"Failed to retrieve exercise frequency: {str(e)}"
+            "error": f"Failed to retrieve progress calendar: {str(e)}"
+        }), 500
+
+
+# PUBLIC_INTERFACE
+@views.route("/api/exercises/search", methods=["GET"])
+@login_required
+@read_only
+def search_exercise_names():
+    """
+    Autocomplete and fuzzy lookup over the current user's exercise names.
+    Prefix matches come first, then names sharing enough trigrams with the query.
+    
+    Query parameters:
+        q (str): Name or fragment as typed
+        limit (int): Maximum number of results (default 10, at most 50)
+        
+    Returns:
+        JSON response with matching exercises and their set counts
+    """
+    try:
+        query = request.args.get("q", "")
+        limit = min(max(request.args.get("limit", SEARCH_DEFAULT_LIMIT, type=int), 1), 50)
+        
+        results = search_exercises(current_user.id, query, limit=limit)
+        set_counts = {exercise_id: set_count
+                      for exercise_id, _, set_count in exercise_set_counts(
+                          current_user.id, exercise_ids=[result["id"] for result in results])}
+        for result in results:
+            result["set_count"] = set_counts.get(result["id"], 0)
+        
+        return jsonify({
+            "query": query,
+            "results": results
+        })
+        
+    except Exception as e:
+        return jsonify({
+            "error": f"Failed to search exercises: {str(e)}"
         }), 500
 
 
+def _encode_history_cursor(timestamp, session_id):
+    """
+    Encode the position of the last session on a page as an opaque cursor.
+    
+    Args:
+        timestamp (datetime): Timestamp of the last session returned
+        session_id (int): ID of the last session returned
+        
+    Returns:
+        str: URL-safe cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_history_cursor(cursor):
+    """
+    Decode a cursor produced by _encode_history_cursor.
+    
+    Args:
+        cursor (str): Cursor from a previous page
+        
+    Returns:
+        tuple: (timestamp, session_id)
+        
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, session_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(session_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _parse_history_bound(value, end_of_day=False):
+    """
+    Parse a since/until query parameter given as an ISO date or datetime.
+    A bare date used as an upper bound covers that whole day.
+    
+    Args:
+        value (str): ISO 8601 date or datetime
+        end_of_day (bool): Whether a bare date should map to the next midnight
+        
+    Returns:
+        datetime: Parsed bound
+        
+    Raises:
+        ValueError: If the value is not a valid ISO date or datetime
+    """
+    bound = datetime.fromisoformat(value)
+    if end_of_day and len(value) == 10:
+        bound += timedelta(days=1)
+    return bound
+
+
 # PUBLIC_INTERFACE
 @views.route("/api/workout/history", methods=["GET"])
 @login_required
+@conditional_on_data
 def get_workout_history():
     """
-    Retrieve all workout sessions for the current user, including all exercise logs.
-    Returns JSON with session datetime, workout name, and exercise details for each session.
+    Retrieve the current user's workout sessions, most recent first, one page at a time.
+    Returns a JSON list of sessions with datetime, workout name and exercise details.
+    
+    Query parameters:
+        limit (int): Page size, default 50, at most 200
+        cursor (str): Value of the X-Next-Cursor header from the previous page
+        since (str): ISO date/datetime, only sessions at or after it
+        until (str): ISO date/datetime, only sessions before it (a bare date includes that day)
+        workout_id (int): Only sessions of this workout
+        fields (str): Comma-separated subset of "session,exercises"; "session" skips the logs
+        
+    Pages are keyed on (timestamp, id), so each page is one indexed range read.
+    When more sessions remain, the response carries an X-Next-Cursor header.
     """
-    sessions = WorkoutSession.query.filter_by(user_id=current_user.id).order_by(WorkoutSession.timestamp.desc()).all()
+    limit = min(max(request.args.get("limit", HISTORY_PAGE_SIZE, type=int), 1), HISTORY_MAX_PAGE_SIZE)
+    fields = set(filter(None, request.args.get("fields", "session,exercises").split(",")))
+    if not fields or not fields <= HISTORY_FIELDS:
+        return jsonify({"error": f"fields must be a subset of {', '.join(sorted(HISTORY_FIELDS))}"}), 400
+    
+    filters = {}
+    try:
+        if request.args.get("workout_id"):
+            filters["workout_id"] = int(request.args["workout_id"])
+        if request.args.get("since"):
+            filters["since"] = _parse_history_bound(request.args["since"])
+        if request.args.get("until"):
+            filters["until"] = _parse_history_bound(request.args["until"], end_of_day=True)
+        if request.args.get("cursor"):
+            filters["before"] = _decode_history_cursor(request.args["cursor"])
+    except ValueError as e:
+        return jsonify({"error": f"Invalid query parameter: {str(e)}"}), 400
+    
+    # Fetch one extra row to know whether another page follows
+    rows = load_sessions(current_user.id, limit=limit + 1, **filters)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    logs_by_session = load_logs([row.id for row in rows]) if "exercises" in fields else {}
+    
     out = []
-    for s in sessions:
-        exercises = []
-        for log in s.exercise_logs:
-            exercises.append({
+    for row in rows:
+        entry = {
+            "session_id": row.id,
+            "timestamp": row.timestamp.isoformat(),
+            "workout_id": row.workout_id,
+            "workout_name": row.workout_name or "",
+        }
+        if "exercises" in fields:
+            entry["exercises"] = [{
                 "exercise_name": log.exercise_name,
                 "set_number": log.set_number,
                 "reps": log.reps,
                 "weight": log.weight,
                 "details": log.details,
                 "include_details": log.include_details,
-            })
-        out.append({
-            "session_id": s.id,
-            "timestamp": s.timestamp.isoformat(),
-            "workout_id": s.workout_id,
-            "workout_name": s.workout.name if s.workout else "",
-            "exercises": exercises,
-        })
-    return jsonify(out)
+            } for log in logs_by_session[row.id]]
+        out.append(entry)
+    
+    response = jsonify(out)
+    if has_more:
+        response.headers["X-Next-Cursor"] = _encode_history_cursor(rows[-1].timestamp, rows[-1].id)
+    return response
+
+
+def _export_ndjson(sessions):
+    """Render streamed sessions as one JSON document per line."""
+    for session in sessions:
+        yield json.dumps({
+            "session_id": session.id,
+            "timestamp": session.timestamp.isoformat(),
+            "workout_id": session.workout_id,
+            "workout_name": session.workout_name or "",
+            "exercises": [{
+                "exercise_name": log.exercise_name,
+                "set_number": log.set_number,
+                "reps": log.reps,
+                "weight": log.weight,
+                "details": log.details,
+                "include_details": log.include_details,
+            } for log in session.logs],
+        }) + "\n"
+
+
+def _export_csv(sessions):
+    """Render streamed sessions as CSV, one row per logged set."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def flush():
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+    
+    writer.writerow(HISTORY_EXPORT_CSV_COLUMNS)
+    yield flush()
+    for session in sessions:
+        session_columns = [session.id, session.timestamp.isoformat(), session.workout_id, session.workout_name or ""]
+        # Sessions without logs still get a row so they survive a round trip
+        for log in session.logs or [None]:
+            if log is None:
+                writer.writerow(session_columns + [""] * 6)
+            else:
+                writer.writerow(session_columns + [
+                    log.exercise_name,
+                    "" if log.set_number is None else log.set_number,
+                    "" if log.reps is None else log.reps,
+                    "" if log.weight is None else log.weight,
+                    log.details or "",
+                    "" if log.include_details is None else int(log.include_details),
+                ])
+        yield flush()
+
+
+# PUBLIC_INTERFACE
+@views.route("/api/workout/history/export", methods=["GET"])
+@login_required
+def export_workout_history():
+    """
+    Stream the current user's complete workout history, oldest session first.
+    Rows are read through a server-side cursor and written out as they arrive,
+    so memory use stays flat and the first byte is sent immediately.
+    
+    Query parameters:
+        format (str): "ndjson" (default), one session per line, or "csv", one set per row
+        
+    Returns:
+        Streaming response with a Content-Disposition attachment header
+    """
+    export_format = request.args.get("format", "ndjson")
+    if export_format not in HISTORY_EXPORT_FORMATS:
+        return jsonify({"error": f"format must be one of {', '.join(sorted(HISTORY_EXPORT_FORMATS))}"}), 400
+    
+    sessions = iter_sessions_with_logs(current_user.id)
+    if export_format == "csv":
+        body, mimetype = _export_csv(sessions), "text/csv"
+    else:
+        body, mimetype = _export_ndjson(sessions), "application/x-ndjson"
+    
+    response = Response(stream_with_context(body), mimetype=mimetype)
+    response.headers["Content-Disposition"] = f"attachment; filename=workout-history.{export_format}"
+    return response
 
 
 # PUBLIC_INTERFACE
@@ -932,10 +1156,14 @@ def clear_workout_history():
         
         # Delete all workout sessions for the current user
         # This will cascade to delete all associated exercise logs
+        delete_user_records(current_user.id)
+        delete_user_rollups(current_user.id)
+        PendingTopSet.query.filter_by(user_id=current_user.id).delete()
         deleted_count = WorkoutSession.query.filter_by(user_id=current_user.id).delete()
         
         # Only commit if there were actually records to delete
         if deleted_count > 0:
+            bump_data_version(current_user.id)
             db.session.commit()
         
         return jsonify({
@@ -982,11 +1210,16 @@ def log_workout_session():
     if not workout_id:
         return jsonify({"error": "Missing workout_id"}), 400
     
+    idempotency_key, key_error = read_idempotency_key()
+    if key_error:
+        return jsonify({"error": key_error}), 400
+    
     # Use unified workout completion function
     success, result, status_code = _create_workout_session(
         workout_id=workout_id,
         exercises_data=exercises,
-        user_id=current_user.id
+        user_id=current_user.id,
+        idempotency_key=idempotency_key
     )
     
     if success:
@@ -995,6 +1228,195 @@ def log_workout_session():
         return jsonify({"error": result}), status_code
 
 
+def _parse_client_timestamp(value):
+    """
+    Parse the time a client recorded a queued session. Offsets are converted
+    to UTC; a timestamp without one is taken as UTC.
+    
+    Args:
+        value (str|None): ISO 8601 datetime, or None for the time of the sync
+        
+    Returns:
+        datetime: Naive UTC timestamp
+        
+    Raises:
+        ValueError: If the value is not a valid ISO datetime or lies in the future
+    """
+    if value is None:
+        return datetime.utcnow()
+    timestamp = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    if timestamp > datetime.utcnow() + SYNC_CLOCK_SKEW:
+        raise ValueError("timestamp is in the future")
+    return timestamp
+
+
+def _parse_sync_item(item):
+    """
+    Validate one queued session of a sync batch.
+    
+    Args:
+        item (dict): {"client_id", "workout_id", "timestamp", "exercises"}
+        
+    Returns:
+        tuple: (parsed: dict|None, error: str|None)
+    """
+    if not isinstance(item, dict):
+        return None, "Session must be an object"
+    client_id = item.get("client_id")
+    if not isinstance(client_id, str) or not client_id.strip() or len(client_id.strip()) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        return None, f"client_id must be 1 to {IDEMPOTENCY_KEY_MAX_LENGTH} characters"
+    workout_id = item.get("workout_id")
+    if not isinstance(workout_id, int) or isinstance(workout_id, bool):
+        return None, "Missing workout_id"
+    try:
+        timestamp = _parse_client_timestamp(item.get("timestamp"))
+    except (ValueError, TypeError):
+        return None, "Invalid timestamp; use an ISO 8601 datetime not in the future"
+    exercises = item.get("exercises")
+    if not exercises or not isinstance(exercises, list):
+        return None, "No exercises provided"
+    rows, error = _parse_exercise_log_rows(exercises)
+    if error:
+        return None, error
+    return {"client_id": client_id.strip(), "workout_id": workout_id, "timestamp": timestamp, "rows": rows}, None
+
+
+def _sync_workout_sessions(user_id, items):
+    """
+    Record a batch of queued sessions in one transaction. Workout ownership is
+    checked with one query for the whole batch, and each client_id doubles as
+    the session's idempotency key, so a replayed batch reports duplicates
+    instead of logging twice. Invalid items are reported and skipped.
+    
+    Args:
+        user_id (int): ID of the user
+        items (list): Queued sessions as sent by the client
+        
+    Returns:
+        list: One result dict per item, in order, with "client_id" and a "status"
+            of "created", "duplicate" or "error"
+    """
+    parsed = [_parse_sync_item(item) for item in items]
+    client_ids = [entry["client_id"] for entry, _ in parsed if entry]
+    stored = find_idempotent_responses(user_id, client_ids)
+    workout_ids = {entry["workout_id"] for entry, _ in parsed if entry}
+    workout_names = dict(db.session.query(Workout.id, Workout.name)
+                         .filter(Workout.user_id == user_id)
+                         .filter(Workout.id.in_(workout_ids))
+                         .all()) if workout_ids else {}
+    
+    results, pending, created = [], [], {}
+    for (entry, error), item in zip(parsed, items):
+        if error:
+            client_id = item.get("client_id") if isinstance(item, dict) else None
+            results.append({"client_id": client_id, "status": "error", "error": error})
+            continue
+        client_id = entry["client_id"]
+        if client_id in stored:
+            body = stored[client_id][1]
+            if "session_id" in body:
+                results.append({"client_id": client_id, "status": "duplicate", **body})
+            else:
+                results.append({"client_id": client_id, "status": "error",
+                                "error": "client_id was already used for a different request"})
+        elif client_id in created:
+            # Repeated within the batch; completed from the first occurrence below
+            results.append({"client_id": client_id, "status": "duplicate"})
+        elif entry["workout_id"] not in workout_names:
+            results.append({"client_id": client_id, "status": "error",
+                            "error": "Workout not found or access denied"})
+        else:
+            created[client_id] = {"client_id": client_id, "status": "created"}
+            results.append(created[client_id])
+            pending.append(entry)
+    if not pending:
+        return results
+    
+    sessions = [WorkoutSession(user_id=user_id, workout_id=entry["workout_id"], timestamp=entry["timestamp"])
+                for entry in pending]
+    db.session.add_all(sessions)
+    db.session.flush()
+    
+    # One catalog lookup and one executemany INSERT for the whole batch
+    exercise_ids = resolve_exercise_ids(
+        user_id, [row["exercise_name"] for entry in pending for row in entry["rows"]])
+    log_rows = []
+    for entry, session in zip(pending, sessions):
+        for row in entry["rows"]:
+            log_rows.append({**row, "session_id": session.id, "exercise_id": exercise_ids[row["exercise_name"]]})
+    db.session.execute(insert(ExerciseLog), log_rows)
+    sync_derived_tables(user_id, sessions)
+    
+    bodies = {}
+    for entry, session in zip(pending, sessions):
+        bodies[entry["client_id"]] = {
+            "session_id": session.id,
+            "timestamp": session.timestamp.isoformat(),
+            "workout_id": session.workout_id,
+            "workout_name": workout_names[session.workout_id],
+            "exercises_logged": len(entry["rows"]),
+        }
+    # A concurrent replay of the same batch fails here on the unique index
+    record_idempotent_responses(user_id, {client_id: (body, 201) for client_id, body in bodies.items()})
+    db.session.commit()
+    
+    for result in results:
+        if result["status"] != "error" and "session_id" not in result:
+            result.update(bodies[result["client_id"]])
+    return results
+
+
+# PUBLIC_INTERFACE
+@views.route("/api/workout/history/sync", methods=["POST"])
+@login_required
+def sync_workout_sessions():
+    """
+    Record sessions queued by a client while offline, in one request and one
+    transaction. Expects JSON body:
+    {
+        "sessions": [
+            {
+                "client_id": str (unique per queued session; retries reuse it),
+                "workout_id": int,
+                "timestamp": str (ISO 8601, optional; defaults to now),
+                "exercises": [ ... as for POST /api/workout/history ... ]
+            },
+            ...
+        ]
+    }
+    Returns: JSON with one result per session, in order, and counts per status.
+    A session already synced, or logged with its client_id as Idempotency-Key,
+    is reported as "duplicate" with its original session data.
+    """
+    data = request.get_json(silent=True) or {}
+    items = data.get("sessions")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "sessions must be a non-empty list"}), 400
+    if len(items) > SYNC_MAX_SESSIONS:
+        return jsonify({"error": f"At most {SYNC_MAX_SESSIONS} sessions per sync"}), 400
+    
+    try:
+        results = _sync_workout_sessions(current_user.id, items)
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Another sync with these client ids is in progress; retry"}), 409
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": f"Failed to sync sessions: {str(e)}"}), 500
+    
+    counts = defaultdict(int)
+    for result in results:
+        counts[result["status"]] += 1
+    return jsonify({
+        "results": results,
+        "created": counts["created"],
+        "duplicates": counts["duplicate"],
+        "errors": counts["error"],
+    }), 200
+
+
 @views.route("/")
 @login_required
 def home():
@@ -1114,82 +1536,37 @@ def workout():
     return render_template("workout.html", user=current_user)
 
 
-def _get_top_set_for_exercise(exercise_logs):
-    """
-    Find the top set for an exercise based on weight (heaviest), then reps if weight is tied.
-    
-    Args:
-        exercise_logs (list): List of ExerciseLog objects for the same exercise
-        
-    Returns:
-        ExerciseLog: The exercise log representing the top set
-    """
-    if not exercise_logs:
-        return None
-    
-    # Sort by weight (descending), then by reps (descending)
-    def sort_key(log):
-        weight = log.weight if log.weight is not None else 0
-        reps = log.reps if log.reps is not None else 0
-        return (-weight, -reps)
-    
-    return sorted(exercise_logs, key=sort_key)[0]
-
-
 def _group_sessions_with_top_sets(sessions):
     """
-    Group exercise logs by session and find top set for each exercise in each session.
-    Ensures exercises are properly associated with their parent workout session.
+    Shape sessions and their stored top sets for the history cards.
+    Top sets are maintained on write in SessionTopSet and bulk-loaded by
+    load_sessions, so no per-session queries are issued here.
     
     Args:
-        sessions (list): List of WorkoutSession objects
+        sessions (list): SessionRow objects loaded with top sets
         
     Returns:
         list: List of session dictionaries with top sets grouped by exercise
     """
     grouped_sessions = []
-    
     for session in sessions:
-        # Verify session has valid workout association
-        if not session.workout_id or not session.workout:
+        if not session.workout_id or session.workout_name is None:
             continue
-            
-        # Group exercise logs by exercise name within this specific session
-        exercises_dict = {}
-        for log in session.exercise_logs:
-            # Ensure log belongs to this session
-            if log.session_id != session.id:
-                continue
-                
-            if log.exercise_name not in exercises_dict:
-                exercises_dict[log.exercise_name] = []
-            exercises_dict[log.exercise_name].append(log)
-        
-        # Find top set for each exercise in this session
-        exercises_with_top_sets = []
-        for exercise_name, logs in exercises_dict.items():
-            top_set = _get_top_set_for_exercise(logs)
-            if top_set:
-                exercises_with_top_sets.append({
-                    'exercise_name': exercise_name,
-                    'top_set': top_set,
-                    'total_sets': len(logs),
-                    'session_id': session.id,  # Add session ID for verification
-                    'workout_id': session.workout_id  # Add workout ID for verification
-                })
         
-        # Calculate session statistics
-        total_weight = sum(
-            log.weight for log in session.exercise_logs 
-            if log.weight is not None and log.session_id == session.id
-        )
+        exercises_with_top_sets = [{
+            'exercise_name': top_set.exercise_name,
+            'top_set': top_set,
+            'total_sets': top_set.set_count,
+            'session_id': session.id,
+            'workout_id': session.workout_id
+        } for top_set in session.top_sets]
         
         grouped_sessions.append({
             'session': session,
             'exercises': exercises_with_top_sets,
-            'total_exercises': len(exercises_dict),
-            'total_weight': total_weight,
-            'total_sets': len([log for log in session.exercise_logs if log.session_id == session.id])
+            'total_exercises': len(exercises_with_top_sets),
+            'total_weight': sum(top_set.weight_sum for top_set in session.top_sets),
+            'total_sets': sum(top_set.set_count for top_set in session.top_sets)
         })
     
     return grouped_sessions
@@ -1208,13 +1585,13 @@ def history():
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return get_workout_history()
     
-    # Fetch all workout sessions for current user, most recent first
-    sessions = (
-        WorkoutSession.query
-        .filter_by(user_id=current_user.id)
-        .order_by(WorkoutSession.timestamp.desc())
-        .all()
-    )
+    # Handle legacy workout_id filter parameter for backward compatibility
+    selected_workout = None
+    if "workout_id" in request.args and request.args.get("workout_id", "").isdigit():
+        selected_workout = int(request.args["workout_id"])
+    
+    # Fetch the user's sessions, most recent first, with their top sets in one batch
+    sessions = load_sessions(current_user.id, workout_id=selected_workout, with_top_sets=True)
     
     # Collect all user's workouts for filter dropdown
     all_workouts = (
@@ -1222,13 +1599,6 @@ def history():
         .order_by(Workout.name.asc())
         .all()
     )
-    
-    # Handle legacy workout_id filter parameter for backward compatibility
-    selected_workout = None
-    if "workout_id" in request.args and request.args.get("workout_id", "").isdigit():
-        workout_filter = int(request.args["workout_id"])
-        sessions = [s for s in sessions if s.workout_id == workout_filter]
-        selected_workout = workout_filter
 
     # Group sessions with top sets for each exercise
     grouped_sessions = _group_sessions_with_top_sets(sessions)
@@ -1237,26 +1607,12 @@ def history():
     total_exercises = sum(session_data['total_exercises'] for session_data in grouped_sessions)
     unique_workout_count = len(set(session.workout_id for session in sessions if session.workout_id))
 
-    # Get unique exercise names across all sessions (normalized case)
-    unique_exercises = {}
-    for session in sessions:
-        for log in session.exercise_logs:
-            if log.exercise_name:
-                exercise_name = log.exercise_name.strip().upper()
-                if exercise_name not in unique_exercises:
-                    unique_exercises[exercise_name] = {
-                        'name': exercise_name,
-                        'display_name': log.exercise_name.strip(),
-                        'count': 1
-                    }
-                else:
-                    unique_exercises[exercise_name]['count'] += 1
-    
-    # Convert to sorted list by display name
-    unique_exercises = sorted(
-        unique_exercises.values(),
-        key=lambda x: x['display_name']
-    )
+    # Exercise filter options with their set counts, from the catalog and daily rollups
+    unique_exercises = [{
+        'name': display_name.upper(),
+        'display_name': display_name,
+        'count': set_count
+    } for _, display_name, set_count in exercise_set_counts(current_user.id, selected_workout)]
 
     return render_template(
         "history.html",
@@ -1316,33 +1672,19 @@ def new_workout():
                 if not new_category:
                     new_category = Category(name=new_category_name, description=new_category_description)
                     db.session.add(new_category)
-                    db.session.commit()
+                    db.session.flush()  # Get ID; committed with the workout
                 cat_id = new_category.id
             else:
                 # Use existing
                 cat_id = int(category_id)
 
-            # Add workout to database
-            new_workout = Workout(
-                user_id=current_user.id,
-                name=workout_name,
-                description=workout_description,
-                category_id=cat_id
-            )
-            db.session.add(new_workout)
+            # Add workout and exercises to database in one transaction
+            _create_workout_with_exercises(current_user.id, workout_name, workout_description, cat_id, [
+                {"name": exercise_names[i], "include_details": int(include_details[i])}
+                for i in range(len(exercise_names))
+            ])
             db.session.commit()
 
-            # Add exercises to database
-            for i in range(len(exercise_names)):
-                new_exercise = Exercise(
-                    name=exercise_names[i],
-                    include_details=int(include_details[i]),
-                    workout_id=new_workout.id,
-                    details="",
-                )
-                db.session.add(new_exercise)
-                db.session.commit()
-
             # Redirect user to home page
             return redirect(url_for("views.home"))
 
@@ -1350,6 +1692,58 @@ def new_workout():
     return render_template("new-workout.html", categories=categories)
 
 
+def _parse_edit_weight(value):
+    """
+    Parse the weight carried by an edit-workout row; "None" or blank is no weight.
+    
+    Args:
+        value (str|None): Submitted weight
+        
+    Returns:
+        float|None: Weight
+    """
+    if value is None or value == "None" or not value:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _apply_exercise_edits(workout, rows):
+    """
+    Bring a workout's exercises in line with the edit form. Rows are matched to
+    stored exercises by the id in their hidden exercise_id field; a stored
+    exercise missing from the form is deleted, a row without a known id is
+    added, and a matched exercise is only assigned the fields that differ, so
+    the flush updates just the rows that changed. Fields the form does not
+    carry, like sets and reps, are kept.
+    
+    Args:
+        workout (Workout): Workout being edited, owned by the current user
+        rows (list): Dicts with id, name, include_details, weight and details, in form order
+    """
+    stored = {str(exercise.id): exercise for exercise in workout.exercises}
+    kept = set()
+    for row in rows:
+        exercise = stored.get(row["id"]) if row["id"] not in kept else None
+        if exercise is None:
+            db.session.add(Exercise(name=row["name"], include_details=row["include_details"],
+                                    workout_id=workout.id, weight=row["weight"], details=row["details"]))
+            continue
+        kept.add(row["id"])
+        for field in ("name", "include_details", "weight", "details"):
+            current = getattr(exercise, field)
+            # The form renders missing details as an empty string
+            if field == "details":
+                current = current or ""
+            if current != row[field]:
+                setattr(exercise, field, row[field])
+    for exercise_id, exercise in stored.items():
+        if exercise_id not in kept:
+            db.session.delete(exercise)
+
+
 @views.route("/edit-workout", methods=["GET", "POST"])
 @login_required
 def edit_workout():
@@ -1377,6 +1771,7 @@ def edit_workout():
             workout_name = request.form.get("workout_name")
             workout_description = request.form.get("workout_description")
             exercise_names = request.form.getlist("exercise_name")
+            exercise_ids = request.form.getlist("exercise_id")
             include_details = request.form.getlist("include_details")
             weight_list = request.form.getlist("weight")
             details_list = request.form.getlist("details")
@@ -1404,7 +1799,7 @@ def edit_workout():
                     if not new_category:
                         new_category = Category(name=new_category_name, description=new_category_description)
                         db.session.add(new_category)
-                        db.session.commit()
+                        db.session.flush()  # Get ID; committed with the workout
                     cat_id = new_category.id
                 else:
                     # Use existing
@@ -1416,39 +1811,28 @@ def edit_workout():
                     flash("Workout not found or access denied.", category="error")
                     return redirect(url_for("views.home"))
 
-                # Delete existing exercises
-                for exercise in workout.exercises:
-                    db.session.delete(exercise)
-
                 # Update workout information
                 workout.name = workout_name
                 workout.description = workout_description
                 workout.category_id = cat_id
 
-                # Commit workout changes
-                db.session.commit()
-
-                # Add exercises to database
+                # Update, add and delete only the exercises that changed
+                rows = []
                 for i in range(len(exercise_names)):
-                    include_detail_val = 1 if str(i) in include_details else 0
-                    weight_val = None if weight_list[i] == "None" or not weight_list[i] else weight_list[i]
-                    
-                    try:
-                        if weight_val is not None:
-                            weight_val = float(weight_val)
-                    except (ValueError, TypeError):
-                        weight_val = None
-                    
-                    new_exercise = Exercise(
-                        name=exercise_names[i],
-                        include_details=include_detail_val,
-                        workout_id=workout.id,
-                        weight=weight_val,
-                        details=details_list[i] if i < len(details_list) else "",
-                    )
-                    db.session.add(new_exercise)
-
-                # Commit all changes
+                    rows.append({
+                        "id": exercise_ids[i] if i < len(exercise_ids) else "",
+                        "name": exercise_names[i],
+                        "include_details": 1 if str(i) in include_details else 0,
+                        "weight": _parse_edit_weight(weight_list[i] if i < len(weight_list) else None),
+                        "details": details_list[i] if i < len(details_list) else "",
+                    })
+                _apply_exercise_edits(workout, rows)
+
+                # Workout names and exercises feed the progress endpoints
+                if db.session.new or db.session.deleted or any(db.session.is_modified(obj) for obj in db.session.dirty):
+                    bump_data_version(current_user.id)
+
+                # Commit all changes in one transaction
                 db.session.commit()
                 flash("Workout updated successfully!", category="success")
 
@@ -1469,12 +1853,14 @@ def edit_workout():
                 flash("Workout not found or access denied.", category="error")
                 return redirect(url_for("views.home"))
 
-            # Delete exercises
+            # Delete exercises and top sets not yet logged
             for exercise in workout.exercises:
                 db.session.delete(exercise)
+            PendingTopSet.query.filter_by(workout_id=workout.id).delete()
 
             # Delete workout
             db.session.delete(workout)
+            bump_data_version(current_user.id)
 
             # Commit changes
             db.session.commit()
@@ -1499,6 +1885,58 @@ def edit_workout():
     return render_template("edit-workout.html", user=current_user, categories=categories)
 
 
+def _create_workout_with_exercises(user_id, name, description, category_id, exercises):
+    """
+    Add a workout and its exercises inside the caller's transaction: one INSERT
+    for the workout and one executemany INSERT for all exercises.
+    
+    Args:
+        user_id (int): ID of the owner
+        name (str): Workout name
+        description (str): Workout description
+        category_id (int|None): Category of the workout
+        exercises (list): Dicts with name and include_details, in order
+        
+    Returns:
+        Workout: The new workout, flushed
+    """
+    workout = Workout(user_id=user_id, name=name, description=description, category_id=category_id)
+    db.session.add(workout)
+    db.session.flush()  # Get ID without committing
+    if exercises:
+        db.session.execute(insert(Exercise), [
+            {"name": exercise["name"], "include_details": exercise["include_details"],
+             "workout_id": workout.id, "details": ""}
+            for exercise in exercises
+        ])
+    return workout
+
+
+def _copy_workout(workout, user_id):
+    """
+    Copy a workout and its exercises inside the caller's transaction. The
+    exercises are copied by one INSERT ... SELECT in the database, in their
+    original order, without loading them.
+    
+    Args:
+        workout (Workout): Workout to copy
+        user_id (int): ID of the owner of the copy
+        
+    Returns:
+        Workout: The copy, flushed
+    """
+    copy = Workout(name=f"{workout.name} (Copy)", description=workout.description, user_id=user_id)
+    db.session.add(copy)
+    db.session.flush()  # Get ID without committing
+    columns = ["name", "weight", "sets", "reps", "details", "include_details"]
+    source = (select(*[getattr(Exercise, column) for column in columns],
+                     literal(copy.id, type_=db.Integer).label("workout_id"))
+              .where(Exercise.workout_id == workout.id)
+              .order_by(Exercise.id))
+    db.session.execute(insert(Exercise).from_select(columns + ["workout_id"], source))
+    return copy
+
+
 # PUBLIC_INTERFACE
 @views.route("/duplicate-workout/<int:workout_id>", methods=["GET", "POST"])
 @login_required
@@ -1510,26 +1948,8 @@ def duplicate_workout(workout_id):
     Returns:
         Redirects to the 'views.home' route after duplicating the workout.
     """
-    workout = Workout.query.get_or_404(workout_id)
-    # Clone basic info
-    new_workout = Workout(
-        name=f"{workout.name} (Copy)",
-        description=workout.description,
-        user_id=current_user.id
-    )
-    db.session.add(new_workout)
-    db.session.commit()
-    # Optionally duplicate exercises (if using exercises table)
-    original_exercises = Exercise.query.filter_by(workout_id=workout.id).all()
-    for orig_ex in original_exercises:
-        new_exercise = Exercise(
-            name=orig_ex.name,
-            include_details=orig_ex.include_details,
-            workout_id=new_workout.id,
-            weight=orig_ex.weight,
-            details=orig_ex.details,
-        )
-        db.session.add(new_exercise)
+    workout = Workout.query.filter_by(id=workout_id, user_id=current_user.id).first_or_404()
+    _copy_workout(workout, current_user.id)
     db.session.commit()
 
     flash('Workout duplicated successfully!', category='success')
@@ -1575,11 +1995,17 @@ def complete_workout(workout_id):
             }
             exercises_data.append(exercise_data)
     
+    idempotency_key, key_error = read_idempotency_key(allow_form=True)
+    if key_error:
+        flash(f'Error completing workout: {key_error}', category='error')
+        return redirect(url_for('views.workout'))
+    
     # Use unified workout completion function
     success, result, status_code = _create_workout_session(
         workout_id=workout_id,
         exercises_data=exercises_data,
-        user_id=current_user.id
+        user_id=current_user.id,
+        idempotency_key=idempotency_key
     )
     
     if success: